@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.core.config import settings
+from app.core.loop_monitor import event_loop_monitor
+from app.dependencies import get_profiling_service, get_usage_ledger_service, verify_admin_token
+from app.models.system import LoopStall, UsageRollup
+from app.services.profiling_service import ProfilerBusyError, ProfilingService
+from app.services.usage_ledger_service import UsageLedgerService
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(verify_admin_token)])
+
+
+def _check_profile_seconds(seconds: float) -> None:
+    if seconds > settings.ADMIN_PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"프로파일링 시간은 최대 {settings.ADMIN_PROFILE_MAX_SECONDS}초입니다."
+        )
+
+
+def _download_headers(filename: str) -> dict:
+    # 여러 워커 중 어느 프로세스의 프로파일인지 구분할 수 있도록 PID 포함
+    return {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Worker-PID": str(os.getpid())
+    }
+
+
+@router.get("/loop-stalls", response_model=List[LoopStall], summary="최근 이벤트 루프 지연 기록 가져오기")
+async def get_loop_stalls():
+    return [LoopStall(**stall) for stall in event_loop_monitor.stalls()]
+
+
+@router.get("/usage", response_model=List[UsageRollup], summary="경로별 또는 대화 스레드별 외부 API 사용량 합계 가져오기")
+async def get_usage(
+        group_by: Literal["route", "thread_id"] = Query(default="route", description="합산 기준"),
+        since: Optional[float] = Query(default=None, description="이 시각(Unix time) 이후의 기록만 합산"),
+        limit: int = Query(default=100, ge=1, le=1000, description="최대 그룹 수 (호출 수가 많은 순)"),
+        usage_ledger_service: UsageLedgerService = Depends(get_usage_ledger_service)
+):
+    # 스레드 ID만 알면 대화를 읽고 이어갈 수 있으므로 관리자 전용
+    # 모든 워커가 같은 원장 파일에 기록하므로 어느 워커가 응답해도 전체 합계를 반환
+    rollups = await asyncio.to_thread(usage_ledger_service.summarize, group_by, since, limit)
+    return [UsageRollup(**rollup) for rollup in rollups]
+
+
+@router.post("/profile/cpu", summary="워커의 CPU 사용을 샘플링하여 접힌 스택 파일로 내려받기")
+async def capture_cpu_profile(
+        seconds: float = Query(default=10, gt=0, description="수집 시간(초)"),
+        interval_ms: float = Query(default=10, ge=1, le=1000, description="샘플링 간격(밀리초)"),
+        profiling_service: ProfilingService = Depends(get_profiling_service)
+):
+    _check_profile_seconds(seconds)
+    try:
+        # 이벤트 루프 스레드도 샘플링할 수 있도록 별도 스레드에서 수집
+        profile = await asyncio.to_thread(profiling_service.cpu_profile, seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return Response(
+        content=profile,
+        media_type="text/plain; charset=utf-8",
+        headers=_download_headers(f"cpu-{os.getpid()}-{int(time.time())}.folded")
+    )
+
+
+@router.post("/profile/memory", summary="워커의 메모리 할당을 추적하여 tracemalloc 스냅샷 내려받기")
+async def capture_memory_snapshot(
+        seconds: float = Query(default=10, gt=0, description="수집 시간(초)"),
+        profiling_service: ProfilingService = Depends(get_profiling_service)
+):
+    _check_profile_seconds(seconds)
+    try:
+        snapshot = await asyncio.to_thread(profiling_service.memory_snapshot, seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return Response(
+        content=snapshot,
+        media_type="application/octet-stream",
+        headers=_download_headers(f"memory-{os.getpid()}-{int(time.time())}.tracemalloc")
+    )
@@ -1,16 +1,25 @@
 """
 API router that includes all API v1 endpoints.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.v1 import text_to_speech_controller as text_to_speech, \
     speech_to_text_controller as speech_to_text, chatgpt_controller as chatgpt, \
-    stt_chatgpt_tts_controller as stt_chatgpt_tts, assistant_controller as assistant
+    stt_chatgpt_tts_controller as stt_chatgpt_tts, assistant_controller as assistant, \
+    voice_conversation_controller as voice_conversation, system_controller as system, \
+    job_controller as jobs, admin_controller as admin
+from app.core.scheduler import DEFAULT, request_priority
+from app.dependencies import tag_usage_request
 
-api_router = APIRouter()
+# 우선순위 헤더가 없으면 default로 처리하고, 경로별 기본값이 있으면 경로의 의존성이 덮어씀
+api_router = APIRouter(dependencies=[Depends(request_priority(DEFAULT)), Depends(tag_usage_request)])
 
 api_router.include_router(text_to_speech.router)
 api_router.include_router(speech_to_text.router)
 api_router.include_router(chatgpt.router)
 api_router.include_router(stt_chatgpt_tts.router)
 api_router.include_router(assistant.router)
+api_router.include_router(voice_conversation.router)
+api_router.include_router(system.router)
+api_router.include_router(jobs.router)
+api_router.include_router(admin.router)
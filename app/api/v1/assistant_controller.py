@@ -1,13 +1,25 @@
+import asyncio
 import logging
+from functools import partial
+from io import BytesIO
 from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Header, Request, Response
 from fastapi.responses import StreamingResponse
 
+from app.core.admission import admission_control
+from app.core.cancellation import CancellationToken, OperationCancelled, run_until_disconnected
 from app.core.config import settings
-from app.dependencies import get_assistant_service, get_speech_to_text_service, get_text_to_speech_service
+from app.core.deadline import Deadline, request_deadline
+from app.core.pipeline import Pipeline
+from app.core.scheduler import INTERACTIVE, request_priority
+from app.api.v1.text_to_speech_controller import audio_cache_headers, accepts_multipart, multipart_audio_response
+from app.dependencies import get_assistant_service, get_speech_to_text_service, get_text_to_speech_service, \
+    get_audio_cache_service
 from app.models.assistant import AssistantQuery, AssistantResponse
 from app.services.assistant_service import AssistantService
+from app.services.audio_cache_service import AudioCacheService
+from app.services.audio_processing import mp3_audio_frames
 from app.services.speech_to_text_service import SpeechToTextService
 from app.services.text_to_speech_service import TextToSpeechService
 
@@ -23,23 +35,153 @@ def _validate_thread_id(thread_id: Optional[str]) -> Optional[str]:
     return thread_id
 
 
+def _resolve(future: asyncio.Future, result) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _resolving(func, future: asyncio.Future):
+    """
+    스레드에서 실행될 함수의 결과를 이벤트 루프의 Future에도 설정하도록 감쌉니다.
+    """
+    loop = asyncio.get_running_loop()
+
+    def run():
+        result = func()
+        loop.call_soon_threadsafe(_resolve, future, result)
+        return result
+
+    return run
+
+
+async def _transcribe_with_thread(
+        pipeline: Pipeline,
+        file: UploadFile,
+        thread_id: Optional[str],
+        stt_service: SpeechToTextService,
+        assistant_service: AssistantService,
+        deadline: Deadline,
+        thread_ready: Optional[asyncio.Future] = None
+):
+    """
+    업로드된 오디오를 변환하고, 대화 스레드가 없으면 변환과 동시에 새 스레드를 생성합니다.
+    스레드 생성은 변환 결과와 무관하므로 변환을 기다리지 않습니다.
+
+    Args:
+        thread_ready: 사용할 스레드 ID가 정해지는 즉시 (변환이 끝나기 전에) 결과로 설정할 Future
+
+    Returns:
+        (변환 결과, 사용할 스레드 ID) 튜플
+    """
+    validated_thread_id = _validate_thread_id(thread_id)
+    stages = {
+        "stt": partial(
+            stt_service.speech_to_text_from_bytes,
+            await file.read(), stt_service.get_upload_extension(file.filename, file.content_type),
+            cancel_token=pipeline.cancel_token, deadline=deadline)
+    }
+    if not validated_thread_id:
+        stages["thread"] = partial(assistant_service.create_thread, timeout=deadline.remaining())
+        if thread_ready is not None:
+            stages["thread"] = _resolving(stages["thread"], thread_ready)
+    elif thread_ready is not None:
+        _resolve(thread_ready, validated_thread_id)
+    results = await pipeline.parallel(**stages)
+    return results["stt"], results.get("thread", validated_thread_id)
+
+
+async def _acknowledged_audio_response(
+        acknowledgement: bytes,
+        pipeline: Pipeline,
+        file: UploadFile,
+        thread_id: Optional[str],
+        provider: str,
+        output_format: str,
+        stt_service: SpeechToTextService,
+        assistant_service: AssistantService,
+        tts_service: TextToSpeechService,
+        deadline: Deadline
+) -> StreamingResponse:
+    """
+    미리 합성된 안내 음성을 바로 보내고, 같은 스트림에 응답 음성을 이어서 보냅니다.
+
+    응답 헤더에 스레드 ID를 담아야 하므로 새 대화이면 스레드 생성까지만 기다린 뒤 응답을 시작합니다. (STT는 계속 진행)
+    안내 음성을 보낸 뒤에 실패하면 상태 코드를 바꿀 수 없으므로 연결을 끊어 응답이 완료되지 않았음을 알립니다.
+    """
+    cancel_token = pipeline.cancel_token
+    thread_ready = asyncio.get_running_loop().create_future()
+
+    async def answer() -> bytes:
+        transcription, validated_thread_id = await _transcribe_with_thread(
+            pipeline, file, thread_id, stt_service, assistant_service, deadline, thread_ready)
+        _, response_text, _ = await pipeline.run(
+            "llm", assistant_service.get_response, transcription.text, validated_thread_id,
+            cancel_token=cancel_token, deadline=deadline)
+        _, _, audio = await pipeline.run(
+            "tts", tts_service.text_to_speech_cached, response_text,
+            provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline)
+        # 안내 음성과 하나의 스트림으로 재생되도록 길이 정보(Xing 헤더 등)를 제거
+        return mp3_audio_frames(audio) if output_format == "mp3" else audio
+
+    answer_task = asyncio.ensure_future(answer())
+    try:
+        await asyncio.wait([thread_ready, answer_task], return_when=asyncio.FIRST_COMPLETED)
+        if not thread_ready.done():
+            # 스레드 ID가 정해지기 전에 실패하면 일반 요청과 같은 오류 응답
+            answer_task.result()
+    except BaseException:
+        answer_task.cancel()
+        raise
+
+    async def stream():
+        try:
+            yield acknowledgement
+            yield await answer_task
+        except Exception as e:
+            logger.error(f"안내 음성을 보낸 뒤 응답 음성 처리 중 오류 발생: {str(e)}", exc_info=True)
+            raise
+        finally:
+            if not answer_task.done():
+                answer_task.cancel()
+                cancel_token.cancel()
+            pipeline.server_timing()
+
+    return StreamingResponse(
+        stream(),
+        media_type=tts_service.get_media_type(output_format),
+        headers={
+            "Content-Disposition": f"attachment; filename=assistant_response.{tts_service.get_file_extension(output_format)}",
+            "X-Thread-ID": thread_ready.result(),
+            # 응답 음성이 시작되는 위치 (클라이언트가 안내 음성을 건너뛸 때 사용)
+            "X-Acknowledgement-Bytes": str(len(acknowledgement))
+        }
+    )
+
+
 @router.post("/", response_model=AssistantResponse, summary="텍스트 쿼리에 대한 Assistant 응답 가져오기")
 async def get_assistant_response(
+        request: Request,
         query: AssistantQuery,
         thread_id: Optional[str] = Query(None, description="대화 스레드 ID (없으면 새로 생성됨)"),
-        assistant_service: AssistantService = Depends(get_assistant_service)
+        assistant_service: AssistantService = Depends(get_assistant_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("llm",)))
 ):
     try:
         validated_thread_id = _validate_thread_id(thread_id)
         logger.info(f"Assistant 서비스 호출 전 thread_id: {validated_thread_id}")
-        
-        question, response_text, final_thread_id = assistant_service.get_response(query.text, validated_thread_id)
+
+        cancel_token = CancellationToken()
+        question, response_text, final_thread_id = await run_until_disconnected(
+            request, cancel_token, assistant_service.get_response, query.text, validated_thread_id,
+            cancel_token=cancel_token, deadline=deadline)
 
         return AssistantResponse(
             question=question,
             response=response_text, 
             thread_id=final_thread_id
         )
+    except OperationCancelled:
+        raise
     except Exception as e:
         logger.error(f"Assistant 응답 처리 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -48,12 +190,16 @@ async def get_assistant_response(
         )
 
 
-@router.post("/upload", response_model=AssistantResponse, summary="오디오 파일 업로드로 STT 변환 후 Assistant 응답 가져오기")
+@router.post("/upload", response_model=AssistantResponse, summary="오디오 파일 업로드로 STT 변환 후 Assistant 응답 가져오기",
+              dependencies=[Depends(admission_control("pipeline")), Depends(request_priority(INTERACTIVE))])
 async def get_assistant_response_from_upload(
+        request: Request,
+        response: Response,
         file: UploadFile = File(...),
         thread_id: Optional[str] = Query(None, description="대화 스레드 ID (없으면 새로 생성됨)"),
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
-        assistant_service: AssistantService = Depends(get_assistant_service)
+        assistant_service: AssistantService = Depends(get_assistant_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm")))
 ):
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
@@ -62,18 +208,23 @@ async def get_assistant_response_from_upload(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        validated_thread_id = _validate_thread_id(thread_id)
+        cancel_token = CancellationToken()
+        pipeline = Pipeline(request, cancel_token)
+        transcription, validated_thread_id = await _transcribe_with_thread(
+            pipeline, file, thread_id, stt_service, assistant_service, deadline)
         logger.info(f"Assistant 서비스 호출 전 (upload) thread_id: {validated_thread_id}")
 
-        question, response_text, final_thread_id = assistant_service.get_response(text, validated_thread_id)
+        question, response_text, final_thread_id = await pipeline.run(
+            "llm", assistant_service.get_response, transcription.text, validated_thread_id,
+            cancel_token=cancel_token, deadline=deadline)
 
+        response.headers["Server-Timing"] = pipeline.server_timing()
         return AssistantResponse(
             question=question,
             response=response_text, 
             thread_id=final_thread_id
         )
-    except HTTPException:
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         logger.error(f"업로드된 오디오 처리 중 오류 발생: {str(e)}", exc_info=True)
@@ -83,29 +234,63 @@ async def get_assistant_response_from_upload(
         )
 
 
-@router.post("/audio", summary="텍스트 쿼리에 대한 Assistant 응답을 음성으로 가져오기")
+@router.post("/audio", summary="텍스트 쿼리에 대한 Assistant 응답을 음성으로 가져오기",
+              dependencies=[Depends(admission_control("pipeline")), Depends(request_priority(INTERACTIVE))])
 async def get_assistant_audio_response(
+        request: Request,
         query: AssistantQuery,
         thread_id: Optional[str] = Query(None, description="대화 스레드 ID (없으면 새로 생성됨)"),
         provider: Literal["elevenlabs", "openai"] = Query(default="openai", description="사용할 음성 제공자"),
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="출력 형식 (mp3, opus, aac, pcm), 없으면 Accept 헤더로 결정"),
+        accept: Optional[str] = Header(default=None),
         assistant_service: AssistantService = Depends(get_assistant_service),
-        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("llm", "tts")))
 ):
+    output_format = tts_service.negotiate_output_format(output_format, accept, provider)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 선택한 음성 제공자에서 지원하지 않습니다."
+        )
+
     try:
         validated_thread_id = _validate_thread_id(thread_id)
         logger.info(f"Assistant 서비스 호출 전 (audio) thread_id: {validated_thread_id}")
 
-        question, response_text, final_thread_id = assistant_service.get_response(query.text, validated_thread_id)
-        audio_stream = tts_service.text_to_speech_stream(response_text, provider=provider)
+        cancel_token = CancellationToken()
+        question, response_text, final_thread_id = await run_until_disconnected(
+            request, cancel_token, assistant_service.get_response, query.text, validated_thread_id,
+            cancel_token=cancel_token, deadline=deadline)
+
+        if accepts_multipart(accept):
+            # 텍스트를 먼저 보내고 합성한 오디오를 이어서 보냄
+            summary = AssistantResponse(question=question, response=response_text, thread_id=final_thread_id)
+            return multipart_audio_response(
+                summary.model_dump(by_alias=True),
+                lambda: run_until_disconnected(
+                    request, cancel_token, tts_service.text_to_speech_cached_chunks, response_text,
+                    provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline),
+                tts_service.get_media_type(output_format), audio_cache_service, cancel_token
+            )
+
+        audio_id, metadata, audio = await run_until_disconnected(
+            request, cancel_token, tts_service.text_to_speech_cached, response_text,
+            provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline)
 
         return StreamingResponse(
-            audio_stream,
-            media_type="audio/mpeg",
+            BytesIO(audio),
+            media_type=tts_service.get_media_type(output_format),
             headers={
-                "Content-Disposition": f"attachment; filename=assistant_response.mp3",
-                "X-Thread-ID": final_thread_id
+                "Content-Disposition": f"attachment; filename=assistant_response.{tts_service.get_file_extension(output_format)}",
+                "X-Thread-ID": final_thread_id,
+                **audio_cache_headers(audio_cache_service, audio_id, metadata)
             }
         )
+    except OperationCancelled:
+        raise
     except Exception as e:
         logger.error(f"Assistant 음성 응답 처리 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -114,15 +299,31 @@ async def get_assistant_audio_response(
         )
 
 
-@router.post("/upload/audio", summary="오디오 파일 업로드로 STT 변환 후 Assistant 응답을 음성으로 가져오기")
+@router.post("/upload/audio", summary="오디오 파일 업로드로 STT 변환 후 Assistant 응답을 음성으로 가져오기",
+              dependencies=[Depends(admission_control("pipeline")), Depends(request_priority(INTERACTIVE))])
 async def get_assistant_audio_response_from_upload(
+        request: Request,
         file: UploadFile = File(...),
         thread_id: Optional[str] = Query(None, description="대화 스레드 ID (없으면 새로 생성됨)"),
         provider: Literal["elevenlabs", "openai"] = Query(default="openai", description="사용할 음성 제공자"),
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="출력 형식 (mp3, opus, aac, pcm), 없으면 Accept 헤더로 결정"),
+        accept: Optional[str] = Header(default=None),
+        acknowledge: bool = Query(
+            default=False, description="응답 음성 전에 미리 합성된 안내 음성을 바로 보냄 (mp3, pcm 형식만)"),
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
         assistant_service: AssistantService = Depends(get_assistant_service),
-        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm", "tts")))
 ):
+    output_format = tts_service.negotiate_output_format(output_format, accept, provider)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 선택한 음성 제공자에서 지원하지 않습니다."
+        )
+
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
             raise HTTPException(
@@ -130,22 +331,51 @@ async def get_assistant_audio_response_from_upload(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        validated_thread_id = _validate_thread_id(thread_id)
+        cancel_token = CancellationToken()
+        pipeline = Pipeline(request, cancel_token)
+        # 안내 음성이 준비되지 않았으면 일반 응답으로 처리
+        acknowledgement = tts_service.get_acknowledgement_audio(provider, output_format) \
+            if acknowledge and not accepts_multipart(accept) else None
+        if acknowledgement is not None:
+            return await _acknowledged_audio_response(
+                acknowledgement, pipeline, file, thread_id, provider, output_format,
+                stt_service, assistant_service, tts_service, deadline)
+
+        transcription, validated_thread_id = await _transcribe_with_thread(
+            pipeline, file, thread_id, stt_service, assistant_service, deadline)
         logger.info(f"Assistant 서비스 호출 전 (upload/audio) thread_id: {validated_thread_id}")
 
-        question, response_text, final_thread_id = assistant_service.get_response(text, validated_thread_id)
-        audio_stream = tts_service.text_to_speech_stream(response_text, provider=provider)
+        question, response_text, final_thread_id = await pipeline.run(
+            "llm", assistant_service.get_response, transcription.text, validated_thread_id,
+            cancel_token=cancel_token, deadline=deadline)
+
+        if accepts_multipart(accept):
+            # 텍스트를 먼저 보내고 합성한 오디오를 이어서 보냄
+            summary = AssistantResponse(question=question, response=response_text, thread_id=final_thread_id)
+            return multipart_audio_response(
+                summary.model_dump(by_alias=True),
+                lambda: pipeline.run(
+                    "tts", tts_service.text_to_speech_cached_chunks, response_text,
+                    provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline),
+                tts_service.get_media_type(output_format), audio_cache_service, cancel_token,
+                on_complete=pipeline.server_timing
+            )
+
+        audio_id, metadata, audio = await pipeline.run(
+            "tts", tts_service.text_to_speech_cached, response_text,
+            provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline)
 
         return StreamingResponse(
-            audio_stream,
-            media_type="audio/mpeg",
+            BytesIO(audio),
+            media_type=tts_service.get_media_type(output_format),
             headers={
-                "Content-Disposition": f"attachment; filename=assistant_response.mp3",
-                "X-Thread-ID": final_thread_id
+                "Content-Disposition": f"attachment; filename=assistant_response.{tts_service.get_file_extension(output_format)}",
+                "X-Thread-ID": final_thread_id,
+                "Server-Timing": pipeline.server_timing(),
+                **audio_cache_headers(audio_cache_service, audio_id, metadata)
             }
         )
-    except HTTPException:
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         logger.error(f"업로드된 오디오 음성 응답 처리 중 오류 발생: {str(e)}", exc_info=True)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
 
+from app.core.admission import admission_control
+from app.core.cancellation import CancellationToken, OperationCancelled, run_until_disconnected
 from app.core.config import settings
-from app.dependencies import get_chatgpt_service, get_speech_to_text_service
-from app.models.chatgpt import ChatGPTQuery, ChatGPTResponse, ChatGPTSttQuery, ChatGPTAudioUrlQuery
+from app.core.deadline import Deadline, request_deadline
+from app.dependencies import get_chatgpt_service, get_speech_to_text_service, get_response_cache_service
+from app.models.chatgpt import ChatGPTQuery, ChatGPTResponse, ChatGPTSttQuery, ChatGPTAudioUrlQuery, ChatGPTCacheStats
 from app.services.chatgpt_service import ChatGPTService
+from app.services.response_cache_service import ResponseCacheService
 from app.services.speech_to_text_service import SpeechToTextService
 
 router = APIRouter(prefix="/chatgpt", tags=["chatgpt"])
@@ -11,12 +15,19 @@ router = APIRouter(prefix="/chatgpt", tags=["chatgpt"])
 
 @router.post("/", response_model=ChatGPTResponse, summary="텍스트 쿼리에 대한 ChatGPT 응답 가져오기")
 async def get_chatgpt_response(
+        request: Request,
         query: ChatGPTQuery,
-        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service)
+        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("llm",)))
 ):
     try:
-        response_text = chatgpt_service.get_response(query.text)
+        cancel_token = CancellationToken()
+        response_text = await run_until_disconnected(
+            request, cancel_token, chatgpt_service.get_response, query.text,
+            cancel_token=cancel_token, deadline=deadline)
         return ChatGPTResponse(response=response_text, text=query.text)
+    except OperationCancelled:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -26,12 +37,19 @@ async def get_chatgpt_response(
 
 @router.post("/stt-text", response_model=ChatGPTResponse, summary="STT 텍스트 쿼리에 대한 ChatGPT 응답 가져오기")
 async def get_chatgpt_response_from_stt_text(
+        request: Request,
         query: ChatGPTSttQuery,
-        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service)
+        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("llm",)))
 ):
     try:
-        response_text = chatgpt_service.get_response(query.audio_text)
+        cancel_token = CancellationToken()
+        response_text = await run_until_disconnected(
+            request, cancel_token, chatgpt_service.get_response, query.audio_text,
+            cancel_token=cancel_token, deadline=deadline)
         return ChatGPTResponse(response=response_text, text=query.audio_text)
+    except OperationCancelled:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -39,16 +57,26 @@ async def get_chatgpt_response_from_stt_text(
         )
 
 
-@router.post("/audio-url", response_model=ChatGPTResponse, summary="오디오 URL로부터 ChatGPT 응답 가져오기")
+@router.post("/audio-url", response_model=ChatGPTResponse, summary="오디오 URL로부터 ChatGPT 응답 가져오기",
+              dependencies=[Depends(admission_control("pipeline"))])
 async def get_chatgpt_response_from_audio_url(
+        request: Request,
         query: ChatGPTAudioUrlQuery,
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
-        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service)
+        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm")))
 ):
     try:
-        text = stt_service.speech_to_text(str(query.audio_url))
-        response_text = chatgpt_service.get_response(text)
+        cancel_token = CancellationToken()
+        text = await run_until_disconnected(
+            request, cancel_token, stt_service.speech_to_text, str(query.audio_url),
+            cancel_token=cancel_token, deadline=deadline)
+        response_text = await run_until_disconnected(
+            request, cancel_token, chatgpt_service.get_response, text,
+            cancel_token=cancel_token, deadline=deadline)
         return ChatGPTResponse(response=response_text, text=text)
+    except OperationCancelled:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -56,11 +84,14 @@ async def get_chatgpt_response_from_audio_url(
         )
 
 
-@router.post("/upload", response_model=ChatGPTResponse, summary="오디오 파일 업로드로 ChatGPT 응답 가져오기")
+@router.post("/upload", response_model=ChatGPTResponse, summary="오디오 파일 업로드로 ChatGPT 응답 가져오기",
+              dependencies=[Depends(admission_control("pipeline"))])
 async def get_chatgpt_response_from_upload(
+        request: Request,
         file: UploadFile = File(...),
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
-        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service)
+        chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm")))
 ):
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
@@ -69,13 +100,26 @@ async def get_chatgpt_response_from_upload(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        response_text = chatgpt_service.get_response(text)
-        return ChatGPTResponse(response=response_text, text=text)
-    except HTTPException:
+        cancel_token = CancellationToken()
+        transcription = await run_until_disconnected(
+            request, cancel_token, stt_service.speech_to_text_from_bytes,
+            await file.read(), stt_service.get_upload_extension(file.filename, file.content_type),
+            cancel_token=cancel_token, deadline=deadline)
+        response_text = await run_until_disconnected(
+            request, cancel_token, chatgpt_service.get_response, transcription.text,
+            cancel_token=cancel_token, deadline=deadline)
+        return ChatGPTResponse(response=response_text, text=transcription.text)
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"업로드된 오디오를 처리하는 중 오류 발생: {str(e)}"
         )
+
+
+@router.get("/cache/stats", response_model=ChatGPTCacheStats, summary="ChatGPT 응답 캐시 적중률 통계 가져오기")
+async def get_chatgpt_cache_stats(
+        response_cache_service: ResponseCacheService = Depends(get_response_cache_service)
+):
+    return ChatGPTCacheStats(**response_cache_service.stats())
@@ -0,0 +1,149 @@
+import asyncio
+from typing import Callable, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.dependencies import get_job_service, get_speech_to_text_service, get_text_to_speech_service
+from app.models.job import JobStatus
+from app.services.job_service import JobService, UploadTooLargeError
+from app.services.speech_to_text_service import SpeechToTextService
+from app.services.text_to_speech_service import TextToSpeechService
+
+
+def _upload_too_large() -> HTTPException:
+    """
+    업로드 크기 제한을 넘은 요청에 대한 413 응답 예외를 만듭니다.
+    """
+    return HTTPException(
+        status_code=413,
+        detail=f"업로드할 수 있는 파일 크기는 최대 {settings.JOB_MAX_UPLOAD_BYTES} bytes입니다."
+    )
+
+
+class JobUploadRoute(APIRoute):
+    """
+    요청 본문을 읽기 전에 Content-Length로 너무 큰 업로드를 거절하는 경로.
+    (FastAPI는 의존성을 실행하기 전에 업로드 본문을 모두 받으므로 경로 처리기에서 먼저 확인)
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                content_length = int(request.headers.get("content-length", "0"))
+            except ValueError:
+                content_length = 0
+            if content_length > settings.JOB_MAX_UPLOAD_BYTES:
+                raise _upload_too_large()
+            return await handler(request)
+
+        return route_handler
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=JobUploadRoute)
+
+
+async def _submit_audio_job(
+        kind: str,
+        file: UploadFile,
+        params: dict,
+        response: Response,
+        job_service: JobService,
+        stt_service: SpeechToTextService
+) -> JobStatus:
+    """
+    업로드된 오디오로 작업을 제출하고 상태 URL을 Location 헤더에 담습니다.
+    """
+    if not file.content_type or not file.content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=400,
+            detail="오디오 파일만 업로드할 수 있습니다."
+        )
+
+    try:
+        ext = stt_service.get_upload_extension(file.filename, file.content_type)
+        # Content-Length가 없는 업로드도 있으므로 저장하면서 크기 제한을 다시 확인
+        job = await asyncio.to_thread(job_service.submit, kind, file.file, ext, params)
+    except UploadTooLargeError:
+        raise _upload_too_large()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"작업을 제출하는 중 오류 발생: {str(e)}"
+        )
+
+    response.headers["Location"] = f"{settings.API_V1_STR}/jobs/{job['job_id']}"
+    return JobStatus(**job)
+
+
+@router.post("/speech-to-text", response_model=JobStatus, status_code=202, summary="음성-텍스트 변환 작업 제출")
+async def submit_speech_to_text_job(
+        response: Response,
+        file: UploadFile = File(...),
+        job_service: JobService = Depends(get_job_service),
+        stt_service: SpeechToTextService = Depends(get_speech_to_text_service)
+):
+    return await _submit_audio_job("speech-to-text", file, {}, response, job_service, stt_service)
+
+
+@router.post("/stt-chatgpt-tts", response_model=JobStatus, status_code=202, summary="STT-ChatGPT-TTS 통합 처리 작업 제출")
+async def submit_stt_chatgpt_tts_job(
+        response: Response,
+        file: UploadFile = File(...),
+        provider: Literal["elevenlabs", "openai"] = Query(default="openai", description="사용할 음성 제공자"),
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="출력 형식 (mp3, opus, aac, pcm, 기본값: mp3)"),
+        job_service: JobService = Depends(get_job_service),
+        stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+):
+    output_format = tts_service.negotiate_output_format(output_format, None, provider)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 선택한 음성 제공자에서 지원하지 않습니다."
+        )
+
+    params = {"provider": provider, "output_format": output_format}
+    return await _submit_audio_job("stt-chatgpt-tts", file, params, response, job_service, stt_service)
+
+
+@router.get("/{job_id}", response_model=JobStatus, summary="작업 상태 가져오기")
+async def get_job(
+        job_id: str,
+        job_service: JobService = Depends(get_job_service)
+):
+    job = await asyncio.to_thread(job_service.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="작업을 찾을 수 없습니다."
+        )
+    return JobStatus(**job)
+
+
+@router.get("/{job_id}/result", summary="작업 결과 가져오기")
+async def get_job_result(
+        job_id: str,
+        job_service: JobService = Depends(get_job_service)
+):
+    job = await asyncio.to_thread(job_service.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="작업을 찾을 수 없습니다."
+        )
+    if job["status"] == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"작업 처리 중 오류 발생: {job['error']}"
+        )
+    if job["status"] != "succeeded":
+        raise HTTPException(
+            status_code=409,
+            detail="작업이 아직 완료되지 않았습니다."
+        )
+    return job["result"]
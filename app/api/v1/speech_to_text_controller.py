@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
 
+from app.core.admission import admission_control
+from app.core.cancellation import CancellationToken, OperationCancelled, run_until_disconnected
 from app.core.config import settings
+from app.core.deadline import Deadline, request_deadline
 from app.dependencies import get_speech_to_text_service
 from app.models.speech_to_text import AudioQuery, TranscriptionResult
 from app.services.speech_to_text_service import SpeechToTextService
@@ -8,14 +11,22 @@ from app.services.speech_to_text_service import SpeechToTextService
 router = APIRouter(prefix="/speech-to-text", tags=["speech-to-text"])
 
 
-@router.post("/audio-url", response_model=TranscriptionResult, summary="오디오 URL에서 음성을 텍스트로 변환")
+@router.post("/audio-url", response_model=TranscriptionResult, summary="오디오 URL에서 음성을 텍스트로 변환",
+              dependencies=[Depends(admission_control("stt"))])
 async def convert_speech_to_text(
+        request: Request,
         query: AudioQuery,
-        stt_service: SpeechToTextService = Depends(get_speech_to_text_service)
+        stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("stt",)))
 ):
     try:
-        text = stt_service.speech_to_text(str(query.audio_url))
-        return TranscriptionResult(text=text)
+        # 오디오 다운로드와 변환은 이벤트 루프를 막지 않도록 스레드에서 실행
+        cancel_token = CancellationToken()
+        return await run_until_disconnected(
+            request, cancel_token, stt_service.speech_to_text_detailed, str(query.audio_url),
+            cancel_token=cancel_token, deadline=deadline)
+    except OperationCancelled:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -23,10 +34,13 @@ async def convert_speech_to_text(
         )
 
 
-@router.post("/upload", response_model=TranscriptionResult, summary="오디오 파일 업로드로 음성을 텍스트로 변환")
+@router.post("/upload", response_model=TranscriptionResult, summary="오디오 파일 업로드로 음성을 텍스트로 변환",
+              dependencies=[Depends(admission_control("stt"))])
 async def convert_speech_to_text_from_file(
+        request: Request,
         file: UploadFile = File(...),
-        stt_service: SpeechToTextService = Depends(get_speech_to_text_service)
+        stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("stt",)))
 ):
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
@@ -35,9 +49,12 @@ async def convert_speech_to_text_from_file(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        return TranscriptionResult(text=text)
-    except HTTPException:
+        cancel_token = CancellationToken()
+        return await run_until_disconnected(
+            request, cancel_token, stt_service.speech_to_text_from_bytes,
+            await file.read(), stt_service.get_upload_extension(file.filename, file.content_type),
+            cancel_token=cancel_token, deadline=deadline)
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         raise HTTPException(
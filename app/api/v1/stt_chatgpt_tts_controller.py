@@ -1,11 +1,20 @@
-import uuid
+from io import BytesIO
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Header, Request, Response
 from fastapi.responses import StreamingResponse
 
+from app.api.v1.text_to_speech_controller import audio_cache_headers, accepts_multipart, multipart_audio_response
+from app.core.admission import admission_control
+from app.core.cancellation import CancellationToken, OperationCancelled
 from app.core.config import settings
-from app.dependencies import get_speech_to_text_service, get_chatgpt_service, get_text_to_speech_service
+from app.core.deadline import Deadline, request_deadline
+from app.core.pipeline import Pipeline
+from app.core.scheduler import INTERACTIVE, request_priority
+from app.dependencies import get_speech_to_text_service, get_chatgpt_service, get_text_to_speech_service, \
+    get_audio_cache_service
 from app.models.stt_chatgpt_tts import STTChatGPTTTSResponse
+from app.services.audio_cache_service import AudioCacheService
 from app.services.chatgpt_service import ChatGPTService
 from app.services.speech_to_text_service import SpeechToTextService
 from app.services.text_to_speech_service import TextToSpeechService
@@ -13,13 +22,27 @@ from app.services.text_to_speech_service import TextToSpeechService
 router = APIRouter(prefix="/stt-chatgpt-tts", tags=["stt-chatgpt-tts"])
 
 
-@router.post("/upload", summary="음성 파일 업로드로 STT-ChatGPT-TTS 통합 처리")
+@router.post("/upload", summary="음성 파일 업로드로 STT-ChatGPT-TTS 통합 처리",
+              dependencies=[Depends(admission_control("pipeline")), Depends(request_priority(INTERACTIVE))])
 async def process_stt_chatgpt_tts_from_upload(
+        request: Request,
         file: UploadFile = File(...),
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="출력 형식 (mp3, opus, aac, pcm), 없으면 Accept 헤더로 결정"),
+        accept: Optional[str] = Header(default=None),
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
         chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
-        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm", "tts")))
 ):
+    output_format = tts_service.negotiate_output_format(output_format, accept)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 지원하지 않습니다."
+        )
+
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
             raise HTTPException(
@@ -27,18 +50,47 @@ async def process_stt_chatgpt_tts_from_upload(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        response_text = chatgpt_service.get_response(text)
-        audio_stream = tts_service.text_to_speech_stream(response_text)
+        cancel_token = CancellationToken()
+        pipeline = Pipeline(request, cancel_token)
+        transcription = await pipeline.run(
+            "stt", stt_service.speech_to_text_from_bytes,
+            await file.read(), stt_service.get_upload_extension(file.filename, file.content_type),
+            cancel_token=cancel_token, deadline=deadline)
+        response_text = await pipeline.run(
+            "llm", chatgpt_service.get_response, transcription.text,
+            cancel_token=cancel_token, deadline=deadline)
+
+        if accepts_multipart(accept):
+            # 텍스트를 먼저 보내고 합성한 오디오를 이어서 보냄
+            summary = STTChatGPTTTSResponse(
+                text=transcription.text,
+                response=response_text,
+                audio_url=audio_cache_service.get_audio_url(
+                    audio_cache_service.register(response_text, "openai", output_format))
+            )
+            return multipart_audio_response(
+                summary.model_dump(),
+                lambda: pipeline.run(
+                    "tts", tts_service.text_to_speech_cached_chunks, response_text,
+                    output_format=output_format, cancel_token=cancel_token, deadline=deadline),
+                tts_service.get_media_type(output_format), audio_cache_service, cancel_token,
+                on_complete=pipeline.server_timing
+            )
+
+        audio_id, metadata, audio = await pipeline.run(
+            "tts", tts_service.text_to_speech_cached, response_text,
+            output_format=output_format, cancel_token=cancel_token, deadline=deadline)
 
         return StreamingResponse(
-            audio_stream,
-            media_type="audio/mpeg",
+            BytesIO(audio),
+            media_type=tts_service.get_media_type(output_format),
             headers={
-                "Content-Disposition": "attachment; filename=response.mp3"
+                "Content-Disposition": f"attachment; filename=response.{tts_service.get_file_extension(output_format)}",
+                "Server-Timing": pipeline.server_timing(),
+                **audio_cache_headers(audio_cache_service, audio_id, metadata)
             }
         )
-    except HTTPException:
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         raise HTTPException(
@@ -47,12 +99,17 @@ async def process_stt_chatgpt_tts_from_upload(
         )
 
 
-@router.post("/upload/json", response_model=STTChatGPTTTSResponse, summary="음성 파일 업로드로 STT-ChatGPT-TTS 통합 처리 (JSON 응답)")
+@router.post("/upload/json", response_model=STTChatGPTTTSResponse, summary="음성 파일 업로드로 STT-ChatGPT-TTS 통합 처리 (JSON 응답)",
+              dependencies=[Depends(admission_control("pipeline")), Depends(request_priority(INTERACTIVE))])
 async def process_stt_chatgpt_tts_from_upload_json(
+        request: Request,
+        response: Response,
         file: UploadFile = File(...),
         stt_service: SpeechToTextService = Depends(get_speech_to_text_service),
         chatgpt_service: ChatGPTService = Depends(get_chatgpt_service),
-        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_PIPELINE_SECONDS, ("stt", "llm")))
 ):
     try:
         if not file.content_type or not file.content_type.startswith("audio/"):
@@ -61,16 +118,26 @@ async def process_stt_chatgpt_tts_from_upload_json(
                 detail="오디오 파일만 업로드할 수 있습니다."
             )
 
-        text = await stt_service.speech_to_text_from_file(file)
-        response_text = chatgpt_service.get_response(text)
-        audio_url = f"/stt-chatgpt-tts/audio/{uuid.uuid4()}.mp3"
+        cancel_token = CancellationToken()
+        pipeline = Pipeline(request, cancel_token)
+        transcription = await pipeline.run(
+            "stt", stt_service.speech_to_text_from_bytes,
+            await file.read(), stt_service.get_upload_extension(file.filename, file.content_type),
+            cancel_token=cancel_token, deadline=deadline)
+        text = transcription.text
+        response_text = await pipeline.run(
+            "llm", chatgpt_service.get_response, text, cancel_token=cancel_token, deadline=deadline)
+        # 오디오는 audio_url을 처음 요청할 때 합성됨
+        audio_id = audio_cache_service.register(response_text, "openai", "mp3")
+        audio_url = audio_cache_service.get_audio_url(audio_id)
 
+        response.headers["Server-Timing"] = pipeline.server_timing()
         return STTChatGPTTTSResponse(
             text=text,
             response=response_text,
             audio_url=audio_url
         )
-    except HTTPException:
+    except (HTTPException, OperationCancelled):
         raise
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.circuit_breaker import OPEN, circuit_breakers
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.model_router import model_router
+from app.core.thread_affinity import thread_affinity
+from app.dependencies import get_warmup_service, get_shared_cache_service
+from app.models.system import WarmupStatus, MetricsSnapshot, HealthStatus, \
+    ClusterStatus, SharedCacheStats, ModelRoutingStatus
+from app.services.shared_cache_service import SharedCacheService
+from app.services.warmup_service import WarmupService
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+health_router = APIRouter(tags=["system"])
+
+
+@router.get("/warmup", response_model=WarmupStatus, summary="캐시 예열 진행 상황 가져오기")
+async def get_warmup_status(
+        warmup_service: WarmupService = Depends(get_warmup_service)
+):
+    return WarmupStatus(**warmup_service.status())
+
+
+@router.get("/metrics", response_model=MetricsSnapshot, summary="워커 프로세스의 운영 지표 가져오기")
+async def get_metrics():
+    return MetricsSnapshot(**metrics.snapshot())
+
+
+@router.get("/shared-cache", response_model=SharedCacheStats, summary="워커 간 공유 캐시 사용량 가져오기")
+async def get_shared_cache(
+        shared_cache_service: SharedCacheService = Depends(get_shared_cache_service)
+):
+    return SharedCacheStats(**await asyncio.to_thread(shared_cache_service.stats))
+
+
+@router.get("/model-routing", response_model=ModelRoutingStatus, summary="ChatGPT 모델 선택 설정과 모델별 응답 시간 가져오기")
+async def get_model_routing():
+    return ModelRoutingStatus(**model_router.status())
+
+
+@router.get("/cluster", response_model=ClusterStatus, summary="노드 구성과 대화 스레드 담당 노드 가져오기")
+async def get_cluster(
+        thread_id: Optional[str] = Query(default=None, description="담당 노드를 조회할 대화 스레드 ID")
+):
+    return ClusterStatus(
+        enabled=thread_affinity.enabled,
+        self_url=thread_affinity.self_url,
+        nodes=thread_affinity.nodes,
+        mode=settings.THREAD_AFFINITY_MODE,
+        thread_id=thread_id,
+        owner=thread_affinity.owner(thread_id) if thread_id else None
+    )
+
+
+@health_router.get("/health", response_model=HealthStatus, summary="서버 및 외부 API 상태 확인")
+async def get_health():
+    circuits = circuit_breakers.statuses()
+    # 외부 API 장애는 모든 노드에 같이 나타나므로 노드를 빼지 않도록 200으로 응답하고 상태만 알림
+    degraded = any(circuit["state"] == OPEN for circuit in circuits)
+    return HealthStatus(status="degraded" if degraded else "ok", circuits=circuits)
@@ -1,34 +1,408 @@
-from typing import Literal
+import asyncio
+import json
+import logging
+import re
+import uuid
+import zipfile
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 
+from app.core.admission import admission_control, admission_controller
+from app.core.cancellation import CancellationToken, OperationCancelled, run_until_disconnected
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import settings
-from app.dependencies import get_text_to_speech_service
-from app.models.text_to_speech import TextQuery
+from app.core.deadline import Deadline, DeadlineExceeded, request_deadline
+from app.core.scheduler import BULK, request_priority
+from app.dependencies import get_text_to_speech_service, get_audio_cache_service
+from app.models.text_to_speech import TextQuery, TextBatchQuery
+from app.services.audio_cache_service import AudioCacheService
 from app.services.text_to_speech_service import TextToSpeechService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/text-to-speech", tags=["text-to-speech"])
 
 
-@router.post("/", summary="텍스트를 음성으로 변환")
+class _ZipChunkBuffer:
+    """
+    ZipFile이 쓰는 데이터를 모아 두었다가 스트리밍 청크로 내보내는 버퍼.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _zip_batch_stream(
+        tts_service: TextToSpeechService,
+        texts: List[str],
+        provider: str,
+        output_format: str
+) -> AsyncIterator[bytes]:
+    """
+    배치 변환 결과를 완료되는 순서대로 zip 아카이브 스트림으로 만듭니다.
+    """
+    width = max(4, len(str(len(texts) - 1)))
+    extension = tts_service.get_file_extension(output_format)
+    manifest = [{"index": index, "text": text} for index, text in enumerate(texts)]
+
+    buffer = _ZipChunkBuffer()
+    # 오디오는 이미 압축된 형식이므로 재압축하지 않음
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for text, indices, audio, error in tts_service.text_to_speech_batch(
+                texts, provider=provider, output_format=output_format):
+            for index in indices:
+                if error is not None:
+                    manifest[index]["error"] = error
+                    continue
+                filename = f"{index:0{width}d}.{extension}"
+                archive.writestr(filename, audio)
+                manifest[index]["file"] = filename
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+
+        archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+    yield buffer.drain()
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 범위 Range 헤더를 해석합니다.
+
+    Args:
+        range_header: Range 헤더 값 (예: "bytes=0-1023", "bytes=-500")
+        size: 전체 크기
+
+    Returns:
+        (start, end) 포함 범위, 해석할 수 없거나 여러 범위이면 None (전체 응답)
+
+    Raises:
+        ValueError: 만족할 수 없는 범위인 경우
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+
+    if match.group(1):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+    else:
+        # 마지막 N 바이트
+        start = max(size - int(match.group(2)), 0)
+        end = size - 1
+
+    if start >= size or start > end:
+        raise ValueError("만족할 수 없는 범위입니다.")
+    return start, min(end, size - 1)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _if_none_match(header: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 현재 ETag와 일치하는지 약한 비교(W/ 접두사 무시)로 확인합니다.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _strip_weak(etag) in [_strip_weak(tag) for tag in header.split(",")]
+
+
+def _if_range_matches(header: Optional[str], etag: str) -> bool:
+    """
+    If-Range 헤더가 없거나 현재 ETag와 강한 비교로 일치하는지 확인합니다. 약한 ETag나 날짜는 일치하지 않는 것으로 봅니다.
+    """
+    if not header:
+        return True
+    tag = header.strip()
+    return not tag.startswith("W/") and not etag.startswith("W/") and tag == etag
+
+
+def audio_cache_headers(audio_cache_service: AudioCacheService, audio_id: str, metadata: Optional[dict]) -> dict:
+    """
+    캐시된 오디오 응답에 붙일 검증자와 재요청 URL 헤더를 만듭니다.
+    합성하면서 보내는 응답(metadata가 None)은 아직 etag를 알 수 없으므로 ETag 헤더를 붙이지 않습니다.
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={settings.AUDIO_CACHE_MAX_AGE}",
+        "Content-Location": audio_cache_service.get_audio_url(audio_id),
+        "X-Audio-ID": audio_id
+    }
+    if metadata is not None:
+        headers["ETag"] = metadata["etag"]
+    return headers
+
+
+async def _stream_audio_chunks(chunks: Iterator[bytes], cancel_token: CancellationToken) -> AsyncIterator[bytes]:
+    """
+    합성되는 오디오 조각을 스레드에서 꺼내어 보냅니다. 응답 도중 연결이 끊기면 남은 조각의 합성을 취소합니다.
+    응답을 시작한 뒤에 실패하면 상태 코드를 바꿀 수 없으므로 연결을 끊어 응답이 완료되지 않았음을 알립니다.
+    """
+    completed = False
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+        completed = True
+    except Exception as e:
+        logger.error(f"오디오를 보내는 중 오류 발생: {str(e)}", exc_info=True)
+        raise
+    finally:
+        if not completed:
+            cancel_token.cancel()
+
+
+def accepts_multipart(accept: Optional[str]) -> bool:
+    """
+    Accept 헤더가 multipart/mixed 응답을 요청하는지 확인합니다.
+    """
+    return bool(accept) and any(
+        media_range.split(";")[0].strip().lower() == "multipart/mixed" for media_range in accept.split(","))
+
+
+def _multipart_head(boundary: str, headers: Dict[str, str]) -> bytes:
+    head = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return f"--{boundary}\r\n{head}\r\n".encode("utf-8")
+
+
+def _multipart_part(boundary: str, headers: Dict[str, str], body: bytes) -> bytes:
+    return _multipart_head(boundary, {**headers, "Content-Length": str(len(body))}) + body + b"\r\n"
+
+
+def multipart_audio_response(
+        summary: dict,
+        synthesize: Callable[[], Awaitable[Tuple[str, Optional[dict], Iterator[bytes]]]],
+        media_type: str,
+        audio_cache_service: AudioCacheService,
+        cancel_token: CancellationToken,
+        on_complete: Optional[Callable[[], None]] = None
+) -> StreamingResponse:
+    """
+    텍스트 결과를 담은 JSON 파트를 바로 보내고, 첫 오디오 조각이 합성되면 오디오 파트를 이어서 보내는
+    multipart/mixed 응답을 만듭니다. 텍스트와 음성이 모두 필요한 클라이언트가 한 번의 요청으로 둘 다 받을 수 있습니다.
+
+    오디오 파트는 길이를 미리 알 수 없으므로 Content-Length 없이 합성되는 조각을 그대로 보내고 다음 경계로 끝냅니다.
+    첫 조각을 합성하기 전에 오류가 발생하면 오디오 파트 대신 {"detail": ...} JSON 파트를 보내고,
+    오디오 파트를 보내는 도중 실패하면 닫는 경계 없이 연결을 끊어 응답이 완료되지 않았음을 알립니다.
+
+    Args:
+        summary: 첫 번째 JSON 파트의 내용
+        synthesize: (audio_id, metadata, chunks)를 반환하는 합성 함수 (text_to_speech_cached_chunks 참고)
+        media_type: 오디오 파트의 미디어 타입
+        audio_cache_service: 오디오 재요청 헤더를 만들 캐시 서비스
+        cancel_token: 요청 취소 토큰 (클라이언트가 응답 도중 연결을 끊으면 합성 중단)
+        on_complete: 응답을 모두 보낸 뒤 호출할 함수
+    """
+    boundary = uuid.uuid4().hex
+
+    async def parts() -> AsyncIterator[bytes]:
+        yield _multipart_part(
+            boundary, {"Content-Type": "application/json; charset=utf-8"},
+            json.dumps(summary, ensure_ascii=False).encode("utf-8"))
+        try:
+            audio_id, metadata, chunks = await synthesize()
+        except (DeadlineExceeded, CircuitOpenError) as e:
+            chunks = None
+            error = json.dumps({"detail": str(e)}, ensure_ascii=False)
+        except OperationCancelled:
+            return
+        except asyncio.CancelledError:
+            # 응답 도중 연결이 끊김
+            cancel_token.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"multipart 응답의 음성 합성 중 오류 발생: {str(e)}", exc_info=True)
+            chunks = None
+            error = json.dumps({"detail": f"음성 합성 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+        if chunks is None:
+            yield _multipart_part(boundary, {"Content-Type": "application/json; charset=utf-8"}, error.encode("utf-8"))
+        else:
+            yield _multipart_head(
+                boundary, {"Content-Type": media_type, **audio_cache_headers(audio_cache_service, audio_id, metadata)})
+            async for chunk in _stream_audio_chunks(chunks, cancel_token):
+                yield chunk
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("utf-8")
+        if on_complete is not None:
+            on_complete()
+
+    return StreamingResponse(parts(), media_type=f"multipart/mixed; boundary={boundary}")
+
+
+@router.post("/", summary="텍스트를 음성으로 변환",
+              dependencies=[Depends(admission_control("tts"))])
 async def convert_text_to_speech(
+        request: Request,
         query: TextQuery,
         provider: Literal["elevenlabs", "openai"] = Query(default="openai", description="사용할 음성 제공자"),
-        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="출력 형식 (mp3, opus, aac, pcm), 없으면 Accept 헤더로 결정"),
+        accept: Optional[str] = Header(default=None),
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("tts",)))
 ):
+    output_format = tts_service.negotiate_output_format(output_format, accept, provider)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 선택한 음성 제공자에서 지원하지 않습니다."
+        )
+
     try:
-        audio_stream = tts_service.text_to_speech_stream(query.text, provider=provider)
+        cancel_token = CancellationToken()
+        # 긴 텍스트는 첫 조각이 합성되는 대로 응답을 시작하고 나머지 조각을 이어서 보냄
+        audio_id, metadata, chunks = await run_until_disconnected(
+            request, cancel_token, tts_service.text_to_speech_cached_chunks, query.text,
+            provider=provider, output_format=output_format, cancel_token=cancel_token, deadline=deadline)
 
         return StreamingResponse(
-            audio_stream,
-            media_type="audio/mpeg",
+            _stream_audio_chunks(chunks, cancel_token),
+            media_type=tts_service.get_media_type(output_format),
             headers={
-                "Content-Disposition": "attachment; filename=speech.mp3"
+                "Content-Disposition": f"attachment; filename=speech.{tts_service.get_file_extension(output_format)}",
+                **audio_cache_headers(audio_cache_service, audio_id, metadata)
             }
         )
+    except OperationCancelled:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"텍스트를 음성으로 변환하는 중 오류 발생: {str(e)}"
         )
+
+
+@router.post("/batch", summary="여러 텍스트를 병렬로 음성 변환하여 zip 아카이브로 스트리밍",
+              dependencies=[Depends(admission_control("tts")), Depends(request_priority(BULK))])
+async def convert_text_to_speech_batch(
+        query: TextBatchQuery,
+        provider: Optional[Literal["elevenlabs", "openai"]] = Query(
+            default=None, description="사용할 음성 제공자 (요청 본문의 provider보다 우선함)"),
+        output_format: Optional[str] = Query(
+            default=None, alias="format", description="아카이브에 담을 오디오 형식 (mp3, opus, aac, pcm, 기본값: mp3)"),
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service)
+):
+    if len(query.texts) > settings.TTS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 변환할 수 있는 텍스트는 최대 {settings.TTS_BATCH_MAX_ITEMS}개입니다."
+        )
+    if any(not text.strip() for text in query.texts):
+        raise HTTPException(
+            status_code=400,
+            detail="빈 텍스트는 변환할 수 없습니다."
+        )
+
+    selected_provider = provider or query.provider or "openai"
+
+    # Accept 헤더는 zip 아카이브 자체를 가리킬 수 있으므로 형식은 쿼리 파라미터로만 선택
+    output_format = tts_service.negotiate_output_format(output_format, None, selected_provider)
+    if output_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="요청한 오디오 형식은 선택한 음성 제공자에서 지원하지 않습니다."
+        )
+
+    return StreamingResponse(
+        _zip_batch_stream(tts_service, query.texts, selected_provider, output_format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=speech_batch.zip"
+        }
+    )
+
+
+@router.get("/audio/{audio_id}", summary="합성된 오디오 가져오기 (ETag, Range 지원)")
+async def get_synthesized_audio(
+        request: Request,
+        audio_id: str,
+        if_none_match: Optional[str] = Header(default=None),
+        range_header: Optional[str] = Header(default=None, alias="Range"),
+        if_range: Optional[str] = Header(default=None),
+        tts_service: TextToSpeechService = Depends(get_text_to_speech_service),
+        audio_cache_service: AudioCacheService = Depends(get_audio_cache_service),
+        deadline: Deadline = Depends(request_deadline(settings.DEADLINE_DEFAULT_SECONDS, ("tts",)))
+):
+    # 캐시에 있는 오디오(304 포함)는 합성하지 않으므로 입장 제어 없이 바로 응답
+    metadata = await asyncio.to_thread(audio_cache_service.get_metadata, audio_id)
+    if metadata is None:
+        raise HTTPException(
+            status_code=404,
+            detail="오디오를 찾을 수 없습니다."
+        )
+    if "etag" in metadata and _if_none_match(if_none_match, metadata["etag"]):
+        return Response(
+            status_code=304,
+            headers={**audio_cache_headers(audio_cache_service, audio_id, metadata), "Accept-Ranges": "bytes"}
+        )
+
+    audio = await asyncio.to_thread(audio_cache_service.read_audio, audio_id) if "etag" in metadata else None
+    if audio is None:
+        # 캐시에서 제거되었으면 다시 합성하므로 음성 합성 자리를 차지
+        async with admission_controller.admit("tts", settings.ADMISSION_TTS_ESTIMATED_BYTES):
+            try:
+                # 합성은 이벤트 루프를 막지 않도록 스레드에서 실행
+                cancel_token = CancellationToken()
+                metadata, audio = await run_until_disconnected(
+                    request, cancel_token, tts_service.get_cached_audio, audio_id, cancel_token, deadline)
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"텍스트를 음성으로 변환하는 중 오류 발생: {str(e)}"
+                )
+        if metadata is None:
+            raise HTTPException(
+                status_code=404,
+                detail="오디오를 찾을 수 없습니다."
+            )
+
+    headers = {
+        **audio_cache_headers(audio_cache_service, audio_id, metadata),
+        "Accept-Ranges": "bytes"
+    }
+    media_type = tts_service.get_media_type(metadata["output_format"])
+
+    if _if_none_match(if_none_match, metadata["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    # If-Range가 현재 ETag와 다르면 전체 오디오를 보냄
+    if range_header and _if_range_matches(if_range, metadata["etag"]):
+        try:
+            byte_range = _parse_range(range_header, len(audio))
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{len(audio)}"}
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return Response(
+                content=audio[start:end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(audio)}"}
+            )
+
+    return Response(content=audio, media_type=media_type, headers=headers)
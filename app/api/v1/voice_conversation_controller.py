@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.api.v1.assistant_controller import _validate_thread_id
+from app.core.cancellation import CancellationToken, OperationCancelled
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.scheduler import INTERACTIVE, current_priority
+from app.core.thread_affinity import thread_affinity
+from app.dependencies import get_assistant_service, get_chatgpt_service, get_speech_to_text_service, \
+    get_text_to_speech_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/voice", tags=["voice"])
+
+
+class _VoiceSession:
+    """
+    하나의 WebSocket 연결 동안 유지되는 음성 대화 상태.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.mode = "assistant"
+        self.provider = "openai"
+        self.ext = ".webm"
+        self.output_format = "mp3"
+        self.thread_id: Optional[str] = None
+        self.buffer = bytearray()
+        self.turn_task: Optional[asyncio.Task] = None
+        self.turn_cancel_token: Optional[CancellationToken] = None
+
+    def configure(self, message: dict) -> Optional[str]:
+        """
+        클라이언트가 보낸 설정을 적용합니다. 잘못된 입력 형식이나 스레드 ID는 적용하지 않고 오류 내용을 반환합니다.
+        (WebSocket에서는 HTTP 오류로 응답할 수 없으므로 호출자가 error 메시지로 알림)
+        """
+        errors = []
+        if message.get("mode") in ("assistant", "chatgpt"):
+            self.mode = message["mode"]
+        if message.get("provider") in ("elevenlabs", "openai"):
+            self.provider = message["provider"]
+        if message.get("format"):
+            ext = get_speech_to_text_service().get_stream_extension(str(message["format"]))
+            if ext is None:
+                errors.append(f"지원하지 않는 오디오 형식입니다: {message['format']}")
+            else:
+                self.ext = ext
+        # 제공자가 지원하지 않는 출력 형식이면 mp3 사용
+        self.output_format = get_text_to_speech_service().negotiate_output_format(
+            message.get("outputFormat") or self.output_format, None, self.provider) or "mp3"
+        if "threadId" in message:
+            thread_id = message.get("threadId") or None
+            if thread_id is not None and _validate_thread_id(str(thread_id)) is None:
+                errors.append("잘못된 형식의 threadId입니다.")
+            else:
+                self.thread_id = thread_id
+        return " ".join(errors) or None
+
+    async def apply_configuration(self, message: dict) -> None:
+        """
+        설정을 적용하고, 잘못된 값이 있으면 error 메시지를 보낸 뒤 준비 메시지를 보냅니다.
+        """
+        error = self.configure(message)
+        if error:
+            await self.websocket.send_json({"type": "error", "detail": error})
+        await self.websocket.send_json(_ready_message(self))
+
+    @property
+    def responding(self) -> bool:
+        return self.turn_task is not None and not self.turn_task.done()
+
+    async def cancel_turn(self) -> None:
+        """
+        진행 중인 응답을 취소합니다 (barge-in).
+        """
+        if not self.responding:
+            return
+        # 스레드에서 진행 중인 외부 API 호출(실행, 합성 스트림)도 중단
+        self.turn_cancel_token.cancel("barge_in")
+        self.turn_task.cancel()
+        try:
+            await self.turn_task
+        except asyncio.CancelledError:
+            pass
+        await self.websocket.send_json({"type": "cancelled"})
+
+    def end_utterance(self) -> None:
+        """
+        버퍼에 모인 발화로 응답 처리를 시작합니다.
+        """
+        if not self.buffer:
+            return
+        audio = bytes(self.buffer)
+        self.buffer.clear()
+        self.turn_cancel_token = CancellationToken()
+        self.turn_task = asyncio.create_task(self._run_turn(audio, self.turn_cancel_token))
+
+    def close(self) -> None:
+        """
+        연결이 끊기면 진행 중인 응답과 외부 API 호출을 취소합니다.
+        """
+        if self.turn_task is not None:
+            self.turn_cancel_token.cancel()
+            self.turn_task.cancel()
+
+    async def _run_turn(self, audio: bytes, cancel_token: CancellationToken) -> None:
+        """
+        STT → ChatGPT/Assistant → TTS를 수행하고 결과를 같은 소켓으로 전송합니다.
+        """
+        try:
+            transcription = await asyncio.to_thread(
+                get_speech_to_text_service().speech_to_text_from_bytes, audio, self.ext, cancel_token)
+            await self.websocket.send_json({"type": "transcript", "text": transcription.text})
+            if not transcription.text.strip():
+                return
+
+            if self.mode == "assistant":
+                _, response_text, self.thread_id = await asyncio.to_thread(
+                    get_assistant_service().get_response, transcription.text, self.thread_id, cancel_token)
+            else:
+                response_text = await asyncio.to_thread(
+                    get_chatgpt_service().get_response, transcription.text, cancel_token)
+            await self.websocket.send_json({"type": "response", "text": response_text, "threadId": self.thread_id})
+
+            # 긴 응답은 나누어 합성되므로 앞 조각이 완성되는 대로 보냄
+            audio_chunks = get_text_to_speech_service().iter_speech_chunks(
+                response_text, self.provider, self.output_format, cancel_token)
+            try:
+                while (audio := await asyncio.to_thread(next, audio_chunks, None)) is not None:
+                    for start in range(0, len(audio), settings.VOICE_WS_AUDIO_FRAME_BYTES):
+                        await self.websocket.send_bytes(audio[start:start + settings.VOICE_WS_AUDIO_FRAME_BYTES])
+            finally:
+                # 전송이 실패하거나 응답이 취소되면 아직 시작하지 않은 조각은 합성하지 않도록 닫음
+                # (스레드에서 조각을 꺼내는 중이면 취소 토큰으로 중단된 뒤 스스로 정리됨)
+                if not audio_chunks.gi_running:
+                    audio_chunks.close()
+            await self.websocket.send_json({"type": "audio_end"})
+        except asyncio.CancelledError:
+            raise
+        except CircuitOpenError as e:
+            await self.websocket.send_json({"type": "error", "detail": str(e)})
+        except (WebSocketDisconnect, OperationCancelled):
+            pass
+        except Exception as e:
+            logger.error(f"음성 대화 처리 중 오류 발생: {str(e)}", exc_info=True)
+            await self.websocket.send_json({"type": "error", "detail": f"음성 대화를 처리하는 중 오류 발생: {str(e)}"})
+
+
+def _ready_message(session: _VoiceSession) -> dict:
+    """
+    준비 메시지를 만듭니다. 대화 스레드를 다른 노드가 담당하면 그 노드의 WebSocket 주소를 함께 알려줍니다.
+    (이 연결도 계속 처리하므로 클라이언트는 다시 연결할지 선택할 수 있습니다.)
+    """
+    message = {"type": "ready", "threadId": session.thread_id}
+    if session.thread_id and not thread_affinity.is_local(session.thread_id):
+        owner = thread_affinity.owner(session.thread_id)
+        message["redirect"] = owner.replace("http", "ws", 1) + session.websocket.url.path
+    return message
+
+
+@router.websocket("/ws")
+async def voice_conversation(websocket: WebSocket):
+    """
+    양방향 음성 대화 WebSocket.
+
+    클라이언트는 마이크 오디오를 바이너리 프레임으로 보내고, 발화가 끝나면 {"type": "end"}를 보냅니다.
+    (VOICE_WS_UTTERANCE_IDLE_SECONDS 동안 오디오가 오지 않아도 발화가 끝난 것으로 봅니다.)
+    서버는 transcript, response JSON 메시지와 응답 오디오 바이너리 프레임, audio_end 메시지를 차례로 보냅니다.
+    응답 중에 새 오디오나 {"type": "cancel"}을 받으면 진행 중인 응답을 취소합니다.
+    """
+    await websocket.accept()
+    # 응답 처리 태스크는 이 컨텍스트를 복사하므로 모든 외부 API 호출이 interactive로 처리됨
+    current_priority.set(INTERACTIVE)
+    session = _VoiceSession(websocket)
+    await session.apply_configuration(dict(websocket.query_params))
+
+    idle_timeout = settings.VOICE_WS_UTTERANCE_IDLE_SECONDS or None
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    websocket.receive(),
+                    timeout=idle_timeout if session.buffer else None
+                )
+            except asyncio.TimeoutError:
+                session.end_utterance()
+                continue
+
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                # 응답 중에 사용자가 다시 말하기 시작하면 응답 취소
+                if session.responding:
+                    await session.cancel_turn()
+                if len(session.buffer) + len(message["bytes"]) > settings.VOICE_WS_MAX_UTTERANCE_BYTES:
+                    session.buffer.clear()
+                    await websocket.send_json({"type": "error", "detail": "발화가 너무 깁니다."})
+                    continue
+                session.buffer.extend(message["bytes"])
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "")
+                if not isinstance(control, dict):
+                    raise ValueError
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "잘못된 형식의 메시지입니다."})
+                continue
+
+            if control.get("type") == "start":
+                await session.apply_configuration(control)
+            elif control.get("type") == "end":
+                session.end_utterance()
+            elif control.get("type") == "cancel":
+                session.buffer.clear()
+                await session.cancel_turn()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
@@ -0,0 +1,183 @@
+"""
+메모리를 많이 쓰는 오디오 요청의 동시 처리 수와 처리 중인 오디오 크기를 워커별로 제한하는 입장 제어.
+
+요청 종류(STT, TTS, STT → LLM → TTS 통합)마다 동시 처리 수를 따로 제한하고, 워커 전체에서 처리 중인
+오디오 바이트 수가 한도를 넘지 않게 합니다. 한도를 넘는 요청은 종류별 대기열에서 잠시 기다리며,
+대기열이 가득 찼거나 대기 시간이 지나면 503과 Retry-After로 거절합니다.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Tuple
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+ADMISSION_KINDS = ("stt", "tts", "pipeline")
+
+
+class AdmissionRejected(Exception):
+    """
+    처리 한도를 넘어 요청을 받지 않았을 때 발생하는 예외.
+    """
+
+    def __init__(self, kind: str, reason: str, retry_after: float):
+        self.kind = kind
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"서버가 처리할 수 있는 {kind} 요청 수를 넘었습니다. {retry_after:.0f}초 후 다시 시도하세요.")
+
+
+class AdmissionController:
+    """
+    워커 프로세스의 오디오 요청 입장 제어.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, int] = {kind: 0 for kind in ADMISSION_KINDS}
+        self._inflight_bytes = 0
+        # 종류별 대기열 (대기 중인 요청의 future, 예상 바이트 수)
+        self._waiters: Dict[str, Deque[Tuple[asyncio.Future, int]]] = {kind: deque() for kind in ADMISSION_KINDS}
+
+    @asynccontextmanager
+    async def admit(self, kind: str, nbytes: int) -> AsyncIterator[None]:
+        """
+        요청을 처리할 수 있을 때까지 기다렸다가 처리가 끝나면 자리를 반납합니다.
+
+        Args:
+            kind: 요청 종류 (ADMISSION_KINDS 중 하나)
+            nbytes: 요청이 메모리에 올릴 것으로 예상되는 오디오 바이트 수
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나 대기 시간 안에 자리가 나지 않은 경우
+        """
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            yield
+            return
+
+        await self._acquire(kind, nbytes)
+        try:
+            yield
+        finally:
+            self._release(kind, nbytes)
+
+    def status(self) -> dict:
+        """
+        종류별 처리 중인 요청 수, 대기 중인 요청 수와 처리 중인 오디오 바이트 수를 반환합니다.
+        """
+        return {
+            "inflight_bytes": self._inflight_bytes,
+            "active": dict(self._active),
+            "queued": {kind: len(waiters) for kind, waiters in self._waiters.items()}
+        }
+
+    async def _acquire(self, kind: str, nbytes: int) -> None:
+        waiters = self._waiters[kind]
+        # 먼저 기다리던 요청이 있으면 새 요청이 앞지르지 않도록 대기열 뒤에 섬
+        if not waiters and self._can_admit(kind, nbytes):
+            self._admit(kind, nbytes)
+            return
+
+        if len(waiters) >= settings.ADMISSION_QUEUE_SIZE:
+            self._reject(kind, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, nbytes)
+        waiters.append(entry)
+        metrics.increment("admission_queued_total", kind=kind)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done():
+                # 자리를 넘겨받은 직후에 시간이 지났거나 취소되었으면 받은 자리를 반납
+                self._release(kind, nbytes)
+            else:
+                future.cancel()
+                waiters.remove(entry)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject(kind, "queue_timeout")
+
+    def _release(self, kind: str, nbytes: int) -> None:
+        self._active[kind] -= 1
+        self._inflight_bytes -= nbytes
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """
+        자리가 난 만큼 대기열 앞의 요청들에게 자리를 넘깁니다.
+        """
+        for kind, waiters in self._waiters.items():
+            while waiters and self._can_admit(kind, waiters[0][1]):
+                future, nbytes = waiters.popleft()
+                if future.done():
+                    continue
+                self._admit(kind, nbytes)
+                future.set_result(None)
+
+    def _can_admit(self, kind: str, nbytes: int) -> bool:
+        if self._active[kind] >= _max_concurrency(kind):
+            return False
+        # 처리 중인 요청이 없으면 한도보다 큰 요청도 혼자 처리
+        return self._inflight_bytes == 0 or self._inflight_bytes + nbytes <= settings.ADMISSION_MAX_INFLIGHT_BYTES
+
+    def _admit(self, kind: str, nbytes: int) -> None:
+        self._active[kind] += 1
+        self._inflight_bytes += nbytes
+
+    def _reject(self, kind: str, reason: str) -> None:
+        metrics.increment("admission_rejected_total", kind=kind, reason=reason)
+        raise AdmissionRejected(kind, reason, max(1.0, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS))
+
+
+def _max_concurrency(kind: str) -> int:
+    return {
+        "stt": settings.ADMISSION_STT_MAX_CONCURRENCY,
+        "tts": settings.ADMISSION_TTS_MAX_CONCURRENCY,
+        "pipeline": settings.ADMISSION_PIPELINE_MAX_CONCURRENCY
+    }[kind]
+
+
+def _estimate_bytes(kind: str, request: Request) -> int:
+    """
+    요청이 메모리에 올릴 오디오 바이트 수를 추정합니다.
+
+    업로드는 요청 본문 크기의 두 배(업로드 버퍼와 읽어 들인 사본), 음성 합성은
+    ADMISSION_TTS_ESTIMATED_BYTES로 계산합니다.
+    """
+    try:
+        content_length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        content_length = 0
+
+    if kind == "tts":
+        return settings.ADMISSION_TTS_ESTIMATED_BYTES
+    estimated = content_length * 2
+    if kind == "pipeline":
+        estimated += settings.ADMISSION_TTS_ESTIMATED_BYTES
+    return estimated
+
+
+def admission_control(kind: str) -> Callable[..., AsyncIterator[None]]:
+    """
+    요청 처리 동안 입장 제어 자리를 차지하는 의존성을 생성합니다.
+
+    Args:
+        kind: 요청 종류 (ADMISSION_KINDS 중 하나)
+
+    Returns:
+        FastAPI 의존성 함수
+    """
+
+    async def dependency(request: Request) -> AsyncIterator[None]:
+        # 스트리밍 응답을 모두 보낼 때까지 자리를 유지
+        async with admission_controller.admit(kind, _estimate_bytes(kind, request)):
+            yield
+
+    return dependency
+
+
+# 기본 인스턴스 생성
+admission_controller = AdmissionController()
@@ -0,0 +1,148 @@
+"""
+클라이언트 연결 종료 등으로 요청이 취소되었을 때 진행 중인 외부 API 작업을 중단하기 위한 도구.
+
+서비스 메서드는 스레드에서 동기적으로 실행되므로, 취소 여부는 스레드 간에 공유되는
+CancellationToken으로 전달하고 각 서비스가 외부 API 호출 사이사이와 스트림 청크마다 확인합니다.
+"""
+import asyncio
+import logging
+import threading
+from typing import Callable, List, Optional, TypeVar
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class OperationCancelled(Exception):
+    """
+    요청이 취소되어 작업을 중단했을 때 발생하는 예외.
+    """
+
+
+class CancellationToken:
+    """
+    하나의 요청 동안 여러 서비스 호출이 공유하는 취소 신호.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "client_disconnected") -> None:
+        """
+        취소 신호를 보내고 등록된 콜백을 실행합니다. 두 번째 호출부터는 아무 일도 하지 않습니다.
+
+        Args:
+            reason: 취소 사유
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"취소 콜백 실행 중 오류 발생: {str(e)}")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        취소될 때 실행할 콜백을 등록합니다. 이미 취소되었으면 즉시 실행합니다.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """
+        등록한 콜백을 제거합니다.
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        """
+        취소되었으면 OperationCancelled를 발생시킵니다.
+        """
+        if self._event.is_set():
+            raise OperationCancelled(f"요청이 취소되었습니다. ({self.reason})")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        time.sleep 대신 사용하며, 취소되면 즉시 깨어납니다.
+
+        Returns:
+            취소되었으면 True
+        """
+        return self._event.wait(timeout)
+
+
+def raise_if_cancelled(cancel_token: Optional[CancellationToken]) -> None:
+    """
+    cancel_token이 주어졌고 취소되었으면 OperationCancelled를 발생시킵니다.
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+async def run_until_disconnected(
+        request: Request,
+        cancel_token: CancellationToken,
+        func: Callable[..., T],
+        /,
+        *args,
+        **kwargs
+) -> T:
+    """
+    동기 함수를 스레드에서 실행하면서 클라이언트 연결 종료를 감시합니다.
+
+    연결이 끊기면 cancel_token을 취소하여 스레드의 작업이 다음 확인 지점에서 중단되게 하고,
+    스레드가 끝나기를 기다리지 않고 바로 OperationCancelled를 발생시킵니다.
+
+    Args:
+        request: 감시할 요청
+        cancel_token: 함수에 전달한 취소 토큰
+        func: 실행할 동기 함수
+        *args, **kwargs: 함수 인자
+
+    Returns:
+        함수의 반환값
+
+    Raises:
+        OperationCancelled: 클라이언트 연결이 끊긴 경우
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.CANCEL_POLL_INTERVAL_SECONDS)
+            if done:
+                return task.result()
+            if cancel_token.cancelled or await request.is_disconnected():
+                # 동시에 실행 중인 다른 단계가 이미 취소한 경우에는 한 번만 기록
+                if not cancel_token.cancelled:
+                    cancel_token.cancel()
+                    metrics.increment("requests_cancelled_total", route=request.url.path)
+                    logger.info(f"클라이언트 연결이 끊겨 요청을 취소합니다: {request.url.path}")
+                raise OperationCancelled("클라이언트 연결이 끊겼습니다.")
+    except (OperationCancelled, asyncio.CancelledError):
+        # 스레드에서 발생할 취소 예외를 조용히 처리
+        task.add_done_callback(lambda finished: finished.exception())
+        raise
@@ -0,0 +1,225 @@
+"""
+외부 API(제공자/API 종류)별 회로 차단기.
+
+최근 호출의 오류율 또는 느린 호출 비율이 임계값을 넘으면 회로를 열어 일정 시간 동안 호출하지 않고 바로 실패하고,
+그 뒤에는 소수의 시험 호출(half-open)로 회복 여부를 확인합니다.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import openai
+
+from app.core.cancellation import OperationCancelled
+from app.core.config import settings
+from app.core.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 회로 차단기별 느린 호출 기준(초)
+_SLOW_CALL_SECONDS = {
+    "openai_chat": 15.0,
+    "openai_assistants": 45.0,
+    "openai_stt": 60.0,
+    "openai_tts": 20.0,
+    "elevenlabs_tts": 20.0,
+}
+
+
+class CircuitOpenError(OperationCancelled):
+    """
+    회로가 열려 있어 외부 API를 호출하지 않고 중단했을 때 발생하는 예외.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"외부 API({name})가 불안정하여 일시적으로 요청을 보내지 않습니다. {retry_after:.0f}초 후 다시 시도하세요.")
+
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """
+    예외가 외부 API 장애로 볼 수 있는 오류인지 판단합니다. 잘못된 요청(4xx)은 장애로 보지 않습니다.
+    """
+    status_code = getattr(exc, "status_code", None)
+    if isinstance(exc, openai.APIStatusError) or isinstance(status_code, int):
+        return status_code is None or status_code >= 500 or status_code == 429
+    return isinstance(exc, (openai.APIConnectionError, httpx.HTTPError, OSError)) or type(exc) is Exception
+
+
+class CircuitBreaker:
+    """
+    하나의 외부 API에 대한 회로 차단기.
+    """
+
+    def __init__(self, name: str, slow_call_seconds: float):
+        """
+        Args:
+            name: 회로 차단기 이름 (예: "openai_chat")
+            slow_call_seconds: 이 시간보다 오래 걸린 호출은 느린 호출로 셈
+        """
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self._lock = threading.Lock()
+        # 최근 호출 결과 (실패 여부, 소요 시간)
+        self._window: Deque[Tuple[bool, float]] = deque(maxlen=settings.CIRCUIT_BREAKER_WINDOW_SIZE)
+        self._state = CLOSED
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        외부 API 호출을 감싸 결과를 기록합니다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 시험 호출 수가 가득 찬 경우
+        """
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            yield
+            return
+
+        probing = self._acquire()
+        started_at = time.monotonic()
+        try:
+            yield
+        except OperationCancelled:
+            # 취소나 제한 시간 초과는 오래 걸린 경우에만 느린 호출로 기록
+            elapsed = time.monotonic() - started_at
+            self._release(probing, failed=False, elapsed=elapsed, record=elapsed >= self.slow_call_seconds)
+            raise
+        except Exception as e:
+            failed = _is_upstream_failure(e)
+            self._release(probing, failed=failed, elapsed=time.monotonic() - started_at, record=True)
+            raise
+        else:
+            self._release(probing, failed=False, elapsed=time.monotonic() - started_at, record=True)
+
+    def status(self) -> dict:
+        """
+        회로 상태와 최근 호출 통계를 반환합니다.
+        """
+        with self._lock:
+            self._refresh_state()
+            window = list(self._window)
+            state, opened_at = self._state, self._opened_at
+
+        latencies = sorted(elapsed for _, elapsed in window)
+        return {
+            "name": self.name,
+            "state": state,
+            "calls": len(window),
+            "failure_rate": _rate(failed for failed, _ in window),
+            "slow_call_rate": _rate(elapsed >= self.slow_call_seconds for _, elapsed in window),
+            "latency_p50_seconds": _percentile(latencies, 0.5),
+            "latency_p95_seconds": _percentile(latencies, 0.95),
+            "retry_after_seconds": self._retry_after(opened_at) if state == OPEN else None
+        }
+
+    def _acquire(self) -> bool:
+        """
+        호출 허용 여부를 확인하고, 시험 호출이면 True를 반환합니다.
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and self._half_open_calls < settings.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS:
+                self._half_open_calls += 1
+                return True
+            retry_after = self._retry_after(self._opened_at) if self._state == OPEN else 1.0
+
+        metrics.increment("circuit_rejected_total", circuit=self.name)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _release(self, probing: bool, failed: bool, elapsed: float, record: bool) -> None:
+        with self._lock:
+            if probing:
+                self._half_open_calls -= 1
+                if record and self._state == HALF_OPEN:
+                    if failed or elapsed >= self.slow_call_seconds:
+                        self._open()
+                    else:
+                        # 시험 호출이 성공하면 이전 기록을 지우고 정상 상태로 복귀
+                        self._window.clear()
+                        self._state = CLOSED
+                        metrics.increment("circuit_transitions_total", circuit=self.name, state=CLOSED)
+                return
+            if not record:
+                return
+
+            self._window.append((failed, elapsed))
+            if self._state == CLOSED and len(self._window) >= settings.CIRCUIT_BREAKER_MIN_CALLS:
+                failure_rate = _rate(failed for failed, _ in self._window)
+                slow_call_rate = _rate(elapsed >= self.slow_call_seconds for _, elapsed in self._window)
+                if (failure_rate >= settings.CIRCUIT_BREAKER_FAILURE_RATE
+                        or slow_call_rate >= settings.CIRCUIT_BREAKER_SLOW_CALL_RATE):
+                    self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        metrics.increment("circuit_transitions_total", circuit=self.name, state=OPEN)
+
+    def _refresh_state(self) -> None:
+        if self._state == OPEN and self._retry_after(self._opened_at) <= 0:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+            metrics.increment("circuit_transitions_total", circuit=self.name, state=HALF_OPEN)
+
+    def _retry_after(self, opened_at: Optional[float]) -> float:
+        if opened_at is None:
+            return 0.0
+        return max(0.0, settings.CIRCUIT_BREAKER_OPEN_SECONDS - (time.monotonic() - opened_at))
+
+
+class CircuitBreakerRegistry:
+    """
+    이름별 회로 차단기 모음.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        이름에 해당하는 회로 차단기를 가져옵니다. 없으면 생성합니다.
+        """
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, _SLOW_CALL_SECONDS.get(name, 30.0))
+            return self._breakers[name]
+
+    def statuses(self) -> List[dict]:
+        """
+        모든 회로 차단기의 상태를 반환합니다. 아직 호출되지 않은 외부 API도 포함합니다.
+        """
+        return [self.get(name).status() for name in sorted(set(_SLOW_CALL_SECONDS) | set(self._breakers))]
+
+
+def _rate(flags) -> float:
+    flags = list(flags)
+    return round(sum(flags) / len(flags), 3) if flags else 0.0
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+# 기본 인스턴스 생성
+circuit_breakers = CircuitBreakerRegistry()
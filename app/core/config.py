@@ -16,6 +16,23 @@ class Settings(BaseModel):
     PROJECT_DESCRIPTION: str = "ElevenLabs를 사용하여 텍스트 쿼리를 음성으로 변환하고, OpenAI를 사용하여 음성을 텍스트로 변환하는 API"
     VERSION: str = "1.0.0"
 
+    # Production server settings (app/server.py)
+    SERVER_HOST: str = Field(default_factory=lambda: os.getenv("SERVER_HOST", "0.0.0.0"))
+    SERVER_PORT: int = Field(default_factory=lambda: int(os.getenv("SERVER_PORT", "9090")))
+    # 0이면 CPU 수만큼 워커 실행
+    SERVER_WORKERS: int = Field(default_factory=lambda: int(os.getenv("SERVER_WORKERS", "0")))
+    SERVER_BACKLOG: int = Field(default_factory=lambda: int(os.getenv("SERVER_BACKLOG", "2048")))
+    # 로드 밸런서의 유휴 연결 시간(보통 60초)보다 길게 설정
+    SERVER_KEEPALIVE_SECONDS: int = Field(default_factory=lambda: int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75")))
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30")))
+    # 0이면 워커를 교체하지 않음
+    SERVER_LIMIT_MAX_REQUESTS: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_LIMIT_MAX_REQUESTS", "10000")))
+    SERVER_LIMIT_MAX_REQUESTS_JITTER: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_LIMIT_MAX_REQUESTS_JITTER", "1000")))
+    SERVER_ACCESS_LOG: bool = Field(default_factory=lambda: os.getenv("SERVER_ACCESS_LOG", "true").lower() == "true")
+
     # ElevenLabs settings
     ELEVENLABS_API_KEY: str = Field(default_factory=lambda: os.getenv("ELEVENLABS_API_KEY", ""))
     ELEVENLABS_VOICE_ID: str = Field(
@@ -27,15 +44,249 @@ class Settings(BaseModel):
     OPENAI_MODEL: str = Field(default_factory=lambda: os.getenv("OPENAI_MODEL", "whisper-1"))
     OPENAI_CHAT_MODEL: str = Field(default_factory=lambda: os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"))
 
+    # ChatGPT model routing settings
+    # 질문 길이/종류/경로와 관측한 응답 시간으로 빠른 모델과 성능이 높은 모델 중에서 선택 (사용하지 않으면 OPENAI_CHAT_MODEL)
+    CHAT_MODEL_ROUTING_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("CHAT_MODEL_ROUTING_ENABLED", "false").lower() == "true")
+    CHAT_FAST_MODEL: str = Field(default_factory=lambda: os.getenv("CHAT_FAST_MODEL", "gpt-4o-mini"))
+    CHAT_STRONG_MODEL: str = Field(default_factory=lambda: os.getenv("CHAT_STRONG_MODEL", "gpt-4o"))
+    # 이 글자 수를 넘는 질문은 성능이 높은 모델이 필요한 것으로 판단
+    CHAT_ROUTER_FAST_MAX_CHARS: int = Field(default_factory=lambda: int(os.getenv("CHAT_ROUTER_FAST_MAX_CHARS", "120")))
+    # 음성 질문 경로 (짧은 응답이 중요하므로 특징이 둘 이상일 때만 성능이 높은 모델 사용)
+    CHAT_ROUTER_VOICE_ROUTES: str = Field(
+        default_factory=lambda: os.getenv("CHAT_ROUTER_VOICE_ROUTES", "/api/v1/stt-chatgpt-tts,/api/v1/chatgpt/upload"))
+    # 경로별 모델 지정 (예: "/api/v1/chatgpt/audio-url=fast,/api/v1/chatgpt/=gpt-4o"), 가장 긴 경로 접두사가 우선
+    CHAT_MODEL_ROUTE_OVERRIDES: str = Field(default_factory=lambda: os.getenv("CHAT_MODEL_ROUTE_OVERRIDES", ""))
+
+    # ChatGPT response cache settings
+    CHAT_CACHE_ENABLED: bool = Field(default_factory=lambda: os.getenv("CHAT_CACHE_ENABLED", "false").lower() == "true")
+    CHAT_CACHE_MAX_ENTRIES: int = Field(default_factory=lambda: int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "5000")))
+    CHAT_CACHE_TTL_SECONDS: int = Field(default_factory=lambda: int(os.getenv("CHAT_CACHE_TTL_SECONDS", "86400")))
+    CHAT_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        default_factory=lambda: float(os.getenv("CHAT_CACHE_SIMILARITY_THRESHOLD", "0.85")))
+    CHAT_CACHE_NGRAM_SIZE: int = Field(default_factory=lambda: int(os.getenv("CHAT_CACHE_NGRAM_SIZE", "2")))
+
+    # STT preprocessing settings
+    STT_VAD_ENABLED: bool = Field(default_factory=lambda: os.getenv("STT_VAD_ENABLED", "false").lower() == "true")
+    STT_VAD_THRESHOLD_DBFS: float = Field(default_factory=lambda: float(os.getenv("STT_VAD_THRESHOLD_DBFS", "-45")))
+    STT_VAD_MIN_SILENCE_MS: int = Field(default_factory=lambda: int(os.getenv("STT_VAD_MIN_SILENCE_MS", "500")))
+    STT_VAD_MIN_SPEECH_MS: int = Field(default_factory=lambda: int(os.getenv("STT_VAD_MIN_SPEECH_MS", "100")))
+    STT_VAD_PADDING_MS: int = Field(default_factory=lambda: int(os.getenv("STT_VAD_PADDING_MS", "200")))
+    STT_NORMALIZE_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("STT_NORMALIZE_ENABLED", "false").lower() == "true")
+    STT_NORMALIZE_SAMPLE_RATE: int = Field(default_factory=lambda: int(os.getenv("STT_NORMALIZE_SAMPLE_RATE", "16000")))
+    STT_NORMALIZE_FORMAT: str = Field(default_factory=lambda: os.getenv("STT_NORMALIZE_FORMAT", "ogg"))
+    STT_NORMALIZE_CODEC: str = Field(default_factory=lambda: os.getenv("STT_NORMALIZE_CODEC", "libopus"))
+    STT_NORMALIZE_BITRATE: str = Field(default_factory=lambda: os.getenv("STT_NORMALIZE_BITRATE", "24k"))
+
+    # STT long-audio settings
+    # 오디오 URL 다운로드 제한 시간 (요청 처리 제한 시간이 있으면 STT 단계 배분 시간과 작은 쪽 사용)
+    STT_DOWNLOAD_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("STT_DOWNLOAD_TIMEOUT_SECONDS", "30")))
+    STT_UPLOAD_LIMIT_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("STT_UPLOAD_LIMIT_BYTES", str(25 * 1024 * 1024))))
+    STT_CHUNKING_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("STT_CHUNKING_ENABLED", "true").lower() == "true")
+    STT_CHUNK_MIN_FILE_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("STT_CHUNK_MIN_FILE_BYTES", str(2 * 1024 * 1024))))
+    STT_CHUNK_SECONDS: int = Field(default_factory=lambda: int(os.getenv("STT_CHUNK_SECONDS", "120")))
+    STT_CHUNK_OVERLAP_SECONDS: int = Field(default_factory=lambda: int(os.getenv("STT_CHUNK_OVERLAP_SECONDS", "2")))
+    STT_CHUNK_MAX_CONCURRENCY: int = Field(default_factory=lambda: int(os.getenv("STT_CHUNK_MAX_CONCURRENCY", "8")))
+
     # OpenAI TTS settings
     OPENAI_TTS_MODEL: str = Field(default_factory=lambda: os.getenv("OPENAI_TTS_MODEL", "tts-1"))
     OPENAI_TTS_VOICE: str = Field(default_factory=lambda: os.getenv("OPENAI_TTS_VOICE", "alloy"))
 
+    # TTS audio cache settings
+    AUDIO_CACHE_DIR: str = Field(default_factory=lambda: os.getenv("AUDIO_CACHE_DIR", ".cache/audio"))
+    AUDIO_CACHE_MAX_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(512 * 1024 * 1024))))
+    AUDIO_CACHE_MAX_AGE: int = Field(default_factory=lambda: int(os.getenv("AUDIO_CACHE_MAX_AGE", "86400")))
+
+    # Popularity statistics and cache warm-up settings
+    POPULARITY_ENABLED: bool = Field(default_factory=lambda: os.getenv("POPULARITY_ENABLED", "true").lower() == "true")
+    POPULARITY_FILE: str = Field(default_factory=lambda: os.getenv("POPULARITY_FILE", ".cache/popularity.json.gz"))
+    POPULARITY_MAX_ENTRIES: int = Field(default_factory=lambda: int(os.getenv("POPULARITY_MAX_ENTRIES", "2000")))
+    POPULARITY_FLUSH_INTERVAL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("POPULARITY_FLUSH_INTERVAL_SECONDS", "60")))
+    WARMUP_ENABLED: bool = Field(default_factory=lambda: os.getenv("WARMUP_ENABLED", "true").lower() == "true")
+    WARMUP_TTS_TOP_N: int = Field(default_factory=lambda: int(os.getenv("WARMUP_TTS_TOP_N", "100")))
+    WARMUP_CHAT_TOP_N: int = Field(default_factory=lambda: int(os.getenv("WARMUP_CHAT_TOP_N", "100")))
+    WARMUP_RATE_PER_SECOND: float = Field(default_factory=lambda: float(os.getenv("WARMUP_RATE_PER_SECOND", "2")))
+
+    # TTS batch settings
+    TTS_BATCH_MAX_ITEMS: int = Field(default_factory=lambda: int(os.getenv("TTS_BATCH_MAX_ITEMS", "500")))
+    TTS_ELEVENLABS_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("TTS_ELEVENLABS_MAX_CONCURRENCY", "4")))
+    TTS_OPENAI_MAX_CONCURRENCY: int = Field(default_factory=lambda: int(os.getenv("TTS_OPENAI_MAX_CONCURRENCY", "8")))
+
+    # Long-text TTS settings
+    # 긴 텍스트를 문장 단위로 나누어 동시에 합성한 뒤 이어 붙임 (mp3, pcm 형식만)
+    TTS_CHUNKING_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("TTS_CHUNKING_ENABLED", "true").lower() == "true")
+    TTS_CHUNK_MAX_CHARS: int = Field(default_factory=lambda: int(os.getenv("TTS_CHUNK_MAX_CHARS", "300")))
+    TTS_CHUNK_MAX_CONCURRENCY: int = Field(default_factory=lambda: int(os.getenv("TTS_CHUNK_MAX_CONCURRENCY", "4")))
+
+    # Acknowledgement audio settings
+    # 음성 응답을 기다리는 동안 먼저 보낼 짧은 안내 음성 (서버 시작 시 제공자/형식별로 미리 합성, mp3, pcm 형식만)
+    ACK_AUDIO_ENABLED: bool = Field(default_factory=lambda: os.getenv("ACK_AUDIO_ENABLED", "true").lower() == "true")
+    ACK_AUDIO_TEXT: str = Field(default_factory=lambda: os.getenv("ACK_AUDIO_TEXT", "네, 잠시만 기다려 주세요."))
+    ACK_AUDIO_FORMATS: str = Field(default_factory=lambda: os.getenv("ACK_AUDIO_FORMATS", "mp3"))
+
     # OpenAI Assistants settings
     OPENAI_ASSISTANT_ID: str = Field(
         default_factory=lambda: os.getenv("OPENAI_ASSISTANT_ID", "asst_cEaABZPKv6EUOHnIVp9fjkqd"))
     OPENAI_ASSISTANT_MODEL: str = Field(default_factory=lambda: os.getenv("OPENAI_ASSISTANT_MODEL", "gpt-4o-mini"))
 
+    # Voice WebSocket settings
+    VOICE_WS_MAX_UTTERANCE_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("VOICE_WS_MAX_UTTERANCE_BYTES", str(25 * 1024 * 1024))))
+    VOICE_WS_UTTERANCE_IDLE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("VOICE_WS_UTTERANCE_IDLE_SECONDS", "1.5")))
+    VOICE_WS_AUDIO_FRAME_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("VOICE_WS_AUDIO_FRAME_BYTES", "16384")))
+
+    # 클라이언트 연결 종료를 확인하는 주기
+    CANCEL_POLL_INTERVAL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CANCEL_POLL_INTERVAL_SECONDS", "0.25")))
+
+    # 요청 처리 제한 시간(deadline) 설정
+    DEADLINE_HEADER: str = Field(default_factory=lambda: os.getenv("DEADLINE_HEADER", "X-Request-Timeout"))
+    # 단일 외부 API를 호출하는 경로의 기본 제한 시간
+    DEADLINE_DEFAULT_SECONDS: float = Field(default_factory=lambda: float(os.getenv("DEADLINE_DEFAULT_SECONDS", "60")))
+    # STT → LLM → TTS를 연결하는 통합 경로의 기본 제한 시간
+    DEADLINE_PIPELINE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("DEADLINE_PIPELINE_SECONDS", "90")))
+    DEADLINE_MAX_SECONDS: float = Field(default_factory=lambda: float(os.getenv("DEADLINE_MAX_SECONDS", "300")))
+
+    # 외부 API 회로 차단기 설정
+    CIRCUIT_BREAKER_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true")
+    # 오류율/느린 호출 비율을 계산할 최근 호출 수와 최소 호출 수
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = Field(default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_WINDOW_SIZE", "20")))
+    CIRCUIT_BREAKER_MIN_CALLS: int = Field(default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "5")))
+    CIRCUIT_BREAKER_FAILURE_RATE: float = Field(
+        default_factory=lambda: float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5")))
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = Field(
+        default_factory=lambda: float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.8")))
+    # 회로를 연 뒤 시험 호출을 허용하기까지의 시간과 동시에 허용할 시험 호출 수
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30")))
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS: int = Field(
+        default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", "1")))
+    # 요청한 TTS 제공자의 회로가 열려 있으면 다른 제공자로 합성
+    TTS_PROVIDER_FALLBACK_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("TTS_PROVIDER_FALLBACK_ENABLED", "true").lower() == "true")
+
+    # Admission control settings (워커 프로세스별)
+    ADMISSION_CONTROL_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true")
+    # 요청 종류별 동시 처리 수
+    ADMISSION_STT_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("ADMISSION_STT_MAX_CONCURRENCY", "8")))
+    ADMISSION_TTS_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("ADMISSION_TTS_MAX_CONCURRENCY", "16")))
+    ADMISSION_PIPELINE_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("ADMISSION_PIPELINE_MAX_CONCURRENCY", "4")))
+    # 동시에 메모리에 올릴 수 있는 오디오 바이트 수 (기본값 256MB)
+    ADMISSION_MAX_INFLIGHT_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("ADMISSION_MAX_INFLIGHT_BYTES", str(256 * 1024 * 1024))))
+    # 음성 합성 응답 하나의 예상 크기 (기본값 2MB)
+    ADMISSION_TTS_ESTIMATED_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("ADMISSION_TTS_ESTIMATED_BYTES", str(2 * 1024 * 1024))))
+    # 요청 종류별 대기열 길이와 대기 시간
+    ADMISSION_QUEUE_SIZE: int = Field(default_factory=lambda: int(os.getenv("ADMISSION_QUEUE_SIZE", "16")))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5")))
+
+    # Upstream priority scheduling settings (워커 프로세스별)
+    SCHEDULER_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("SCHEDULER_ENABLED", "true").lower() == "true")
+    PRIORITY_HEADER: str = Field(default_factory=lambda: os.getenv("PRIORITY_HEADER", "X-Request-Priority"))
+    # 제공자별 동시 호출 수
+    SCHEDULER_OPENAI_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("SCHEDULER_OPENAI_MAX_CONCURRENCY", "16")))
+    SCHEDULER_ELEVENLABS_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("SCHEDULER_ELEVENLABS_MAX_CONCURRENCY", "4")))
+    # interactive 요청만 사용할 수 있는 호출 수
+    SCHEDULER_INTERACTIVE_RESERVED: int = Field(
+        default_factory=lambda: int(os.getenv("SCHEDULER_INTERACTIVE_RESERVED", "2")))
+    # bulk 요청이 사용할 수 있는 최대 비율
+    SCHEDULER_BULK_MAX_SHARE: float = Field(
+        default_factory=lambda: float(os.getenv("SCHEDULER_BULK_MAX_SHARE", "0.5")))
+    # 한 요청이 여러 조각을 동시에 호출할 때 사용할 수 있는 최대 비율 (우선순위별 호출 수 기준)
+    SCHEDULER_REQUEST_MAX_SHARE: float = Field(
+        default_factory=lambda: float(os.getenv("SCHEDULER_REQUEST_MAX_SHARE", "0.5")))
+
+    # Usage ledger settings
+    USAGE_LEDGER_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("USAGE_LEDGER_ENABLED", "true").lower() == "true")
+    USAGE_LEDGER_FILE: str = Field(default_factory=lambda: os.getenv("USAGE_LEDGER_FILE", ".cache/usage/ledger.csv"))
+    # 원장 파일이 이 크기를 넘으면 순환 (기본값 10MB), 순환된 파일은 최대 USAGE_LEDGER_BACKUP_COUNT개 보관
+    USAGE_LEDGER_MAX_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("USAGE_LEDGER_MAX_BYTES", str(10 * 1024 * 1024))))
+    USAGE_LEDGER_BACKUP_COUNT: int = Field(default_factory=lambda: int(os.getenv("USAGE_LEDGER_BACKUP_COUNT", "5")))
+    USAGE_LEDGER_FLUSH_INTERVAL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("USAGE_LEDGER_FLUSH_INTERVAL_SECONDS", "10")))
+
+    # Shared cache settings
+    # 같은 호스트의 모든 워커가 함께 사용하는 SQLite(WAL) 캐시 (ChatGPT 응답, STT 변환 결과)
+    SHARED_CACHE_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true")
+    SHARED_CACHE_FILE: str = Field(default_factory=lambda: os.getenv("SHARED_CACHE_FILE", ".cache/shared/cache.sqlite3"))
+    SHARED_CACHE_MAX_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("SHARED_CACHE_MAX_BYTES", str(256 * 1024 * 1024))))
+    SHARED_CACHE_BUSY_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("SHARED_CACHE_BUSY_TIMEOUT_SECONDS", "5")))
+    # 같은 오디오의 변환 결과 재사용 (0이면 사용 안 함)
+    STT_CACHE_TTL_SECONDS: int = Field(default_factory=lambda: int(os.getenv("STT_CACHE_TTL_SECONDS", "86400")))
+
+    # Cluster (thread affinity) settings
+    # 모든 노드의 기본 URL 목록 (쉼표로 구분, 예: "http://10.0.0.1:9090,http://10.0.0.2:9090"), 비어 있으면 사용 안 함
+    CLUSTER_NODES: str = Field(default_factory=lambda: os.getenv("CLUSTER_NODES", ""))
+    # 이 노드의 기본 URL (CLUSTER_NODES 중 하나)
+    CLUSTER_SELF_URL: str = Field(default_factory=lambda: os.getenv("CLUSTER_SELF_URL", ""))
+    CLUSTER_VIRTUAL_NODES: int = Field(default_factory=lambda: int(os.getenv("CLUSTER_VIRTUAL_NODES", "100")))
+    # 다른 노드가 담당하는 스레드의 요청 처리 방식 (forward: 내부 전달, redirect: 307 응답)
+    THREAD_AFFINITY_MODE: str = Field(default_factory=lambda: os.getenv("THREAD_AFFINITY_MODE", "forward"))
+    # 담당 노드의 응답을 기다리는 시간 (요청 처리 제한 시간보다 먼저 끊지 않도록 DEADLINE_MAX_SECONDS 이상으로 사용)
+    CLUSTER_FORWARD_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CLUSTER_FORWARD_TIMEOUT_SECONDS", "300")))
+    # 담당 노드에 연결하는 시간 (연결하지 못하면 받은 노드에서 직접 처리)
+    CLUSTER_FORWARD_CONNECT_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CLUSTER_FORWARD_CONNECT_TIMEOUT_SECONDS", "3")))
+
+    # Event loop monitor settings
+    LOOP_MONITOR_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true")
+    LOOP_MONITOR_INTERVAL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.1")))
+    # 이 시간 이상 이벤트 루프가 멈추면 스택과 함께 기록
+    LOOP_STALL_THRESHOLD_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("LOOP_STALL_THRESHOLD_SECONDS", "0.25")))
+    LOOP_STALL_HISTORY: int = Field(default_factory=lambda: int(os.getenv("LOOP_STALL_HISTORY", "100")))
+
+    # Admin API settings (토큰이 없으면 관리자 API 사용 불가)
+    ADMIN_TOKEN: str = Field(default_factory=lambda: os.getenv("ADMIN_TOKEN", ""))
+    ADMIN_PROFILE_MAX_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ADMIN_PROFILE_MAX_SECONDS", "60")))
+
+    # Asynchronous job settings
+    JOB_STORE_FILE: str = Field(default_factory=lambda: os.getenv("JOB_STORE_FILE", ".cache/jobs.sqlite3"))
+    JOB_INPUT_DIR: str = Field(default_factory=lambda: os.getenv("JOB_INPUT_DIR", ".cache/jobs"))
+    JOB_MAX_WORKERS: int = Field(default_factory=lambda: int(os.getenv("JOB_MAX_WORKERS", "2")))
+    JOB_MAX_UPLOAD_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("JOB_MAX_UPLOAD_BYTES", str(500 * 1024 * 1024))))
+    JOB_RESULT_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("JOB_RESULT_TTL_SECONDS", str(7 * 24 * 3600))))
+    JOB_PURGE_INTERVAL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "3600")))
+    # 비어 있으면 웹훅을 보내지 않음
+    JOB_WEBHOOK_URL: str = Field(default_factory=lambda: os.getenv("JOB_WEBHOOK_URL", ""))
+    JOB_WEBHOOK_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("JOB_WEBHOOK_TIMEOUT_SECONDS", "10")))
+    JOB_WEBHOOK_MAX_ATTEMPTS: int = Field(default_factory=lambda: int(os.getenv("JOB_WEBHOOK_MAX_ATTEMPTS", "3")))
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": True
@@ -0,0 +1,112 @@
+"""
+STT → LLM → TTS로 이어지는 요청 전체의 처리 시간 제한(deadline)과 단계별 시간 배분.
+
+요청마다 전체 제한 시간을 정하고, 각 단계를 시작할 때 남은 시간을 남은 단계들의 가중치에 따라 나누어
+외부 API 호출의 timeout으로 사용합니다. 남은 시간이 단계의 최소 시간보다 적으면 호출하지 않고 바로 실패합니다.
+"""
+import time
+from typing import Callable, Optional, Sequence
+
+from fastapi import Header, HTTPException
+
+from app.core.cancellation import OperationCancelled
+from app.core.config import settings
+
+# 단계별 시간 배분 가중치
+_STAGE_WEIGHTS = {"stt": 3.0, "llm": 5.0, "tts": 2.0}
+
+# 단계를 시작하는 데 필요한 최소 시간(초)
+_STAGE_MIN_SECONDS = {"stt": 1.0, "llm": 2.0, "tts": 1.0}
+
+
+class DeadlineExceeded(OperationCancelled):
+    """
+    남은 처리 시간 안에 단계를 끝낼 수 없어 작업을 중단했을 때 발생하는 예외.
+    """
+
+    def __init__(self, stage: str, remaining: float):
+        self.stage = stage
+        self.remaining = remaining
+        super().__init__(f"처리 시간 제한으로 {stage} 단계를 완료할 수 없습니다. (남은 시간 {max(remaining, 0.0):.1f}초)")
+
+
+class Deadline:
+    """
+    하나의 요청에 대한 처리 시간 제한.
+    """
+
+    def __init__(self, seconds: float, stages: Sequence[str]):
+        """
+        Args:
+            seconds: 전체 제한 시간(초)
+            stages: 요청이 거칠 단계 이름 순서 (예: ("stt", "llm", "tts"))
+        """
+        self.seconds = seconds
+        self.stages = tuple(stages)
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        남은 시간(초)을 반환합니다. 이미 지났으면 음수입니다.
+        """
+        return self._expires_at - time.monotonic()
+
+    def stage_timeout(self, stage: str) -> float:
+        """
+        단계를 시작할 때 호출하여 해당 단계에 쓸 수 있는 시간을 계산합니다.
+
+        남은 시간을 이 단계와 이후 단계들의 가중치 비율로 나누므로, 앞 단계가 일찍 끝나면
+        남은 여유가 뒤 단계들에 다시 배분됩니다.
+
+        Args:
+            stage: 단계 이름
+
+        Returns:
+            이 단계의 제한 시간(초)
+
+        Raises:
+            DeadlineExceeded: 배분된 시간이 단계의 최소 시간보다 적은 경우
+        """
+        remaining = self.remaining()
+        upcoming = self.stages[self.stages.index(stage):] if stage in self.stages else (stage,)
+        total_weight = sum(_STAGE_WEIGHTS.get(name, 1.0) for name in upcoming)
+        budget = remaining * _STAGE_WEIGHTS.get(stage, 1.0) / total_weight
+        if budget < _STAGE_MIN_SECONDS.get(stage, 0.0):
+            raise DeadlineExceeded(stage, remaining)
+        return budget
+
+
+def request_deadline(default_seconds: float, stages: Sequence[str]) -> Callable[..., Deadline]:
+    """
+    요청 헤더(DEADLINE_HEADER) 또는 경로별 기본값으로 Deadline을 만드는 의존성을 생성합니다.
+
+    Args:
+        default_seconds: 헤더가 없을 때 사용할 제한 시간(초)
+        stages: 경로가 거칠 단계 이름 순서
+
+    Returns:
+        FastAPI 의존성 함수
+    """
+
+    def dependency(
+            timeout_header: Optional[str] = Header(
+                default=None, alias=settings.DEADLINE_HEADER,
+                description="요청 전체 처리 제한 시간(초), 없으면 경로별 기본값 사용")
+    ) -> Deadline:
+        seconds = default_seconds
+        if timeout_header:
+            try:
+                seconds = float(timeout_header)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{settings.DEADLINE_HEADER} 헤더는 초 단위 숫자여야 합니다."
+                )
+            if seconds <= 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{settings.DEADLINE_HEADER} 헤더는 0보다 커야 합니다."
+                )
+        return Deadline(min(seconds, settings.DEADLINE_MAX_SECONDS), stages)
+
+    return dependency
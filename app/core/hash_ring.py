@@ -0,0 +1,42 @@
+"""
+대화 스레드 ID를 노드에 배정하기 위한 일관된 해싱(consistent hashing) 링.
+노드가 추가되거나 빠져도 대부분의 스레드는 기존 노드에 그대로 배정됩니다.
+"""
+import bisect
+import hashlib
+from typing import List, Sequence, Tuple
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    가상 노드를 사용하는 일관된 해싱 링.
+    """
+
+    def __init__(self, nodes: Sequence[str], virtual_nodes: int = 100):
+        """
+        Args:
+            nodes: 노드 목록 (예: 각 노드의 기본 URL)
+            virtual_nodes: 노드마다 링에 배치할 가상 노드 수 (많을수록 고르게 분산)
+        """
+        self.nodes = list(dict.fromkeys(nodes))
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{index}"), node) for node in self.nodes for index in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        """
+        키를 담당하는 노드를 반환합니다.
+
+        Raises:
+            ValueError: 노드가 없는 경우
+        """
+        if not self._hashes:
+            raise ValueError("해시 링에 노드가 없습니다.")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
@@ -0,0 +1,110 @@
+"""
+이벤트 루프 지연(stall) 감시.
+
+이벤트 루프에서 짧은 주기로 심장 박동(heartbeat)을 기록하고, 별도 감시 스레드가 박동이 기준 시간 이상
+끊긴 것을 발견하면 그 순간 이벤트 루프 스레드의 스택을 저장합니다. 비동기 핸들러 안에 숨어 있는
+동기 호출(SDK 호출, time.sleep, 오디오 변환 등)을 찾는 데 사용합니다.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """
+    워커 프로세스의 이벤트 루프 지연 감시기.
+    """
+
+    def __init__(self):
+        self._stalls: Deque[dict] = deque(maxlen=settings.LOOP_STALL_HISTORY)
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        # 감시 스레드가 현재 지연 중에 저장한 스택
+        self._pending_stack: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        실행 중인 이벤트 루프에서 호출하여 감시를 시작합니다.
+        """
+        if not settings.LOOP_MONITOR_ENABLED or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        감시를 중단합니다.
+        """
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stalls(self) -> List[dict]:
+        """
+        최근 지연 기록을 최신순으로 반환합니다.
+        """
+        with self._lock:
+            return list(reversed(self._stalls))
+
+    async def _heartbeat(self) -> None:
+        interval = settings.LOOP_MONITOR_INTERVAL_SECONDS
+        while True:
+            scheduled_at = time.monotonic()
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = now - scheduled_at - interval
+            if lag >= settings.LOOP_STALL_THRESHOLD_SECONDS:
+                self._record(lag)
+
+    def _watch(self) -> None:
+        """
+        감시 스레드: 박동이 기준 시간 이상 끊기면 이벤트 루프 스레드의 스택을 한 번 저장합니다.
+        """
+        threshold = settings.LOOP_STALL_THRESHOLD_SECONDS
+        while not self._stop_event.wait(settings.LOOP_MONITOR_INTERVAL_SECONDS):
+            stalled_for = time.monotonic() - self._last_beat - settings.LOOP_MONITOR_INTERVAL_SECONDS
+            if stalled_for < threshold:
+                continue
+            with self._lock:
+                if self._pending_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending_stack = "".join(traceback.format_stack(frame))
+
+    def _record(self, lag: float) -> None:
+        with self._lock:
+            stack, self._pending_stack = self._pending_stack, None
+            self._stalls.append({
+                "occurred_at": time.time() - lag,
+                "lag_seconds": round(lag, 3),
+                "stack": stack
+            })
+        metrics.increment("event_loop_stalls_total")
+        metrics.increment("event_loop_stall_ms_total", int(lag * 1000))
+        logger.warning(f"이벤트 루프가 {lag:.3f}초 동안 멈췄습니다." + (f"\n{stack}" if stack else ""))
+
+
+# 기본 인스턴스 생성
+event_loop_monitor = EventLoopMonitor()
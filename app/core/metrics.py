@@ -0,0 +1,46 @@
+"""
+워커 프로세스별 운영 지표 수집.
+"""
+import threading
+from collections import Counter
+from typing import Dict, List
+
+
+class Metrics:
+    """
+    이름과 레이블로 구분되는 카운터 모음.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        """
+        카운터를 증가시킵니다.
+
+        Args:
+            name: 지표 이름
+            value: 증가량
+            **labels: 레이블 (예: operation="assistant_run")
+        """
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def snapshot(self) -> Dict[str, List[dict]]:
+        """
+        현재 지표 값을 반환합니다.
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters)
+            ]
+        }
+
+
+# 기본 인스턴스 생성
+metrics = Metrics()
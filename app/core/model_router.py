@@ -0,0 +1,143 @@
+"""
+ChatGPT 요청의 모델 선택(라우팅).
+
+질문 길이, 질문 종류(이유/방법/비교처럼 긴 설명이 필요한 질문인지), 요청 경로 같은 가벼운 특징으로
+빠른 모델(CHAT_FAST_MODEL)로 충분한지 판단하고, 모델별로 관측한 응답 시간을 함께 고려하여
+충분한 모델 중 가장 빠른 모델을 고릅니다. 외부 API를 호출하지 않으므로 선택에 드는 시간은 무시할 수 있습니다.
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# 긴 설명이나 추론이 필요한 질문에 자주 나오는 표현
+_COMPLEX_QUESTION = re.compile(
+    r"왜|어떻게|이유|설명|비교|차이|장단점|자세히|절차|방법|분석|요약"
+    r"|\b(?:why|how|explain|compare|difference|analy[sz]e|summari[sz]e)\b",
+    re.IGNORECASE
+)
+
+# 문장 끝 (여러 문장으로 된 질문은 여러 요구 사항을 담고 있는 경우가 많음)
+_SENTENCE_END = re.compile(r"[.!?。？！]+(?:\s|$)")
+
+# 관측한 응답 시간의 지수 이동 평균 가중치
+_LATENCY_ALPHA = 0.2
+
+
+class ModelRouter:
+    """
+    ChatGPT 모델 선택기. 모델별 응답 시간은 워커 프로세스마다 따로 관측합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 모델별 응답 시간(초)의 지수 이동 평균
+        self._latency: Dict[str, float] = {}
+
+    def choose(self, text: str, route: Optional[str] = None, budget: Optional[float] = None) -> Tuple[str, str]:
+        """
+        질문에 사용할 모델을 선택합니다.
+
+        Args:
+            text: 질문 텍스트
+            route: 요청 경로
+            budget: 응답에 쓸 수 있는 시간(초), 제한이 없으면 None
+
+        Returns:
+            (모델, 선택 이유) 튜플
+        """
+        route = route or ""
+        model, reason = self._choose(text, route, budget)
+        metrics.increment("chat_model_route_total", route=route, model=model, reason=reason)
+        return model, reason
+
+    def _choose(self, text: str, route: str, budget: Optional[float]) -> Tuple[str, str]:
+        if not settings.CHAT_MODEL_ROUTING_ENABLED:
+            return settings.OPENAI_CHAT_MODEL, "disabled"
+
+        override = self._route_override(route)
+        if override:
+            return override, "override"
+
+        fast, strong = settings.CHAT_FAST_MODEL, settings.CHAT_STRONG_MODEL
+        fast_latency, strong_latency = self.latency(fast), self.latency(strong)
+        if self._needs_strong_model(text, route):
+            # 성능이 높은 모델로는 남은 시간 안에 답할 수 없을 것으로 보이면 빠른 모델 사용
+            if budget is not None and strong_latency is not None and strong_latency > budget:
+                return fast, "latency_budget"
+            return strong, "complex"
+
+        # 두 모델 모두 충분하면 관측한 응답 시간이 더 짧은 모델 사용
+        if fast_latency is not None and strong_latency is not None and strong_latency < fast_latency:
+            return strong, "faster"
+        return fast, "simple"
+
+    def _needs_strong_model(self, text: str, route: str) -> bool:
+        """
+        질문 길이, 질문 종류, 여러 문장 여부 중 해당하는 특징의 수로 성능이 높은 모델이 필요한지 판단합니다.
+        음성 질문 경로는 응답 속도가 중요하므로 특징이 둘 이상일 때만 필요한 것으로 판단합니다.
+        """
+        text = text.strip()
+        features = sum((
+            len(text) > settings.CHAT_ROUTER_FAST_MAX_CHARS,
+            _COMPLEX_QUESTION.search(text) is not None,
+            len(_SENTENCE_END.findall(text)) >= 3
+        ))
+        voice_routes = [prefix.strip() for prefix in settings.CHAT_ROUTER_VOICE_ROUTES.split(",") if prefix.strip()]
+        is_voice = any(route.startswith(prefix) for prefix in voice_routes)
+        return features >= (2 if is_voice else 1)
+
+    def _route_override(self, route: str) -> Optional[str]:
+        """
+        CHAT_MODEL_ROUTE_OVERRIDES에서 경로에 맞는 가장 긴 접두사의 모델을 찾습니다. ("fast", "strong" 또는 모델 이름)
+        """
+        matched, model = "", None
+        for item in settings.CHAT_MODEL_ROUTE_OVERRIDES.split(","):
+            prefix, _, value = item.partition("=")
+            prefix, value = prefix.strip(), value.strip()
+            if prefix and value and route.startswith(prefix) and len(prefix) > len(matched):
+                matched, model = prefix, value
+        return {"fast": settings.CHAT_FAST_MODEL, "strong": settings.CHAT_STRONG_MODEL}.get(model, model)
+
+    @contextmanager
+    def observe(self, model: str) -> Iterator[None]:
+        """
+        블록 안의 모델 호출 시간을 기록합니다. 성공한 호출만 응답 시간 평균에 반영합니다.
+        """
+        started_at = time.monotonic()
+        yield
+        elapsed = time.monotonic() - started_at
+        with self._lock:
+            previous = self._latency.get(model)
+            self._latency[model] = elapsed if previous is None else previous + _LATENCY_ALPHA * (elapsed - previous)
+        metrics.increment("chat_model_calls_total", model=model)
+        metrics.increment("chat_model_latency_ms_total", int(elapsed * 1000), model=model)
+
+    def latency(self, model: str) -> Optional[float]:
+        """
+        모델의 관측한 응답 시간(초) 평균을 반환합니다. 아직 호출하지 않았으면 None입니다.
+        """
+        with self._lock:
+            return self._latency.get(model)
+
+    def status(self) -> dict:
+        """
+        모델 선택 설정과 모델별 응답 시간 평균을 반환합니다.
+        """
+        with self._lock:
+            latency = {model: round(seconds, 3) for model, seconds in self._latency.items()}
+        return {
+            "enabled": settings.CHAT_MODEL_ROUTING_ENABLED,
+            "default_model": settings.OPENAI_CHAT_MODEL,
+            "fast_model": settings.CHAT_FAST_MODEL,
+            "strong_model": settings.CHAT_STRONG_MODEL,
+            "latency_seconds": latency
+        }
+
+
+# 기본 인스턴스 생성
+model_router = ModelRouter()
@@ -0,0 +1,122 @@
+"""
+통합 엔드포인트(STT → Assistant → TTS 등)의 단계 실행기.
+
+서로 의존하지 않는 단계(예: STT와 새 대화 스레드 생성)를 동시에 실행하고, 한 단계가 실패하면
+나머지 단계를 중단한 뒤 그 오류를 그대로 전달합니다. 단계마다 시작/종료 시각을 기록하여
+요청의 임계 경로(critical path, 응답 시간을 결정한 단계들)를 지표와 Server-Timing 헤더로 남깁니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, TypeVar
+
+from starlette.requests import Request
+
+from app.core.cancellation import CancellationToken, run_until_disconnected
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Pipeline:
+    """
+    하나의 요청 동안 단계를 실행하고 소요 시간을 기록합니다.
+    """
+
+    def __init__(self, request: Request, cancel_token: CancellationToken):
+        """
+        Args:
+            request: 연결 종료를 감시할 요청
+            cancel_token: 모든 단계가 공유하는 취소 토큰
+        """
+        self.request = request
+        self.cancel_token = cancel_token
+        self._started_at = time.monotonic()
+        # 순서대로 실행된 단계 묶음 (동시에 실행된 단계는 한 묶음)
+        self._groups: List[List[Dict[str, Any]]] = []
+
+    async def run(self, stage: str, func: Callable[..., T], /, *args, **kwargs) -> T:
+        """
+        단계 하나를 실행합니다. (run_until_disconnected 참고)
+        """
+        timing = {"stage": stage}
+        self._groups.append([timing])
+        return await self._timed(timing, func, *args, **kwargs)
+
+    async def parallel(self, **stages: Callable[[], T]) -> Dict[str, T]:
+        """
+        서로 의존하지 않는 단계들을 동시에 실행합니다.
+
+        한 단계가 실패하면 나머지 단계의 대기를 중단하고 취소 토큰으로 스레드에서 진행 중인 작업도
+        중단시킨 뒤, 처음 발생한 예외를 그대로 발생시킵니다.
+
+        Args:
+            **stages: 단계 이름과 인자 없이 호출할 동기 함수 (functools.partial 등)
+
+        Returns:
+            단계 이름별 결과
+        """
+        group = [{"stage": stage} for stage in stages]
+        self._groups.append(group)
+        tasks = [
+            asyncio.ensure_future(self._timed(timing, func))
+            for timing, func in zip(group, stages.values())
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.cancel_token.cancel("stage_failed")
+            raise
+        return dict(zip(stages, results))
+
+    async def _timed(self, timing: Dict[str, Any], func: Callable[..., T], *args, **kwargs) -> T:
+        timing["start"] = time.monotonic() - self._started_at
+        try:
+            return await run_until_disconnected(self.request, self.cancel_token, func, *args, **kwargs)
+        finally:
+            timing["end"] = time.monotonic() - self._started_at
+
+    def critical_path(self) -> List[Dict[str, Any]]:
+        """
+        각 묶음에서 가장 늦게 끝난 단계를 모아 임계 경로를 반환합니다.
+        """
+        path = []
+        for group in self._groups:
+            finished = [timing for timing in group if "end" in timing]
+            if finished:
+                path.append(max(finished, key=lambda timing: timing["end"]))
+        return path
+
+    def server_timing(self) -> str:
+        """
+        모든 단계의 소요 시간을 Server-Timing 헤더 값으로 만들고, 경로별 단계 지표를 기록합니다.
+
+        Returns:
+            예: "stt;dur=812, thread;dur=230, llm;dur=2104;desc=critical"
+        """
+        critical = {id(timing) for timing in self.critical_path()}
+        route = self.request.url.path
+        entries = []
+        for group in self._groups:
+            for timing in group:
+                if "end" not in timing:
+                    continue
+                duration_ms = int((timing["end"] - timing["start"]) * 1000)
+                labels = {"route": route, "stage": timing["stage"]}
+                metrics.increment("pipeline_stage_ms_total", duration_ms, **labels)
+                entry = f"{timing['stage']};dur={duration_ms}"
+                if id(timing) in critical:
+                    metrics.increment("pipeline_critical_stage_total", **labels)
+                    entry += ";desc=critical"
+                entries.append(entry)
+
+        total_ms = int((time.monotonic() - self._started_at) * 1000)
+        entries.append(f"total;dur={total_ms}")
+        logger.info(f"{route} 임계 경로: {' > '.join(timing['stage'] for timing in self.critical_path())} "
+                    f"({total_ms}ms)")
+        return ", ".join(entries)
@@ -0,0 +1,219 @@
+"""
+외부 API 호출 앞에서 요청의 우선순위에 따라 동시 호출 수를 나누어 주는 스케줄러.
+
+요청은 interactive(실시간 음성 대화), default, bulk(일괄 작업, 예열) 중 하나의 우선순위를 가집니다.
+제공자(openai, elevenlabs)별 동시 호출 자리 중 일부는 interactive 전용으로 남겨 두고, bulk는 정해진 비율
+안에서 더 높은 우선순위의 대기 요청이 없을 때만 호출합니다.
+
+우선순위는 요청마다 ContextVar에 저장되므로 서비스 메서드 인자로 전달하지 않아도
+asyncio.to_thread로 실행되는 서비스 코드까지 이어집니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional
+
+from fastapi import Header, HTTPException
+
+from app.core.cancellation import CancellationToken, raise_if_cancelled
+from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+
+INTERACTIVE = "interactive"
+DEFAULT = "default"
+BULK = "bulk"
+
+# 높은 우선순위부터
+PRIORITIES = (INTERACTIVE, DEFAULT, BULK)
+
+current_priority: ContextVar[str] = ContextVar("request_priority", default=DEFAULT)
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[None]:
+    """
+    블록 안에서 호출하는 외부 API의 우선순위를 지정합니다. (요청이 아닌 작업 스레드, 백그라운드 작업용)
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def request_priority(default_priority: str) -> Callable[..., None]:
+    """
+    요청 헤더(PRIORITY_HEADER) 또는 경로별 기본값으로 요청의 우선순위를 정하는 의존성을 생성합니다.
+
+    Args:
+        default_priority: 헤더가 없을 때 사용할 우선순위
+
+    Returns:
+        FastAPI 의존성 함수
+    """
+
+    async def dependency(
+            priority_header: Optional[str] = Header(
+                default=None, alias=settings.PRIORITY_HEADER,
+                description="요청 우선순위 (interactive, default, bulk), 없으면 경로별 기본값 사용")
+    ) -> None:
+        priority = (priority_header or default_priority).strip().lower()
+        if priority not in PRIORITIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{settings.PRIORITY_HEADER} 헤더는 {', '.join(PRIORITIES)} 중 하나여야 합니다."
+            )
+        current_priority.set(priority)
+
+    return dependency
+
+
+class ProviderScheduler:
+    """
+    하나의 제공자에 대한 우선순위별 동시 호출 제한.
+    """
+
+    def __init__(self, provider: str, max_concurrency: int):
+        """
+        Args:
+            provider: 제공자 이름 (예: "openai")
+            max_concurrency: 워커 프로세스에서 이 제공자로 동시에 보낼 수 있는 최대 호출 수
+        """
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self._condition = threading.Condition()
+        self._in_use = 0
+        self._waiting: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+
+    @contextmanager
+    def slot(
+            self,
+            stage: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Iterator[None]:
+        """
+        현재 요청의 우선순위로 호출 자리를 얻을 때까지 기다렸다가 호출이 끝나면 반납합니다.
+
+        Args:
+            stage: 호출 단계 이름 (제한 시간 초과 시 예외에 사용)
+            cancel_token: 요청 취소 토큰 (기다리는 동안 취소되면 중단)
+            deadline: 요청 처리 제한 시간 (기다리는 동안 지나면 중단)
+
+        Raises:
+            OperationCancelled: 기다리는 동안 요청이 취소된 경우
+            DeadlineExceeded: 기다리는 동안 제한 시간이 지난 경우
+        """
+        if not settings.SCHEDULER_ENABLED:
+            yield
+            return
+
+        self._acquire(current_priority.get(), stage, cancel_token, deadline)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify_all()
+
+    def request_limit(self) -> int:
+        """
+        현재 요청의 우선순위로 한 요청이 동시에 사용할 수 있는 최대 호출 수를 계산합니다.
+        한 요청이 여러 조각을 동시에 호출하여 다른 요청의 자리를 모두 차지하지 않도록 합니다.
+        """
+        if not settings.SCHEDULER_ENABLED:
+            return self.max_concurrency
+        return max(1, int(self._limit(current_priority.get()) * settings.SCHEDULER_REQUEST_MAX_SHARE))
+
+    def _acquire(
+            self,
+            priority: str,
+            stage: str,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline]
+    ) -> None:
+        started_at = time.monotonic()
+        with self._condition:
+            if self._can_start(priority):
+                self._in_use += 1
+                return
+
+            self._waiting[priority] += 1
+            try:
+                while not self._can_start(priority):
+                    raise_if_cancelled(cancel_token)
+                    timeout = settings.CANCEL_POLL_INTERVAL_SECONDS
+                    if deadline is not None:
+                        if deadline.remaining() <= 0:
+                            raise DeadlineExceeded(stage, deadline.remaining())
+                        timeout = min(timeout, deadline.remaining())
+                    self._condition.wait(timeout)
+                self._in_use += 1
+            finally:
+                self._waiting[priority] -= 1
+                # 대기를 포기한 경우에도 낮은 우선순위 요청이 진행할 수 있도록 깨움
+                self._condition.notify_all()
+
+        labels = {"provider": self.provider, "priority": priority}
+        metrics.increment("scheduler_waited_total", **labels)
+        metrics.increment("scheduler_wait_ms_total", int((time.monotonic() - started_at) * 1000), **labels)
+
+    def _can_start(self, priority: str) -> bool:
+        if self._in_use >= self._limit(priority):
+            return False
+        # 더 높은 우선순위의 요청이 기다리고 있으면 먼저 보냄
+        higher = PRIORITIES[:PRIORITIES.index(priority)]
+        return not any(self._waiting[other] for other in higher)
+
+    def _limit(self, priority: str) -> int:
+        """
+        우선순위별로 사용할 수 있는 최대 동시 호출 수를 계산합니다.
+        """
+        if priority == INTERACTIVE:
+            return self.max_concurrency
+        default_limit = max(1, self.max_concurrency - settings.SCHEDULER_INTERACTIVE_RESERVED)
+        if priority == DEFAULT:
+            return default_limit
+        return max(1, min(default_limit, int(self.max_concurrency * settings.SCHEDULER_BULK_MAX_SHARE)))
+
+
+class UpstreamScheduler:
+    """
+    제공자별 스케줄러 모음.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schedulers: Dict[str, ProviderScheduler] = {}
+
+    def slot(
+            self,
+            provider: str,
+            stage: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ):
+        """
+        제공자의 호출 자리를 얻는 컨텍스트 매니저를 반환합니다. (ProviderScheduler.slot 참고)
+        """
+        return self._get(provider).slot(stage, cancel_token, deadline)
+
+    def request_limit(self, provider: str) -> int:
+        """
+        한 요청이 제공자에 동시에 보낼 수 있는 최대 호출 수를 반환합니다. (ProviderScheduler.request_limit 참고)
+        """
+        return self._get(provider).request_limit()
+
+    def _get(self, provider: str) -> ProviderScheduler:
+        with self._lock:
+            if provider not in self._schedulers:
+                max_concurrency = settings.SCHEDULER_ELEVENLABS_MAX_CONCURRENCY if provider == "elevenlabs" \
+                    else settings.SCHEDULER_OPENAI_MAX_CONCURRENCY
+                self._schedulers[provider] = ProviderScheduler(provider, max_concurrency)
+            return self._schedulers[provider]
+
+
+# 기본 인스턴스 생성
+upstream_scheduler = UpstreamScheduler()
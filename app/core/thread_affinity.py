@@ -0,0 +1,198 @@
+"""
+여러 서버 노드 사이의 대화 스레드 친화성(thread affinity) 라우팅.
+
+CLUSTER_NODES의 노드들로 일관된 해싱 링을 만들어 thread_id마다 담당 노드를 정하고,
+다른 노드가 담당하는 스레드의 Assistant 요청을 받으면 담당 노드로 내부 전달(forward)하거나
+307 리다이렉트로 담당 노드를 알려줍니다. 같은 스레드의 연속된 대화가 한 노드에서 처리되므로
+노드 로컬 상태(캐시, 잠금 등)를 활용할 수 있습니다.
+"""
+import json
+import logging
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+import httpx
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.hash_ring import HashRing
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 전달된 요청임을 표시하는 헤더 (전달된 요청은 다시 전달하지 않음)
+FORWARDED_BY_HEADER = "x-saegil-forwarded-by"
+
+# 노드 사이에 그대로 전달하지 않는 헤더
+_HOP_BY_HOP_HEADERS = {"host", "connection", "keep-alive", "transfer-encoding", "content-length", "upgrade"}
+
+
+class ThreadAffinity:
+    """
+    노드 구성과 스레드 담당 노드 계산.
+    """
+
+    def __init__(self):
+        self._ring: Optional[HashRing] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def nodes(self) -> List[str]:
+        return [node.strip().rstrip("/") for node in settings.CLUSTER_NODES.split(",") if node.strip()]
+
+    @property
+    def self_url(self) -> str:
+        return settings.CLUSTER_SELF_URL.strip().rstrip("/")
+
+    @property
+    def enabled(self) -> bool:
+        """
+        노드가 둘 이상이고 이 노드가 그중 하나일 때만 사용합니다.
+        """
+        return len(self.nodes) > 1 and self.self_url in self.nodes
+
+    def owner(self, thread_id: str) -> str:
+        """
+        스레드를 담당하는 노드의 기본 URL을 반환합니다. 사용하지 않으면 이 노드를 반환합니다.
+        """
+        if not self.enabled:
+            return self.self_url
+        if self._ring is None or self._ring.nodes != self.nodes:
+            self._ring = HashRing(self.nodes, settings.CLUSTER_VIRTUAL_NODES)
+        return self._ring.get_node(thread_id)
+
+    def is_local(self, thread_id: str) -> bool:
+        return not self.enabled or self.owner(thread_id) == self.self_url
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        노드 사이 전달에 사용하는 HTTP 클라이언트 (연결 재사용)
+        """
+        if self._client is None:
+            timeout = max(settings.CLUSTER_FORWARD_TIMEOUT_SECONDS, settings.DEADLINE_MAX_SECONDS)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout, connect=settings.CLUSTER_FORWARD_CONNECT_TIMEOUT_SECONDS))
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class ThreadAffinityMiddleware:
+    """
+    thread_id 쿼리 파라미터가 있는 Assistant 요청을 담당 노드로 보내는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not thread_affinity.enabled \
+                or not scope["path"].startswith(f"{settings.API_V1_STR}/assistant"):
+            await self.app(scope, receive, send)
+            return
+
+        thread_id = parse_qs(scope["query_string"].decode("latin-1")).get("thread_id", [None])[0]
+        headers = Headers(scope=scope)
+        if not thread_id or headers.get(FORWARDED_BY_HEADER) or thread_affinity.is_local(thread_id):
+            await self.app(scope, receive, send)
+            return
+
+        owner = thread_affinity.owner(thread_id)
+        url = owner + scope["path"] + (f"?{scope['query_string'].decode('latin-1')}" if scope["query_string"] else "")
+
+        if settings.THREAD_AFFINITY_MODE == "redirect":
+            metrics.increment("thread_affinity_total", action="redirect")
+            response = Response(status_code=307, headers={"Location": url, "X-Thread-Owner": owner})
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self._forward(scope, headers, body, url, owner, tracking_send)
+            metrics.increment("thread_affinity_total", action="forward")
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            # 요청을 보내기 전에 연결하지 못한 경우에만 이 노드에서 처리 (대화 기록은 OpenAI 스레드에 있으므로 처리 가능)
+            logger.warning(f"스레드 {thread_id}의 담당 노드({owner})에 연결하지 못해 직접 처리합니다: {str(e)}")
+            metrics.increment("thread_affinity_total", action="forward_failed")
+            await self.app(scope, _replay_receive(body, receive), send)
+        except httpx.HTTPError as e:
+            # 담당 노드가 이미 요청을 처리하고 있을 수 있으므로 다시 처리하지 않음 (Assistant 요청은 멱등하지 않음)
+            logger.error(f"스레드 {thread_id}의 담당 노드({owner})로 전달한 요청이 실패했습니다: {str(e)}")
+            metrics.increment("thread_affinity_total", action="forward_error")
+            if response_started:
+                # 응답을 이미 보내기 시작했으면 연결을 끊어 응답이 완료되지 않았음을 알림
+                raise
+            timed_out = isinstance(e, httpx.TimeoutException)
+            response = Response(
+                content=json.dumps({"detail": "담당 노드의 응답을 받지 못했습니다."}, ensure_ascii=False),
+                status_code=504 if timed_out else 502,
+                media_type="application/json",
+                headers={"X-Thread-Owner": owner}
+            )
+            await response(scope, receive, send)
+
+    async def _forward(self, scope: Scope, headers: Headers, body: bytes, url: str, owner: str, send: Send) -> None:
+        """
+        요청을 담당 노드로 보내고 응답을 그대로 스트리밍합니다.
+        """
+        forward_headers = [(key, value) for key, value in headers.items() if key not in _HOP_BY_HOP_HEADERS]
+        forward_headers.append((FORWARDED_BY_HEADER, thread_affinity.self_url))
+        client = thread_affinity.client()
+        request = client.build_request(scope["method"], url, headers=forward_headers, content=body)
+        upstream = await client.send(request, stream=True)
+        try:
+            response_headers = [
+                (key.encode("latin-1"), value.encode("latin-1"))
+                for key, value in upstream.headers.multi_items() if key.lower() not in _HOP_BY_HOP_HEADERS
+            ]
+            response_headers.append((b"x-thread-owner", owner.encode("latin-1")))
+            await send({"type": "http.response.start", "status": upstream.status_code, "headers": response_headers})
+            async for chunk in upstream.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await upstream.aclose()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive: Receive) -> Receive:
+    """
+    이미 읽은 요청 본문을 한 번 돌려준 뒤에는 원래 receive로 연결 종료 등을 전달합니다.
+    """
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+# 기본 인스턴스 생성
+thread_affinity = ThreadAffinity()
@@ -1,11 +1,25 @@
 """
 애플리케이션을 위한 의존성 주입 함수.
 """
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
 
 from app.services.assistant_service import AssistantService, assistant_service
+from app.services.audio_cache_service import AudioCacheService, audio_cache_service
 from app.services.chatgpt_service import ChatGPTService, chatgpt_service
+from app.services.job_service import JobService, job_service
+from app.services.profiling_service import ProfilingService, profiling_service
+from app.services.response_cache_service import ResponseCacheService, response_cache_service
+from app.services.shared_cache_service import SharedCacheService, shared_cache_service
 from app.services.speech_to_text_service import SpeechToTextService, speech_to_text_service
 from app.services.text_to_speech_service import TextToSpeechService, text_to_speech_service
+from app.services.usage_ledger_service import UsageLedgerService, usage_ledger_service, usage_tags
+from app.services.warmup_service import WarmupService, warmup_service
 
 
 def get_text_to_speech_service() -> TextToSpeechService:
@@ -46,3 +60,106 @@ def get_assistant_service() -> AssistantService:
         AssistantService의 인스턴스
     """
     return assistant_service
+
+
+def get_audio_cache_service() -> AudioCacheService:
+    """
+    합성된 오디오 캐시 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        AudioCacheService의 인스턴스
+    """
+    return audio_cache_service
+
+
+def get_response_cache_service() -> ResponseCacheService:
+    """
+    ChatGPT 응답 캐시 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        ResponseCacheService의 인스턴스
+    """
+    return response_cache_service
+
+
+def get_warmup_service() -> WarmupService:
+    """
+    캐시 예열 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        WarmupService의 인스턴스
+    """
+    return warmup_service
+
+
+def get_job_service() -> JobService:
+    """
+    비동기 작업 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        JobService의 인스턴스
+    """
+    return job_service
+
+
+def get_profiling_service() -> ProfilingService:
+    """
+    프로파일링 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        ProfilingService의 인스턴스
+    """
+    return profiling_service
+
+
+def verify_admin_token(admin_token: Optional[str] = Header(default=None, alias="X-Admin-Token")) -> None:
+    """
+    관리자 API 요청의 X-Admin-Token 헤더를 확인하기 위한 의존성.
+
+    Raises:
+        HTTPException: ADMIN_TOKEN이 설정되지 않았거나 토큰이 일치하지 않는 경우 (403)
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 설정되지 않았습니다.")
+    if not admin_token or not secrets.compare_digest(admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+def get_usage_ledger_service() -> UsageLedgerService:
+    """
+    사용량 원장 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        UsageLedgerService의 인스턴스
+    """
+    return usage_ledger_service
+
+
+def get_shared_cache_service() -> SharedCacheService:
+    """
+    워커 간 공유 캐시 서비스를 가져오기 위한 의존성.
+
+    Returns:
+        SharedCacheService의 인스턴스
+    """
+    return shared_cache_service
+
+
+async def tag_usage_request(connection: HTTPConnection) -> None:
+    """
+    요청 중의 외부 API 사용량 기록에 경로를 남기기 위한 의존성. (WebSocket 연결 포함)
+    """
+    usage_tags.set({"route": _route_template(connection), "thread_id": None})
+
+
+def _route_template(connection: HTTPConnection) -> str:
+    """
+    경로 매개변수(예: audio_id)마다 따로 합산되지 않도록 요청의 경로 템플릿을 반환합니다.
+    (예: /api/v1/text-to-speech/audio/{audio_id})
+    """
+    path = connection.url.path
+    template = getattr(connection.scope.get("route"), "path_format", None)
+    if not template:
+        return path
+    # 포함된 라우터의 경로 템플릿에는 라우터 접두사(/api/v1)가 없으므로 요청 경로에서 가져와 붙임
+    return path.rsplit("/", template.count("/"))[0] + template
@@ -1,9 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.api import api_router
+from app.api.v1.system_controller import health_router
+from app.core.admission import AdmissionRejected
+from app.core.cancellation import OperationCancelled
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import settings
+from app.core.deadline import DeadlineExceeded
+from app.core.loop_monitor import event_loop_monitor
+from app.core.metrics import metrics
+from app.core.thread_affinity import ThreadAffinityMiddleware, thread_affinity
+from app.services.job_service import job_service
+from app.services.popularity_service import popularity_service
+from app.services.text_to_speech_service import text_to_speech_service
+from app.services.usage_ledger_service import usage_ledger_service
+from app.services.warmup_service import warmup_service
 
 # Define tags metadata for better organization in Swagger UI
 tags_metadata = [
@@ -26,9 +43,57 @@ tags_metadata = [
     {
         "name": "stt-chatgpt-tts",
         "description": "음성-텍스트 변환, ChatGPT 응답, 텍스트-음성 변환을 통합한 작업.",
+    },
+    {
+        "name": "voice",
+        "description": "WebSocket으로 음성을 주고받는 양방향 대화 관련 작업.",
+    },
+    {
+        "name": "jobs",
+        "description": "오래 걸리는 음성 변환 작업을 제출하고 나중에 결과를 가져오는 비동기 작업.",
+    },
+    {
+        "name": "system",
+        "description": "캐시 예열 등 서버 상태 확인 관련 작업.",
+    },
+    {
+        "name": "admin",
+        "description": "이벤트 루프 지연 기록, 프로파일링 등 관리자 전용 작업. (X-Admin-Token 헤더 필요)",
     }
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 백그라운드 작업(캐시 예열, 안내 음성 합성, 인기도 통계와 사용량 원장 저장, 비동기 작업 실행,
+    이벤트 루프 지연 감시)을 시작하고, 종료 시 정리합니다.
+    캐시 예열은 백그라운드에서 진행되므로 서버 준비를 지연시키지 않습니다.
+    """
+    job_service.start()
+    event_loop_monitor.start()
+    background_tasks = [
+        asyncio.create_task(popularity_service.run_periodic_flush()),
+        asyncio.create_task(usage_ledger_service.run_periodic_flush()),
+        asyncio.create_task(job_service.run_periodic_purge())
+    ]
+    if settings.ACK_AUDIO_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(asyncio.to_thread(text_to_speech_service.preload_acknowledgement_audio)))
+    if settings.WARMUP_ENABLED:
+        background_tasks.append(asyncio.create_task(warmup_service.run()))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await event_loop_monitor.stop()
+    popularity_service.flush()
+    usage_ledger_service.flush()
+    await thread_affinity.aclose()
+    job_service.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -59,11 +124,59 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
-    openapi_tags=tags_metadata
+    openapi_tags=tags_metadata,
+    lifespan=lifespan
 )
 
+
+@app.exception_handler(OperationCancelled)
+async def operation_cancelled_handler(request: Request, exc: OperationCancelled):
+    """
+    클라이언트가 연결을 끊어 취소된 요청은 499로 기록합니다. (클라이언트는 응답을 받지 않음)
+    """
+    return JSONResponse(status_code=499, content={"detail": "클라이언트가 요청을 취소했습니다."})
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    """
+    요청 처리 제한 시간 안에 다음 단계를 끝낼 수 없는 요청은 504로 응답합니다.
+    """
+    metrics.increment("deadline_exceeded_total", route=request.url.path, stage=exc.stage)
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """
+    외부 API의 회로가 열려 있어 바로 실패한 요청은 503과 Retry-After로 응답합니다.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """
+    처리 한도를 넘어 받지 않은 요청은 503과 Retry-After로 응답합니다.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
+
+
+# 다른 노드가 담당하는 대화 스레드의 요청은 담당 노드로 전달 (CLUSTER_NODES가 설정된 경우)
+app.add_middleware(ThreadAffinityMiddleware)
+
 # Include API router with API_V1_STR prefix
 app.include_router(api_router, prefix=settings.API_V1_STR)
+# 로드 밸런서 상태 확인은 API 버전과 무관한 경로 사용
+app.include_router(health_router)
 
 # Run the app if this file is executed directly
 if __name__ == "__main__":
@@ -67,3 +67,30 @@ class ChatGPTResponse(BaseModel):
     }
 
 
+class ChatGPTCacheStats(BaseModel):
+    """
+    ChatGPT 응답 캐시 통계를 위한 모델.
+    """
+    enabled: bool = Field(..., description="응답 캐시 사용 여부")
+    size: int = Field(..., description="캐시된 응답 수")
+    max_entries: int = Field(..., description="캐시할 수 있는 최대 응답 수")
+    exact_hits: int = Field(..., description="정규화된 질문이 정확히 일치한 횟수")
+    shared_hits: int = Field(..., description="다른 워커가 공유 캐시에 저장한 응답과 정확히 일치한 횟수")
+    fuzzy_hits: int = Field(..., description="유사한 질문으로 적중한 횟수")
+    misses: int = Field(..., description="캐시에 없어 ChatGPT를 호출한 횟수")
+    hit_rate: float = Field(..., description="적중률 (0.0 ~ 1.0)")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "enabled": True,
+                "size": 120,
+                "max_entries": 5000,
+                "exact_hits": 340,
+                "shared_hits": 42,
+                "fuzzy_hits": 85,
+                "misses": 120,
+                "hit_rate": 0.7798
+            }
+        }
+    }
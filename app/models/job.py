@@ -0,0 +1,39 @@
+"""
+비동기 작업 기능을 위한 Pydantic 모델.
+"""
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(BaseModel):
+    """
+    비동기 작업 상태를 위한 모델.
+    """
+    job_id: str = Field(..., description="작업 ID")
+    kind: str = Field(..., description="작업 종류 (speech-to-text, stt-chatgpt-tts)")
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+    created_at: float = Field(..., description="제출 시각 (Unix time)")
+    started_at: Optional[float] = Field(None, description="실행 시작 시각 (Unix time)")
+    finished_at: Optional[float] = Field(None, description="종료 시각 (Unix time)")
+    error: Optional[str] = Field(None, description="실패한 경우 오류 메시지")
+    result: Optional[Dict[str, Any]] = Field(None, description="성공한 경우 작업 결과")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "job_id": "3f2b9c4e8a1d4f6b9e0c7a5d2b1e4f3a",
+                "kind": "speech-to-text",
+                "status": "succeeded",
+                "created_at": 1760000000.0,
+                "started_at": 1760000001.2,
+                "finished_at": 1760000095.8,
+                "error": None,
+                "result": {
+                    "text": "오늘 회의에서는 다음 분기 계획을 논의했습니다.",
+                    "silence_removed_seconds": 12.4,
+                    "uploaded_bytes": 1843200
+                }
+            }
+        }
+    }
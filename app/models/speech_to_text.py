@@ -1,6 +1,8 @@
 """
 음성-텍스트 변환 기능을 위한 Pydantic 모델.
 """
+from typing import Optional
+
 from pydantic import BaseModel, Field, HttpUrl
 
 
@@ -41,11 +43,15 @@ class TranscriptionResult(BaseModel):
     음성-텍스트 변환 결과를 위한 모델.
     """
     text: str = Field(..., description="변환된 텍스트")
+    silence_removed_seconds: Optional[float] = Field(None, description="전처리로 제거된 무음 길이(초)")
+    uploaded_bytes: Optional[int] = Field(None, description="OpenAI에 업로드한 오디오 크기(bytes)")
 
     model_config = {
         "json_schema_extra": {
             "example": {
-                "text": "안녕하세요, 이것은 음성에서 변환된 텍스트입니다."
+                "text": "안녕하세요, 이것은 음성에서 변환된 텍스트입니다.",
+                "silence_removed_seconds": 2.4,
+                "uploaded_bytes": 18432
             }
         }
     }
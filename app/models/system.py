@@ -0,0 +1,236 @@
+"""
+서버 상태 확인 기능을 위한 Pydantic 모델.
+"""
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class WarmupStatus(BaseModel):
+    """
+    캐시 예열 진행 상황을 위한 모델.
+    """
+    state: str = Field(..., description="예열 상태 (disabled, idle, running, completed, cancelled, failed)")
+    total: int = Field(..., description="예열할 전체 항목 수")
+    completed: int = Field(..., description="제공자를 호출하여 예열한 항목 수")
+    skipped: int = Field(..., description="이미 캐시에 있어 건너뛴 항목 수")
+    failed: int = Field(..., description="예열에 실패한 항목 수")
+    started_at: Optional[float] = Field(None, description="예열 시작 시각 (Unix time)")
+    finished_at: Optional[float] = Field(None, description="예열 종료 시각 (Unix time)")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "state": "running",
+                "total": 200,
+                "completed": 42,
+                "skipped": 58,
+                "failed": 0,
+                "started_at": 1760000000.0,
+                "finished_at": None
+            }
+        }
+    }
+
+
+class MetricValue(BaseModel):
+    """
+    레이블별 지표 값을 위한 모델.
+    """
+    name: str = Field(..., description="지표 이름")
+    labels: Dict[str, str] = Field(default_factory=dict, description="레이블")
+    value: int = Field(..., description="값")
+
+
+class MetricsSnapshot(BaseModel):
+    """
+    워커 프로세스의 운영 지표를 위한 모델.
+    """
+    counters: List[MetricValue] = Field(..., description="카운터 목록")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "counters": [
+                    {"name": "requests_cancelled_total", "labels": {"route": "/api/v1/assistant/upload/audio"},
+                     "value": 3},
+                    {"name": "upstream_cancelled_total", "labels": {"operation": "assistant_run"}, "value": 2}
+                ]
+            }
+        }
+    }
+
+
+class CircuitStatus(BaseModel):
+    """
+    외부 API 회로 차단기 상태를 위한 모델.
+    """
+    name: str = Field(..., description="회로 차단기 이름 (openai_chat, openai_assistants, openai_stt, openai_tts, elevenlabs_tts)")
+    state: str = Field(..., description="회로 상태 (closed, open, half_open)")
+    calls: int = Field(..., description="통계에 포함된 최근 호출 수")
+    failure_rate: float = Field(..., description="최근 호출의 오류율")
+    slow_call_rate: float = Field(..., description="최근 호출 중 느린 호출 비율")
+    latency_p50_seconds: Optional[float] = Field(None, description="최근 호출 소요 시간 중앙값(초)")
+    latency_p95_seconds: Optional[float] = Field(None, description="최근 호출 소요 시간 95백분위(초)")
+    retry_after_seconds: Optional[float] = Field(None, description="회로가 열려 있는 경우 시험 호출까지 남은 시간(초)")
+
+
+class HealthStatus(BaseModel):
+    """
+    서버 상태 확인을 위한 모델.
+    """
+    status: str = Field(..., description="서버 상태 (ok, degraded)")
+    circuits: List[CircuitStatus] = Field(..., description="외부 API별 회로 차단기 상태")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "status": "degraded",
+                "circuits": [
+                    {"name": "elevenlabs_tts", "state": "open", "calls": 20, "failure_rate": 0.6,
+                     "slow_call_rate": 0.1, "latency_p50_seconds": 1.8, "latency_p95_seconds": 20.0,
+                     "retry_after_seconds": 12.0},
+                    {"name": "openai_chat", "state": "closed", "calls": 20, "failure_rate": 0.0,
+                     "slow_call_rate": 0.0, "latency_p50_seconds": 1.2, "latency_p95_seconds": 3.4,
+                     "retry_after_seconds": None}
+                ]
+            }
+        }
+    }
+
+
+class LoopStall(BaseModel):
+    """
+    이벤트 루프 지연 기록을 위한 모델.
+    """
+    occurred_at: float = Field(..., description="지연이 시작된 시각 (Unix time)")
+    lag_seconds: float = Field(..., description="이벤트 루프가 멈춘 시간(초)")
+    stack: Optional[str] = Field(None, description="지연 중에 이벤트 루프 스레드가 실행하던 코드의 스택")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "occurred_at": 1760000000.0,
+                "lag_seconds": 1.532,
+                "stack": "  File \"/app/app/services/speech_to_text_service.py\", line 62, in _convert_m4a_to_mp3\n"
+                         "    audio = AudioSegment.from_file(input_path, format=\"m4a\")\n"
+            }
+        }
+    }
+
+
+class UsageRollup(BaseModel):
+    """
+    경로 또는 대화 스레드별 외부 API 사용량 합계를 위한 모델.
+    """
+    key: str = Field(..., description="합산 기준 값 (경로 또는 스레드 ID)")
+    calls: int = Field(..., description="외부 API 호출 수")
+    errors: int = Field(..., description="오류로 끝난 호출 수")
+    input_tokens: int = Field(..., description="입력 토큰 수")
+    output_tokens: int = Field(..., description="출력 토큰 수")
+    characters: int = Field(..., description="외부 API에 보낸 텍스트 문자 수")
+    audio_seconds: float = Field(..., description="업로드하거나 합성한 오디오 길이(초)")
+    audio_bytes: int = Field(..., description="업로드하거나 합성한 오디오 크기(바이트)")
+    latency_ms_avg: int = Field(..., description="평균 호출 소요 시간(밀리초)")
+    latency_ms_max: int = Field(..., description="최대 호출 소요 시간(밀리초)")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "key": "/api/v1/assistant/upload/audio",
+                "calls": 120,
+                "errors": 2,
+                "input_tokens": 85000,
+                "output_tokens": 12000,
+                "characters": 36000,
+                "audio_seconds": 1840.5,
+                "audio_bytes": 52000000,
+                "latency_ms_avg": 2300,
+                "latency_ms_max": 14800
+            }
+        }
+    }
+
+
+class ClusterStatus(BaseModel):
+    """
+    노드 구성과 대화 스레드 담당 노드를 위한 모델.
+    """
+    enabled: bool = Field(..., description="스레드 친화성 라우팅 사용 여부 (노드가 둘 이상이고 이 노드가 그중 하나인 경우)")
+    self_url: str = Field(..., description="이 노드의 기본 URL")
+    nodes: List[str] = Field(..., description="모든 노드의 기본 URL 목록")
+    mode: str = Field(..., description="다른 노드가 담당하는 스레드의 요청 처리 방식 (forward 또는 redirect)")
+    thread_id: Optional[str] = Field(None, description="조회한 대화 스레드 ID")
+    owner: Optional[str] = Field(None, description="대화 스레드를 담당하는 노드의 기본 URL")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "enabled": True,
+                "self_url": "http://127.0.0.1:9101",
+                "nodes": ["http://127.0.0.1:9101", "http://127.0.0.1:9102"],
+                "mode": "forward",
+                "thread_id": "thread_abc123",
+                "owner": "http://127.0.0.1:9102"
+            }
+        }
+    }
+
+
+class SharedCacheNamespace(BaseModel):
+    """
+    공유 캐시의 항목 종류별 사용량을 위한 모델.
+    """
+    entries: int = Field(..., description="항목 수")
+    bytes: int = Field(..., description="항목 값의 전체 크기(바이트)")
+
+
+class SharedCacheStats(BaseModel):
+    """
+    워커 간 공유 캐시 사용량을 위한 모델.
+    """
+    enabled: bool = Field(..., description="공유 캐시 사용 여부")
+    file: str = Field(..., description="캐시 파일 경로")
+    entries: int = Field(..., description="전체 항목 수")
+    total_bytes: int = Field(..., description="항목 값의 전체 크기(바이트)")
+    max_bytes: int = Field(..., description="최대 용량(바이트), 넘으면 오래 사용되지 않은 항목부터 제거")
+    namespaces: Dict[str, SharedCacheNamespace] = Field(..., description="항목 종류(chat, stt 등)별 사용량")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "enabled": True,
+                "file": ".cache/shared/cache.sqlite3",
+                "entries": 1520,
+                "total_bytes": 4200000,
+                "max_bytes": 268435456,
+                "namespaces": {
+                    "chat": {"entries": 1200, "bytes": 1800000},
+                    "stt": {"entries": 320, "bytes": 2400000}
+                }
+            }
+        }
+    }
+
+
+class ModelRoutingStatus(BaseModel):
+    """
+    ChatGPT 모델 선택 설정과 모델별 응답 시간을 위한 모델.
+    """
+    enabled: bool = Field(..., description="모델 선택 사용 여부 (사용하지 않으면 default_model만 사용)")
+    default_model: str = Field(..., description="모델 선택을 사용하지 않을 때의 모델")
+    fast_model: str = Field(..., description="짧고 단순한 질문에 사용하는 빠른 모델")
+    strong_model: str = Field(..., description="긴 설명이 필요한 질문에 사용하는 성능이 높은 모델")
+    latency_seconds: Dict[str, float] = Field(..., description="이 워커에서 관측한 모델별 응답 시간(초)의 지수 이동 평균")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "enabled": True,
+                "default_model": "gpt-4o-mini",
+                "fast_model": "gpt-4o-mini",
+                "strong_model": "gpt-4o",
+                "latency_seconds": {"gpt-4o-mini": 1.42, "gpt-4o": 3.87}
+            }
+        }
+    }
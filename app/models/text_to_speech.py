@@ -1,7 +1,9 @@
 """
 텍스트-음성 변환을 위한 Pydantic 모델.
 """
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
 
 
 class TextQuery(BaseModel):
@@ -9,3 +11,20 @@ class TextQuery(BaseModel):
     텍스트-음성 변환 요청 모델.
     """
     text: str
+
+
+class TextBatchQuery(BaseModel):
+    """
+    여러 텍스트를 한 번에 음성으로 변환하기 위한 요청 모델.
+    """
+    texts: List[str] = Field(..., min_length=1, description="음성으로 변환할 텍스트 목록 (순서대로 파일 번호가 매겨짐)")
+    provider: Optional[Literal["elevenlabs", "openai"]] = Field(None, description="사용할 음성 제공자")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "texts": ["안녕하세요.", "오늘은 버스 타는 법을 배워 볼게요.", "안녕하세요."],
+                "provider": "openai"
+            }
+        }
+    }
@@ -0,0 +1,57 @@
+"""
+프로덕션용 서버 실행 진입점.
+
+사용법:
+    python -m app.server
+
+개발 중에는 자동 재시작을 사용하는 `python -m app.main`을 사용하세요.
+"""
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _is_installed(module_name: str) -> bool:
+    return importlib.util.find_spec(module_name) is not None
+
+
+def main() -> None:
+    """
+    여러 워커 프로세스로 서버를 실행합니다.
+
+    - SIGTERM을 받으면 새 연결을 받지 않고, 진행 중인 요청(스트리밍 오디오 포함)이
+      SERVER_GRACEFUL_SHUTDOWN_SECONDS 안에 끝나기를 기다린 뒤 종료합니다.
+    - 각 워커는 SERVER_LIMIT_MAX_REQUESTS(+지터)만큼 요청을 처리하면 종료되고 새 워커로 교체되어
+      메모리 증가를 제한합니다.
+    """
+    workers = settings.SERVER_WORKERS or os.cpu_count() or 1
+    loop = "uvloop" if _is_installed("uvloop") else "auto"
+    http = "httptools" if _is_installed("httptools") else "auto"
+    logger.info(f"서버 시작: workers={workers}, loop={loop}, http={http}")
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        limit_max_requests=settings.SERVER_LIMIT_MAX_REQUESTS or None,
+        limit_max_requests_jitter=settings.SERVER_LIMIT_MAX_REQUESTS_JITTER,
+        proxy_headers=True,
+        access_log=settings.SERVER_ACCESS_LOG
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
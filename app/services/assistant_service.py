@@ -5,10 +5,16 @@ import logging
 import time
 from typing import Optional, Tuple
 
-from openai import OpenAI
+from openai import APITimeoutError, OpenAI
 from openai.types.beta.threads import Run
 
+from app.core.cancellation import CancellationToken, OperationCancelled, raise_if_cancelled
+from app.core.circuit_breaker import circuit_breakers
 from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+from app.core.scheduler import upstream_scheduler
+from app.services.usage_ledger_service import set_usage_thread_id, usage_ledger_service
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -51,27 +57,41 @@ class AssistantService:
             logger.error(f"Assistant 생성 중 오류 발생: {str(e)}")
             raise
 
-    def create_thread(self) -> str:
+    def create_thread(self, timeout: Optional[float] = None) -> str:
         """
         새 대화 스레드를 생성합니다.
+
+        Args:
+            timeout: API 호출 제한 시간(초), 없으면 클라이언트 기본값 사용
         
         Returns:
             생성된 스레드의 ID
         """
         try:
-            thread = self.client.beta.threads.create()
+            client = self.client.with_options(timeout=timeout, max_retries=0) if timeout else self.client
+            with upstream_scheduler.slot("openai", "llm"), circuit_breakers.get("openai_assistants").guard(), \
+                    usage_ledger_service.track("openai", "assistant_thread"):
+                thread = client.beta.threads.create()
             return thread.id
         except Exception as e:
             logger.error(f"스레드 생성 중 오류 발생: {str(e)}")
             raise
 
-    def get_response(self, text: str, thread_id: Optional[str] = None) -> Tuple[str, str, str]:
+    def get_response(
+            self,
+            text: str,
+            thread_id: Optional[str] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Tuple[str, str, str]:
         """
         텍스트 쿼리에 대한 Assistant 응답을 가져옵니다.
         
         Args:
             text: Assistant에게 보낼 텍스트 쿼리
             thread_id: 기존 대화 스레드 ID (없으면 새로 생성됨)
+            cancel_token: 요청 취소 토큰 (취소되면 진행 중인 실행을 취소하고 중단)
+            deadline: 요청 처리 제한 시간 (llm 단계 시간을 API 호출과 실행 대기의 timeout으로 사용)
             
         Returns:
             (question, response, thread_id) 튜플
@@ -80,36 +100,59 @@ class AssistantService:
             - thread_id: 대화 스레드 ID
             
         Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 응답을 받을 수 없는 경우
             Exception: Assistant 응답을 가져오는 중 오류가 발생한 경우
         """
         try:
+            raise_if_cancelled(cancel_token)
+
+            client, run_timeout = self.client, 60
+            if deadline is not None:
+                run_timeout = deadline.stage_timeout("llm")
+                # 재시도하면 배분된 시간을 넘기므로 재시도하지 않음
+                client = self.client.with_options(timeout=run_timeout, max_retries=0)
+            stage_started_at = time.time()
+
             # 스레드 ID가 없으면 새로 생성
             if not thread_id:
-                thread_id = self.create_thread()
+                thread_id = self.create_thread(timeout=run_timeout if deadline is not None else None)
                 logger.info(f"새 스레드가 생성되었습니다. ID: {thread_id}")
 
             logger.info(f"OpenAI 메시지 생성 호출 전 thread_id: {thread_id}")
+            # 이후 같은 요청의 외부 API 호출 기록(TTS 등)에도 스레드 ID를 남김
+            set_usage_thread_id(thread_id)
 
-            # 메시지 추가
-            self.client.beta.threads.messages.create(
-                thread_id=thread_id,
-                role="user",
-                content=text
-            )
+            with upstream_scheduler.slot("openai", "llm", cancel_token, deadline), \
+                    circuit_breakers.get("openai_assistants").guard(), \
+                    usage_ledger_service.track("openai", "assistant_run", settings.OPENAI_ASSISTANT_MODEL,
+                                               characters=len(text)) as usage:
+                # 메시지 추가
+                client.beta.threads.messages.create(
+                    thread_id=thread_id,
+                    role="user",
+                    content=text
+                )
 
-            # 실행 생성 및 완료 대기
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread_id,
-                assistant_id=self.assistant_id
-            )
+                raise_if_cancelled(cancel_token)
 
-            # 실행 완료 대기
-            run = self._wait_for_run_completion(thread_id, run.id)
+                # 실행 생성 및 완료 대기
+                run = client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=self.assistant_id
+                )
 
-            # 응답 메시지 가져오기
-            messages = self.client.beta.threads.messages.list(
-                thread_id=thread_id
-            )
+                # 실행 완료 대기
+                run = self._wait_for_run_completion(
+                    thread_id, run.id, timeout=run_timeout - (time.time() - stage_started_at),
+                    cancel_token=cancel_token, deadline=deadline)
+                if run.usage:
+                    usage.update(input_tokens=run.usage.prompt_tokens, output_tokens=run.usage.completion_tokens)
+
+                # 응답 메시지 가져오기
+                messages = client.beta.threads.messages.list(
+                    thread_id=thread_id
+                )
 
             # 가장 최근의 assistant 메시지 찾기
             for message in messages.data:
@@ -125,11 +168,24 @@ class AssistantService:
             # assistant 메시지를 찾지 못한 경우
             return text, "응답을 생성하지 못했습니다.", thread_id
 
+        except OperationCancelled:
+            raise
+        except APITimeoutError:
+            if deadline is not None:
+                raise DeadlineExceeded("llm", deadline.remaining())
+            raise
         except Exception as e:
             logger.error(f"Assistant 응답을 가져오는 중 오류 발생: {str(e)}")
             raise Exception(f"Assistant 응답을 가져오는 중 오류 발생: {str(e)}")
 
-    def _wait_for_run_completion(self, thread_id: str, run_id: str, timeout: int = 60) -> Run:
+    def _wait_for_run_completion(
+            self,
+            thread_id: str,
+            run_id: str,
+            timeout: float = 60,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Run:
         """
         실행이 완료될 때까지 대기합니다.
         
@@ -137,19 +193,37 @@ class AssistantService:
             thread_id: 스레드 ID
             run_id: 실행 ID
             timeout: 최대 대기 시간(초)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간 (주어지면 시간 초과 시 DeadlineExceeded 발생)
             
         Returns:
             완료된 실행 객체
             
         Raises:
+            OperationCancelled: 요청이 취소되어 실행을 취소한 경우
+            DeadlineExceeded: 요청 처리 제한 시간 안에 실행이 끝나지 않은 경우
             Exception: 실행이 시간 초과되거나 실패한 경우
         """
         start_time = time.time()
         while time.time() - start_time < timeout:
-            run = self.client.beta.threads.runs.retrieve(
-                thread_id=thread_id,
-                run_id=run_id
-            )
+            if cancel_token is not None and cancel_token.cancelled:
+                self._cancel_run(thread_id, run_id)
+                metrics.increment("upstream_cancelled_total", operation="assistant_run")
+                cancel_token.raise_if_cancelled()
+
+            # 상태 조회 한 번이 남은 대기 시간을 넘기지 않도록 제한
+            client = self.client
+            if deadline is not None:
+                remaining = max(0.1, timeout - (time.time() - start_time))
+                client = self.client.with_options(timeout=remaining, max_retries=0)
+            try:
+                run = client.beta.threads.runs.retrieve(
+                    thread_id=thread_id,
+                    run_id=run_id
+                )
+            except APITimeoutError:
+                self._cancel_run(thread_id, run_id)
+                raise
 
             if run.status == "completed":
                 return run
@@ -157,17 +231,33 @@ class AssistantService:
                 logger.error(f"실행이 실패했습니다. 상태: {run.status}")
                 raise Exception(f"실행이 실패했습니다. 상태: {run.status}")
 
-            # 잠시 대기 후 다시 확인
-            time.sleep(1)
+            # 잠시 대기 후 다시 확인 (취소되면 즉시 깨어남), 남은 시간보다 오래 기다리지 않음
+            interval = max(0.0, min(1.0, timeout - (time.time() - start_time)))
+            if cancel_token is not None:
+                cancel_token.wait(interval)
+            else:
+                time.sleep(interval)
 
         # 시간 초과
         logger.error("실행 시간이 초과되었습니다.")
-        self.client.beta.threads.runs.cancel(
-            thread_id=thread_id,
-            run_id=run_id
-        )
+        self._cancel_run(thread_id, run_id)
+        if deadline is not None:
+            raise DeadlineExceeded("llm", deadline.remaining())
         raise Exception("실행 시간이 초과되었습니다.")
 
+    def _cancel_run(self, thread_id: str, run_id: str) -> None:
+        """
+        진행 중인 실행을 취소합니다. 이미 끝난 실행이면 오류를 무시합니다.
+        """
+        try:
+            self.client.beta.threads.runs.cancel(
+                thread_id=thread_id,
+                run_id=run_id
+            )
+            logger.info(f"실행을 취소했습니다. run_id: {run_id}")
+        except Exception as e:
+            logger.warning(f"실행 취소 중 오류 발생: {str(e)}")
+
 
 # 서비스의 기본 인스턴스 생성
 assistant_service = AssistantService()
@@ -0,0 +1,247 @@
+"""
+합성된 오디오를 디스크에 저장하고 안정적인 ID로 제공하는 캐시 서비스.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_AUDIO_ID_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# 다른 워커가 저장한 오디오도 반영하도록 캐시 디렉터리 전체를 다시 확인하는 간격(초)
+_SCAN_INTERVAL_SECONDS = 60
+
+# 용량을 넘으면 최대 용량의 이 비율까지 삭제 (저장할 때마다 다시 삭제하지 않도록)
+_EVICT_TARGET_RATIO = 0.9
+
+
+class AudioCacheService:
+    """
+    합성된 오디오 캐시.
+
+    오디오 ID는 (제공자, 음성, 모델, 출력 형식, 텍스트)의 해시이므로 같은 요청은 항상 같은 ID를 가지며,
+    합성 전에도 ID를 발급하여 나중에 GET으로 가져갈 수 있습니다.
+    ETag는 저장된 오디오 내용의 해시입니다.
+    """
+
+    def __init__(self, cache_dir: str = settings.AUDIO_CACHE_DIR, max_bytes: int = settings.AUDIO_CACHE_MAX_BYTES):
+        """
+        캐시 디렉터리와 최대 용량으로 서비스를 초기화합니다.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 마지막으로 확인한 오디오 총 크기에 이후 이 워커가 저장한 크기를 더한 추정값
+        self._approx_bytes = 0
+        self._scanned_at = 0.0
+
+    def make_audio_id(self, text: str, provider: str, output_format: str) -> str:
+        """
+        합성 요청에 대한 오디오 ID를 만듭니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            provider: 음성 제공자
+            output_format: 출력 형식
+
+        Returns:
+            오디오 ID
+        """
+        if provider == "elevenlabs":
+            voice, model = settings.ELEVENLABS_VOICE_ID, settings.ELEVENLABS_MODEL_ID
+        else:
+            voice, model = settings.OPENAI_TTS_VOICE, settings.OPENAI_TTS_MODEL
+        key = "\n".join([provider, voice, model, output_format, text])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+
+    def register(self, text: str, provider: str, output_format: str) -> str:
+        """
+        합성 요청을 등록하고 오디오 ID를 반환합니다. 이미 등록된 요청이면 기존 ID를 반환합니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            provider: 음성 제공자
+            output_format: 출력 형식
+
+        Returns:
+            오디오 ID
+        """
+        audio_id = self.make_audio_id(text, provider, output_format)
+        try:
+            # 최근 요청 시각 갱신 (오래된 항목부터 제거)
+            os.utime(self._metadata_path(audio_id))
+        except OSError:
+            self._write_metadata(audio_id, {"text": text, "provider": provider, "output_format": output_format})
+        return audio_id
+
+    def get_metadata(self, audio_id: str) -> Optional[dict]:
+        """
+        등록된 합성 요청의 메타데이터를 가져옵니다.
+
+        Args:
+            audio_id: 오디오 ID
+
+        Returns:
+            text, provider, output_format과 저장된 경우 etag, size를 담은 딕셔너리, 없으면 None
+        """
+        if not _AUDIO_ID_PATTERN.match(audio_id):
+            return None
+        try:
+            with open(self._metadata_path(audio_id), "r", encoding="utf-8") as metadata_file:
+                metadata = json.load(metadata_file)
+        except (OSError, ValueError):
+            return None
+
+        # 오디오가 제거된 경우 다시 합성해야 함
+        if "etag" in metadata and not self.get_audio_path(audio_id).exists():
+            metadata.pop("etag")
+            metadata.pop("size", None)
+        return metadata
+
+    def get_audio_path(self, audio_id: str) -> Path:
+        """
+        오디오 파일 경로를 반환합니다.
+        """
+        return self.cache_dir / f"{audio_id}.audio"
+
+    def read_audio(self, audio_id: str) -> Optional[bytes]:
+        """
+        저장된 오디오를 읽습니다.
+
+        Args:
+            audio_id: 오디오 ID
+
+        Returns:
+            오디오 데이터, 저장되어 있지 않으면 None
+        """
+        path = self.get_audio_path(audio_id)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        # 최근 사용 시각 갱신 (용량 초과 시 오래된 것부터 제거)
+        os.utime(path)
+        return data
+
+    def put_audio(self, audio_id: str, data: bytes) -> dict:
+        """
+        합성된 오디오를 저장합니다.
+
+        Args:
+            audio_id: register로 발급된 오디오 ID
+            data: 오디오 데이터
+
+        Returns:
+            etag, size가 추가된 메타데이터
+        """
+        metadata = self.get_metadata(audio_id) or {}
+        metadata["etag"] = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+        metadata["size"] = len(data)
+
+        self._atomic_write(self.get_audio_path(audio_id), data)
+        self._write_metadata(audio_id, metadata)
+        self._evict_if_needed(len(data))
+        return metadata
+
+    def get_audio_url(self, audio_id: str) -> str:
+        """
+        오디오를 GET으로 가져올 수 있는 URL 경로를 반환합니다.
+        """
+        return f"{settings.API_V1_STR}/text-to-speech/audio/{audio_id}"
+
+    def _metadata_path(self, audio_id: str) -> Path:
+        return self.cache_dir / f"{audio_id}.json"
+
+    def _write_metadata(self, audio_id: str, metadata: dict) -> None:
+        self._atomic_write(self._metadata_path(audio_id), json.dumps(metadata, ensure_ascii=False).encode("utf-8"))
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """
+        여러 요청이 같은 파일을 동시에 써도 읽는 쪽이 불완전한 파일을 보지 않도록 임시 파일을 교체합니다.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _evict_if_needed(self, added_bytes: int) -> None:
+        """
+        오디오 총 크기 추정값이 최대 용량을 넘거나 마지막 확인 후 _SCAN_INTERVAL_SECONDS가 지났을 때만
+        캐시 디렉터리를 확인하여 정리합니다. (저장할 때마다 디렉터리 전체를 읽지 않도록 함)
+        """
+        with self._lock:
+            self._approx_bytes += added_bytes
+            now = time.time()
+            if self._approx_bytes <= self.max_bytes and now - self._scanned_at < _SCAN_INTERVAL_SECONDS:
+                return
+            self._scanned_at = now
+            self._approx_bytes = self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        """
+        합성되지 않은 채 AUDIO_CACHE_MAX_AGE보다 오래된 메타데이터를 삭제하고, 오디오 총 크기가 최대 용량을 넘으면
+        가장 오래 사용되지 않은 오디오부터 메타데이터와 함께 삭제합니다.
+
+        Returns:
+            남은 오디오의 총 크기
+        """
+        audio_stats, metadata_mtimes = {}, {}
+        for entry in os.scandir(self.cache_dir):
+            audio_id, ext = os.path.splitext(entry.name)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if ext == ".audio":
+                audio_stats[audio_id] = stat
+            elif ext == ".json":
+                metadata_mtimes[audio_id] = stat.st_mtime
+
+        for audio_id, mtime in metadata_mtimes.items():
+            if audio_id not in audio_stats and now - mtime > settings.AUDIO_CACHE_MAX_AGE:
+                self._remove(self._metadata_path(audio_id))
+
+        total_size = sum(stat.st_size for stat in audio_stats.values())
+        if total_size <= self.max_bytes:
+            return total_size
+
+        # 오디오를 읽거나 같은 요청이 다시 등록된 시각 중 최근 시각 기준
+        entries = sorted(
+            (max(stat.st_mtime, metadata_mtimes.get(audio_id, 0.0)), audio_id, stat.st_size)
+            for audio_id, stat in audio_stats.items()
+        )
+        target_size = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        for _, audio_id, size in entries:
+            if total_size <= target_size:
+                break
+            self._remove(self.get_audio_path(audio_id))
+            self._remove(self._metadata_path(audio_id))
+            total_size -= size
+        logger.info(f"오디오 캐시 용량 초과로 오래된 항목을 삭제했습니다. 현재 크기: {total_size} bytes")
+        return total_size
+
+    def _remove(self, path: Path) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# 서비스의 기본 인스턴스 생성
+audio_cache_service = AudioCacheService()
@@ -0,0 +1,284 @@
+"""
+오디오 전처리 유틸리티.
+디코딩된 PCM 샘플에서 음성 구간을 검출하고 무음을 정리합니다.
+"""
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+# 음성 검출에 사용하는 프레임 길이(ms)
+VAD_FRAME_MS = 30
+
+
+def audio_segment_to_samples(audio: AudioSegment) -> np.ndarray:
+    """
+    AudioSegment를 -1.0 ~ 1.0 범위의 모노 float32 샘플 배열로 변환합니다.
+
+    Args:
+        audio: 변환할 오디오
+
+    Returns:
+        모노 샘플 배열
+    """
+    samples = np.asarray(audio.get_array_of_samples(), dtype=np.float32)
+    if audio.channels > 1:
+        samples = samples.reshape(-1, audio.channels).mean(axis=1)
+    return samples / float(1 << (8 * audio.sample_width - 1))
+
+
+def _frame_energy_db(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    VAD_FRAME_MS 길이 프레임별 RMS 에너지(dBFS)를 계산합니다.
+    """
+    frame_length = max(1, int(sample_rate * VAD_FRAME_MS / 1000))
+    frame_count = len(samples) // frame_length
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    return 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+
+
+def detect_speech_regions(
+        samples: np.ndarray,
+        sample_rate: int,
+        threshold_dbfs: float = -45.0,
+        min_silence_ms: int = 500,
+        min_speech_ms: int = 100,
+        padding_ms: int = 200
+) -> List[Tuple[int, int]]:
+    """
+    프레임 에너지 기반으로 음성 구간을 검출합니다.
+
+    잡음 수준(하위 10% 프레임 에너지)보다 충분히 큰 프레임을 음성으로 보고,
+    짧은 무음은 이어 붙이고 짧은 잡음은 버린 뒤 앞뒤로 여유를 둡니다.
+
+    Args:
+        samples: -1.0 ~ 1.0 범위의 모노 샘플 배열
+        sample_rate: 샘플링 레이트
+        threshold_dbfs: 음성으로 판단할 최소 에너지(dBFS)
+        min_silence_ms: 구간을 나눌 최소 무음 길이(ms)
+        min_speech_ms: 음성으로 인정할 최소 길이(ms)
+        padding_ms: 각 구간 앞뒤에 남길 여유(ms)
+
+    Returns:
+        (start_ms, end_ms) 음성 구간 목록
+    """
+    energy_db = _frame_energy_db(samples, sample_rate)
+    if len(energy_db) == 0:
+        return []
+
+    # 잡음 수준에 맞춰 임계값을 올리되, 전체가 음성인 경우에도 검출되도록 최대 에너지 기준으로 제한
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(threshold_dbfs, min(noise_floor + 10.0, energy_db.max() - 20.0))
+    voiced = energy_db > threshold
+    if not voiced.any():
+        return []
+
+    # 음성 프레임의 연속 구간 [start, end) 찾기
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # 짧은 무음으로 나뉜 구간 병합
+    min_silence_frames = max(1, min_silence_ms // VAD_FRAME_MS)
+    split = (starts[1:] - ends[:-1]) >= min_silence_frames
+    starts = starts[np.concatenate(([True], split))]
+    ends = ends[np.concatenate((split, [True]))]
+
+    # 너무 짧은 구간(순간 잡음) 제거
+    keep = (ends - starts) >= max(1, min_speech_ms // VAD_FRAME_MS)
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return []
+
+    # 여유를 둔 뒤 ms 단위로 변환하고, 겹치는 구간 병합
+    total_ms = int(len(samples) * 1000 / sample_rate)
+    starts_ms = np.maximum(starts * VAD_FRAME_MS - padding_ms, 0)
+    ends_ms = np.minimum(ends * VAD_FRAME_MS + padding_ms, total_ms)
+    split = starts_ms[1:] > ends_ms[:-1]
+    starts_ms = starts_ms[np.concatenate(([True], split))]
+    ends_ms = ends_ms[np.concatenate((split, [True]))]
+
+    return [(int(start), int(end)) for start, end in zip(starts_ms, ends_ms)]
+
+
+def compact_silence(audio: AudioSegment, regions: List[Tuple[int, int]]) -> AudioSegment:
+    """
+    음성 구간만 이어 붙여 앞뒤 무음과 긴 멈춤을 제거합니다.
+
+    Args:
+        audio: 원본 오디오
+        regions: (start_ms, end_ms) 음성 구간 목록 (비어 있지 않아야 함)
+
+    Returns:
+        무음이 정리된 오디오
+    """
+    compacted = audio[regions[0][0]:regions[0][1]]
+    for start, end in regions[1:]:
+        compacted += audio[start:end]
+    return compacted
+
+
+def normalize_for_speech(audio: AudioSegment, sample_rate: int = 16000) -> AudioSegment:
+    """
+    음성 인식에 필요한 만큼만 남도록 모노로 다운믹스하고 샘플링 레이트를 낮춥니다.
+
+    Args:
+        audio: 원본 오디오
+        sample_rate: 목표 샘플링 레이트
+
+    Returns:
+        정규화된 오디오
+    """
+    if audio.channels != 1:
+        audio = audio.set_channels(1)
+    if audio.frame_rate > sample_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    return audio
+
+
+def split_at_silence(
+        samples: np.ndarray,
+        sample_rate: int,
+        chunk_ms: int,
+        overlap_ms: int = 0,
+        search_ms: int = 30000
+) -> List[Tuple[int, int]]:
+    """
+    긴 오디오를 chunk_ms 이하의 구간으로 나눕니다.
+
+    각 목표 경계 직전 search_ms 범위에서 가장 조용한 지점(약 300ms 평균 에너지 기준)을 찾아 자르고,
+    다음 구간은 자른 지점보다 overlap_ms 앞에서 시작하여 경계의 단어가 잘리지 않도록 합니다.
+
+    Args:
+        samples: -1.0 ~ 1.0 범위의 모노 샘플 배열
+        sample_rate: 샘플링 레이트
+        chunk_ms: 구간의 최대 길이(ms)
+        overlap_ms: 이웃한 구간이 겹치는 길이(ms)
+        search_ms: 경계 직전에서 자를 지점을 찾는 범위(ms)
+
+    Returns:
+        (start_ms, end_ms) 구간 목록
+    """
+    total_ms = int(len(samples) * 1000 / sample_rate)
+    if total_ms <= chunk_ms:
+        return [(0, total_ms)]
+
+    energy_db = _frame_energy_db(samples, sample_rate)
+    window = max(1, 300 // VAD_FRAME_MS)
+    smoothed = np.convolve(energy_db, np.ones(window) / window, mode="same")
+
+    chunk_frames = max(1, chunk_ms // VAD_FRAME_MS)
+    search_frames = max(1, min(search_ms, chunk_ms // 2) // VAD_FRAME_MS)
+    overlap_frames = overlap_ms // VAD_FRAME_MS
+
+    regions = []
+    start = 0
+    while (len(smoothed) - start) * VAD_FRAME_MS > chunk_ms:
+        window_end = start + chunk_frames
+        window_start = max(start + overlap_frames + 1, window_end - search_frames)
+        # 비슷하게 조용한 지점이라면 구간이 길어지도록 뒤쪽을 약간 우대
+        candidates = smoothed[window_start:window_end] + np.linspace(3.0, 0.0, window_end - window_start)
+        cut = window_start + int(np.argmin(candidates))
+        regions.append((start * VAD_FRAME_MS, cut * VAD_FRAME_MS))
+        start = cut - overlap_frames
+    regions.append((start * VAD_FRAME_MS, total_ms))
+    return regions
+
+
+# MPEG 버전 비트별 Layer III 비트레이트(kbps), 샘플링 레이트, 프레임당 샘플 수 (버전 비트 1은 예약됨)
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    0: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_MP3_SAMPLES_PER_FRAME = {3: 1152, 2: 576, 0: 576}
+
+
+def _id3v2_size(data: bytes) -> int:
+    """
+    데이터 앞의 ID3v2 태그 길이를 반환합니다. 태그가 없으면 0입니다.
+    """
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    # 푸터가 있으면 10바이트 추가
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+
+def iter_mp3_frames(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    MP3(MPEG Layer III) 데이터의 프레임을 차례로 찾습니다. 프레임이 아닌 바이트는 건너뜁니다.
+
+    Args:
+        data: MP3 데이터
+
+    Returns:
+        (offset, length, samples, sample_rate) 튜플을 내는 이터레이터
+        - offset: 프레임 시작 위치
+        - length: 프레임 길이(바이트)
+        - samples: 프레임의 샘플 수
+        - sample_rate: 샘플링 레이트
+    """
+    offset = _id3v2_size(data)
+    while offset + 4 <= len(data):
+        header = data[offset:offset + 4]
+        version = (header[1] >> 3) & 0x03
+        bitrate_index = header[2] >> 4
+        sample_rate_index = (header[2] >> 2) & 0x03
+        is_frame = (header[0] == 0xFF and (header[1] & 0xE0) == 0xE0 and version in _MP3_BITRATES
+                    and (header[1] >> 1) & 0x03 == 1 and 0 < bitrate_index < 15 and sample_rate_index < 3)
+        if not is_frame:
+            offset += 1
+            continue
+
+        bitrate = _MP3_BITRATES[version][bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+        samples = _MP3_SAMPLES_PER_FRAME[version]
+        padding = (header[2] >> 1) & 0x01
+        length = samples // 8 * bitrate // sample_rate + padding
+        if offset + length > len(data):
+            return
+        yield offset, length, samples, sample_rate
+        offset += length
+
+
+def mp3_duration_seconds(data: bytes) -> Optional[float]:
+    """
+    MP3 데이터의 프레임 헤더로 재생 시간을 계산합니다. (디코딩하지 않음)
+
+    Args:
+        data: MP3 데이터
+
+    Returns:
+        재생 시간(초), 프레임을 찾지 못하면 None
+    """
+    seconds = 0.0
+    found = False
+    for _, _, samples, sample_rate in iter_mp3_frames(data):
+        seconds += samples / sample_rate
+        found = True
+    return seconds if found else None
+
+
+def mp3_audio_frames(data: bytes) -> bytes:
+    """
+    MP3 데이터에서 오디오 프레임만 남깁니다. (디코딩하지 않음)
+
+    ID3 태그, 첫 프레임의 Xing/Info/VBRI 헤더(파일 전체 길이 정보), 끝의 불완전한 프레임을 제거하므로
+    여러 MP3의 결과를 그대로 이어 붙여도 하나의 올바른 MP3 스트림이 됩니다.
+
+    Args:
+        data: MP3 데이터
+
+    Returns:
+        프레임 경계에 맞춘 오디오 프레임 데이터
+    """
+    frames = []
+    for index, (offset, length, _, _) in enumerate(iter_mp3_frames(data)):
+        frame = data[offset:offset + length]
+        # 인코더가 붙인 정보 프레임은 소리가 없고, 이어 붙이면 전체 길이 정보가 틀려지므로 제외
+        if index == 0 and any(tag in frame[:64] for tag in (b"Xing", b"Info", b"VBRI")):
+            continue
+        frames.append(frame)
+    return b"".join(frames)
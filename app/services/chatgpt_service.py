@@ -1,9 +1,20 @@
 """
 OpenAI API를 사용한 ChatGPT 서비스.
 """
-from openai import OpenAI
+from typing import Optional
 
+from openai import APITimeoutError, OpenAI
+
+from app.core.cancellation import CancellationToken, OperationCancelled, raise_if_cancelled
+from app.core.circuit_breaker import circuit_breakers
 from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+from app.core.model_router import model_router
+from app.core.scheduler import upstream_scheduler
+from app.services.usage_ledger_service import usage_ledger_service, usage_tags
+from app.services.popularity_service import popularity_service
+from app.services.response_cache_service import response_cache_service
 
 
 class ChatGPTService:
@@ -16,36 +27,148 @@ class ChatGPTService:
         OpenAI API 키로 서비스를 초기화합니다.
         """
         self.client = OpenAI(api_key=api_key)
-        self.model = settings.OPENAI_CHAT_MODEL
 
-    def get_response(self, text: str) -> str:
+    def get_response(
+            self,
+            text: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> str:
         """
         텍스트 쿼리에 대한 ChatGPT 응답을 가져옵니다.
 
         Args:
             text: ChatGPT에게 보낼 텍스트 쿼리
+            cancel_token: 요청 취소 토큰 (취소되면 응답 스트림을 닫고 중단)
+            deadline: 요청 처리 제한 시간 (캐시에 없을 때 llm 단계 시간을 API 호출 timeout으로 사용)
 
         Returns:
             ChatGPT의 응답 텍스트
 
         Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 응답을 받을 수 없는 경우
             Exception: ChatGPT 응답을 가져오는 중 오류가 발생한 경우
         """
+        popularity_service.record_chat(text)
+
+        if settings.CHAT_CACHE_ENABLED:
+            cached_response = response_cache_service.get(text)
+            if cached_response is not None:
+                return cached_response
+
+        response_text = self._request_response(text, cancel_token, deadline)
+
+        if settings.CHAT_CACHE_ENABLED and response_text:
+            response_cache_service.put(text, response_text)
+
+        # 결과 반환
+        return response_text
+
+    def prefetch(self, text: str) -> bool:
+        """
+        캐시 예열을 위해 인기도 통계에 기록하지 않고 응답을 가져와 캐시에 저장합니다.
+        이 워커나 워커 간 공유 캐시에 이미 응답이 있으면 API를 호출하지 않습니다.
+
+        Args:
+            text: ChatGPT에게 보낼 텍스트 쿼리
+
+        Returns:
+            API를 호출했으면 True, 이미 캐시에 있어 건너뛰었으면 False
+        """
+        if response_cache_service.contains(text):
+            return False
+        response_text = self._request_response(text)
+        if response_text:
+            response_cache_service.put(text, response_text)
+        return True
+
+    def _request_response(
+            self,
+            text: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        OpenAI API를 호출하여 ChatGPT 응답을 생성합니다.
+
+        응답을 스트림으로 받아 청크마다 취소 여부를 확인하고, 취소되면 스트림을 닫아
+        남은 토큰 생성을 중단합니다. 회로가 열려 있으면 호출하지 않고 바로 실패합니다.
+        모델은 질문과 경로, 남은 시간에 따라 선택합니다. (model_router 참고)
+        """
         try:
-            # OpenAI API를 사용하여 ChatGPT 응답 생성
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "당신은 도움이 되는 AI 비서입니다."},
-                    {"role": "user", "content": text}
-                ]
-            )
-
-            # 결과 반환
-            return response.choices[0].message.content
+            raise_if_cancelled(cancel_token)
+
+            client = self.client
+            timeout = None
+            if deadline is not None:
+                timeout = deadline.stage_timeout("llm")
+                # 재시도하면 배분된 시간을 넘기므로 재시도하지 않음
+                client = self.client.with_options(timeout=timeout, max_retries=0)
+            model, _ = model_router.choose(text, (usage_tags.get() or {}).get("route"), timeout)
+
+            with upstream_scheduler.slot("openai", "llm", cancel_token, deadline), \
+                    circuit_breakers.get("openai_chat").guard(), \
+                    usage_ledger_service.track("openai", "chat", model, characters=len(text)) as usage, \
+                    model_router.observe(model):
+                return self._stream_completion(client, model, text, usage, cancel_token, deadline)
+        except OperationCancelled:
+            raise
+        except APITimeoutError:
+            if deadline is not None:
+                raise DeadlineExceeded("llm", deadline.remaining())
+            raise Exception("ChatGPT 응답을 가져오는 중 오류 발생: 요청 시간이 초과되었습니다.")
         except Exception as e:
             raise Exception(f"ChatGPT 응답을 가져오는 중 오류 발생: {str(e)}")
 
+    def _stream_completion(
+            self,
+            client: OpenAI,
+            model: str,
+            text: str,
+            usage: dict,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline]
+    ) -> str:
+        """
+        ChatGPT 응답을 스트림으로 받아 이어 붙이고, 마지막 청크의 토큰 사용량을 usage에 기록합니다.
+        """
+        # OpenAI API를 사용하여 ChatGPT 응답 생성
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "당신은 도움이 되는 AI 비서입니다."},
+                {"role": "user", "content": text}
+            ],
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        parts = []
+        if cancel_token is not None:
+            # 첫 청크를 기다리는 중에 취소되어도 바로 연결을 닫음
+            cancel_token.add_callback(stream.close)
+        try:
+            for chunk in stream:
+                raise_if_cancelled(cancel_token)
+                # httpx timeout은 청크 사이 대기 시간에만 적용되므로 전체 시간은 직접 확인
+                if deadline is not None and deadline.remaining() <= 0:
+                    raise DeadlineExceeded("llm", deadline.remaining())
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                if chunk.usage:
+                    usage.update(input_tokens=chunk.usage.prompt_tokens, output_tokens=chunk.usage.completion_tokens)
+        except Exception:
+            if cancel_token is not None and cancel_token.cancelled:
+                metrics.increment("upstream_cancelled_total", operation="chat_stream")
+                cancel_token.raise_if_cancelled()
+            raise
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(stream.close)
+            stream.close()
+
+        return "".join(parts)
 
 # 서비스의 기본 인스턴스 생성
 chatgpt_service = ChatGPTService()
@@ -0,0 +1,351 @@
+"""
+오래 걸리는 STT 및 STT-ChatGPT-TTS 작업을 요청 처리와 분리하여 실행하는 비동기 작업 서비스.
+작업 상태는 로컬 SQLite 파일에 저장되어 워커 간에 공유되고 재시작 후에도 유지됩니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import requests
+
+from app.core.config import settings
+from app.core.scheduler import BULK, priority_scope
+from app.services.audio_cache_service import AudioCacheService, audio_cache_service
+from app.services.chatgpt_service import ChatGPTService, chatgpt_service
+from app.services.speech_to_text_service import SpeechToTextService, speech_to_text_service
+from app.services.text_to_speech_service import TextToSpeechService, text_to_speech_service
+from app.services.usage_ledger_service import usage_scope
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("speech-to-text", "stt-chatgpt-tts")
+
+# 입력 파일을 저장할 때 한 번에 읽는 크기
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker_pid INTEGER,
+    worker_started_at INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+
+class UploadTooLargeError(Exception):
+    """
+    입력 오디오가 JOB_MAX_UPLOAD_BYTES를 넘을 때 발생하는 예외.
+    """
+
+
+class JobService:
+    """
+    비동기 작업 서비스.
+
+    작업은 제출한 프로세스의 스레드 풀에서 실행되며, 실행 직전에 상태를 queued → running으로
+    원자적으로 바꾸어 여러 워커가 같은 작업을 중복 실행하지 않게 합니다.
+    서버가 시작되면 대기 중이던 작업과 종료된 프로세스가 실행하던 작업을 다시 실행합니다.
+    """
+
+    def __init__(
+            self,
+            store_file: str = settings.JOB_STORE_FILE,
+            input_dir: str = settings.JOB_INPUT_DIR,
+            stt_service: SpeechToTextService = speech_to_text_service,
+            chat_service: ChatGPTService = chatgpt_service,
+            tts_service: TextToSpeechService = text_to_speech_service,
+            audio_cache: AudioCacheService = audio_cache_service
+    ):
+        """
+        작업 저장소 경로와 작업에 사용할 서비스들로 초기화합니다.
+        """
+        self.store_file = Path(store_file)
+        self.input_dir = Path(input_dir)
+        self.stt_service = stt_service
+        self.chat_service = chat_service
+        self.tts_service = tts_service
+        self.audio_cache = audio_cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._initialized = False
+
+    def start(self) -> None:
+        """
+        작업 스레드 풀을 시작하고, 만료된 작업을 정리한 뒤 밀린 작업을 다시 실행합니다.
+        """
+        self._ensure_store()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, settings.JOB_MAX_WORKERS), thread_name_prefix="job")
+        self._purge_expired()
+        for job_id in self._recover():
+            self._executor.submit(self._run, job_id)
+
+    def shutdown(self) -> None:
+        """
+        대기 중인 작업 실행을 취소합니다. 실행 중인 작업은 끝까지 진행되며,
+        취소된 작업은 다음 서버 시작 시 다시 실행됩니다.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, kind: str, source: BinaryIO, ext: str, params: Optional[dict] = None) -> dict:
+        """
+        작업을 제출합니다. 입력 오디오는 메모리에 모두 올리지 않고 나누어 읽으며 입력 파일로 저장합니다.
+
+        Args:
+            kind: 작업 종류 (JOB_KINDS 중 하나)
+            source: 입력 오디오를 읽을 파일 객체
+            ext: 오디오 파일 확장자(.mp3, .m4a 등)
+            params: 작업 옵션
+
+        Returns:
+            제출된 작업 상태
+
+        Raises:
+            ValueError: 지원하지 않는 작업 종류인 경우
+            UploadTooLargeError: 입력 오디오가 JOB_MAX_UPLOAD_BYTES를 넘는 경우
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {kind}")
+        self._ensure_store()
+
+        job_id = uuid.uuid4().hex
+        input_path = self.input_dir / f"{job_id}{ext}"
+        self._save_input(source, input_path)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, input_path, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(params or {}), str(input_path), time.time())
+            )
+
+        if self._executor is not None:
+            self._executor.submit(self._run, job_id)
+        else:
+            logger.warning(f"작업 스레드 풀이 시작되지 않아 작업 {job_id}은(는) 다음 서버 시작 시 실행됩니다.")
+        return self.get(job_id)
+
+    def _save_input(self, source: BinaryIO, input_path: Path) -> None:
+        """
+        입력 오디오를 나누어 읽으며 저장하고, 크기 제한을 넘으면 저장하던 파일을 삭제합니다.
+        """
+        written = 0
+        try:
+            with open(input_path, "wb") as output:
+                while chunk := source.read(_COPY_CHUNK_BYTES):
+                    written += len(chunk)
+                    if written > settings.JOB_MAX_UPLOAD_BYTES:
+                        raise UploadTooLargeError(
+                            f"업로드할 수 있는 파일 크기는 최대 {settings.JOB_MAX_UPLOAD_BYTES} bytes입니다.")
+                    output.write(chunk)
+        except BaseException:
+            input_path.unlink(missing_ok=True)
+            raise
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        작업 상태를 가져옵니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 상태, 없으면 None
+        """
+        self._ensure_store()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "error": row["error"],
+            "result": json.loads(row["result"]) if row["result"] else None
+        }
+
+    def _run(self, job_id: str) -> None:
+        """
+        작업을 선점하여 실행하고 결과를 저장한 뒤 웹훅을 보냅니다.
+        """
+        with closing(self._connect()) as conn, conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', worker_pid = ?, worker_started_at = ?, started_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (os.getpid(), _process_start_time(os.getpid()), time.time(), job_id)
+            ).rowcount
+            row = conn.execute("SELECT kind, params, input_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not claimed:
+            # 다른 워커가 이미 실행 중이거나 완료함
+            return
+
+        result, error = None, None
+        try:
+            # 일괄 작업은 실시간 요청이 쓰고 남은 외부 API 호출 자리만 사용
+            with priority_scope(BULK), usage_scope(f"job:{row['kind']}"):
+                result = self._execute(row["kind"], row["input_path"], json.loads(row["params"]))
+        except Exception as e:
+            logger.error(f"작업 {job_id} 실행 중 오류 발생: {str(e)}", exc_info=True)
+            error = str(e)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "succeeded", json.dumps(result, ensure_ascii=False) if result else None,
+                 error, time.time(), job_id)
+            )
+        if os.path.exists(row["input_path"]):
+            os.remove(row["input_path"])
+
+        self._send_webhook(self.get(job_id))
+
+    def _execute(self, kind: str, input_path: str, params: dict) -> dict:
+        """
+        작업 종류에 따라 실제 처리를 수행합니다.
+        """
+        transcription = self.stt_service.speech_to_text_from_path(input_path)
+        if kind == "speech-to-text":
+            return transcription.model_dump()
+
+        response_text = self.chat_service.get_response(transcription.text)
+        provider = params.get("provider", "openai")
+        output_format = params.get("output_format", "mp3")
+        # 작업 결과를 가져갈 때 바로 재생할 수 있도록 오디오를 미리 합성
+        audio_id, _, _ = self.tts_service.text_to_speech_cached(
+            response_text, provider=provider, output_format=output_format)
+        return {
+            "text": transcription.text,
+            "response": response_text,
+            "audio_url": self.audio_cache.get_audio_url(audio_id)
+        }
+
+    def _send_webhook(self, job: dict) -> None:
+        """
+        JOB_WEBHOOK_URL이 설정되어 있으면 완료된 작업 상태를 POST로 전송합니다.
+        """
+        if not settings.JOB_WEBHOOK_URL:
+            return
+        for attempt in range(1, settings.JOB_WEBHOOK_MAX_ATTEMPTS + 1):
+            try:
+                response = requests.post(settings.JOB_WEBHOOK_URL, json=job,
+                                         timeout=settings.JOB_WEBHOOK_TIMEOUT_SECONDS)
+                if response.status_code < 500:
+                    return
+                logger.warning(f"작업 {job['job_id']} 웹훅 응답 오류: {response.status_code}")
+            except requests.RequestException as e:
+                logger.warning(f"작업 {job['job_id']} 웹훅 전송 중 오류 발생: {str(e)}")
+            if attempt < settings.JOB_WEBHOOK_MAX_ATTEMPTS:
+                time.sleep(2 ** attempt)
+
+    def _recover(self) -> list:
+        """
+        종료된 프로세스가 실행하던 작업을 대기 상태로 되돌리고, 대기 중인 작업 ID 목록을 반환합니다.
+        """
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute("SELECT id, worker_pid, worker_started_at FROM jobs WHERE status = 'running'").fetchall()
+            for row in rows:
+                if not _is_process_alive(row["worker_pid"], row["worker_started_at"]):
+                    conn.execute("UPDATE jobs SET status = 'queued', worker_pid = NULL WHERE id = ? AND status = 'running'",
+                                 (row["id"],))
+            rows = conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at").fetchall()
+        return [row["id"] for row in rows]
+
+    async def run_periodic_purge(self) -> None:
+        """
+        JOB_PURGE_INTERVAL_SECONDS마다 만료된 작업을 삭제합니다.
+        """
+        while True:
+            await asyncio.sleep(settings.JOB_PURGE_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(self._purge_expired)
+            except sqlite3.Error as e:
+                logger.warning(f"만료된 작업 삭제 중 오류 발생: {str(e)}")
+
+    def _purge_expired(self) -> None:
+        """
+        JOB_RESULT_TTL_SECONDS보다 오래전에 끝난 작업을 삭제합니다.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                         (time.time() - settings.JOB_RESULT_TTL_SECONDS,))
+
+    def _ensure_store(self) -> None:
+        if self._initialized:
+            return
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        self.input_dir.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            # 여러 워커가 동시에 읽고 쓸 수 있도록 WAL 모드 사용
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            # 이전 버전에서 만든 저장소에는 worker_started_at 열이 없음
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "worker_started_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN worker_started_at INTEGER")
+        self._initialized = True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.store_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def _process_start_time(pid: int) -> Optional[int]:
+    """
+    프로세스 시작 시각(부팅 후 클록 틱 수)을 /proc에서 읽습니다. 알 수 없으면 None입니다.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return None
+    # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있으므로 마지막 ")" 뒤부터 나눔 (starttime은 22번째 필드)
+    fields = stat[stat.rfind(")") + 2:].split()
+    try:
+        return int(fields[19])
+    except (IndexError, ValueError):
+        return None
+
+
+def _is_process_alive(pid: Optional[int], started_at: Optional[int]) -> bool:
+    """
+    작업을 실행하던 프로세스가 아직 살아 있는지 확인합니다.
+
+    컨테이너가 재시작되면 같은 PID를 다른 프로세스가 사용할 수 있으므로, 작업을 선점할 때 기록한
+    프로세스 시작 시각이 있으면 현재 그 PID 프로세스의 시작 시각과 같아야 같은 프로세스로 봅니다.
+    """
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    if started_at is None:
+        return True
+    return _process_start_time(pid) == started_at
+
+
+# 서비스의 기본 인스턴스 생성
+job_service = JobService()
@@ -0,0 +1,137 @@
+"""
+자주 요청되는 문구의 인기도 통계 서비스.
+TTS로 변환된 텍스트와 ChatGPT 질문의 요청 횟수를 디스크에 기록하여 재시작 후 캐시 예열에 사용합니다.
+"""
+import asyncio
+import fcntl
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PopularityService:
+    """
+    문구 인기도 통계.
+
+    요청 횟수는 메모리에 모았다가 주기적으로 gzip JSON 파일에 합산하며,
+    여러 워커가 같은 파일을 쓰더라도 잠금 파일로 합산이 유실되지 않게 합니다.
+    """
+
+    def __init__(self, file_path: str = settings.POPULARITY_FILE, max_entries: int = settings.POPULARITY_MAX_ENTRIES):
+        """
+        통계 파일 경로와 보관할 최대 항목 수로 서비스를 초기화합니다.
+        """
+        self.file_path = Path(file_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # 마지막 저장 이후 새로 기록된 횟수
+        self._pending: Counter = Counter()
+
+    def record_tts(self, text: str, provider: str, output_format: str) -> None:
+        """
+        TTS로 변환된 텍스트를 기록합니다.
+        """
+        self._record(("tts", provider, output_format, text))
+
+    def record_chat(self, text: str) -> None:
+        """
+        ChatGPT 질문을 기록합니다.
+        """
+        self._record(("chat", text))
+
+    def _record(self, key: Tuple[str, ...]) -> None:
+        if not settings.POPULARITY_ENABLED:
+            return
+        with self._lock:
+            self._pending[key] += 1
+
+    def top_tts(self, limit: int) -> List[Tuple[str, str, str]]:
+        """
+        가장 많이 변환된 TTS 요청을 가져옵니다.
+
+        Args:
+            limit: 최대 개수
+
+        Returns:
+            (text, provider, output_format) 목록 (많이 요청된 순서)
+        """
+        counts = self._load()
+        ranked = [key for key, _ in counts.most_common() if key[0] == "tts"][:limit]
+        return [(text, provider, output_format) for _, provider, output_format, text in ranked]
+
+    def top_chat(self, limit: int) -> List[str]:
+        """
+        가장 많이 요청된 ChatGPT 질문을 가져옵니다.
+
+        Args:
+            limit: 최대 개수
+
+        Returns:
+            질문 목록 (많이 요청된 순서)
+        """
+        counts = self._load()
+        return [key[1] for key, _ in counts.most_common() if key[0] == "chat"][:limit]
+
+    def flush(self) -> None:
+        """
+        메모리에 모인 횟수를 통계 파일에 합산하여 저장합니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.file_path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            counts = self._load()
+            counts.update(pending)
+            self._write(Counter(dict(counts.most_common(self.max_entries))))
+
+    async def run_periodic_flush(self) -> None:
+        """
+        POPULARITY_FLUSH_INTERVAL_SECONDS마다 통계를 저장합니다. (취소될 때까지 실행)
+        """
+        while True:
+            await asyncio.sleep(settings.POPULARITY_FLUSH_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"인기도 통계 저장 중 오류 발생: {str(e)}")
+
+    def _load(self) -> Counter:
+        try:
+            with gzip.open(self.file_path, "rt", encoding="utf-8") as stats_file:
+                rows = json.load(stats_file)
+        except FileNotFoundError:
+            return Counter()
+        except (OSError, ValueError) as e:
+            logger.warning(f"인기도 통계 파일을 읽을 수 없습니다: {str(e)}")
+            return Counter()
+        return Counter({tuple(key): count for key, count in rows})
+
+    def _write(self, counts: Counter) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self.file_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw_file, gzip.open(raw_file, "wt", encoding="utf-8") as stats_file:
+                json.dump([[list(key), count] for key, count in counts.items()], stats_file, ensure_ascii=False,
+                          separators=(",", ":"))
+            os.replace(temp_path, self.file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+# 서비스의 기본 인스턴스 생성
+popularity_service = PopularityService()
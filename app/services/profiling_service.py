@@ -0,0 +1,120 @@
+"""
+실행 중인 워커 프로세스의 CPU 및 메모리 프로파일링 서비스.
+외부 의존성 없이 표준 라이브러리만으로 스택 샘플링과 tracemalloc 스냅샷을 수집합니다.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ProfilerBusyError(Exception):
+    """
+    이미 다른 프로파일링이 진행 중일 때 발생하는 예외.
+    """
+
+
+class ProfilingService:
+    """
+    프로파일링 서비스. 한 워커에서 동시에 하나의 프로파일링만 수행합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def cpu_profile(self, seconds: float, interval: float) -> str:
+        """
+        주어진 시간 동안 모든 스레드의 스택을 주기적으로 샘플링합니다.
+
+        Args:
+            seconds: 수집 시간(초)
+            interval: 샘플링 간격(초)
+
+        Returns:
+            flamegraph.pl, speedscope 등에서 읽을 수 있는 접힌 스택(collapsed stack) 형식 텍스트
+            (한 줄에 "스레드;함수;...;함수 샘플수")
+
+        Raises:
+            ProfilerBusyError: 이미 다른 프로파일링이 진행 중인 경우
+        """
+        with self._exclusive():
+            sampler_id = threading.get_ident()
+            thread_names = {}
+            samples: Counter = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                thread_names.update({thread.ident: thread.name for thread in threading.enumerate()})
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == sampler_id:
+                        continue
+                    samples[(thread_names.get(thread_id, str(thread_id)),) + _collapse(frame)] += 1
+                time.sleep(interval)
+
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common())
+
+    def memory_snapshot(self, seconds: float) -> bytes:
+        """
+        주어진 시간 동안 메모리 할당을 추적한 뒤 tracemalloc 스냅샷을 만듭니다.
+
+        이미 추적 중이 아니었다면 이 시간 동안만 추적하므로, 스냅샷에는 수집 중에 할당되어
+        아직 해제되지 않은 메모리만 포함됩니다.
+
+        Args:
+            seconds: 수집 시간(초)
+
+        Returns:
+            tracemalloc.Snapshot.load로 읽을 수 있는 스냅샷 파일 내용
+
+        Raises:
+            ProfilerBusyError: 이미 다른 프로파일링이 진행 중인 경우
+        """
+        with self._exclusive():
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(25)
+            try:
+                time.sleep(seconds)
+                snapshot = tracemalloc.take_snapshot()
+            finally:
+                if started:
+                    tracemalloc.stop()
+
+        fd, path = tempfile.mkstemp(suffix=".tracemalloc")
+        os.close(fd)
+        try:
+            snapshot.dump(path)
+            with open(path, "rb") as snapshot_file:
+                return snapshot_file.read()
+        finally:
+            os.remove(path)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("이 워커에서 이미 프로파일링이 진행 중입니다.")
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+
+def _collapse(frame: Optional[object]) -> tuple:
+    """
+    프레임에서 시작하는 호출 스택을 바깥쪽 호출부터 "함수 (파일:정의된 줄)" 튜플로 만듭니다.
+    같은 함수의 샘플이 한 줄로 합쳐지도록 실행 중인 줄 대신 함수가 정의된 줄을 사용합니다.
+    """
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+# 서비스의 기본 인스턴스 생성
+profiling_service = ProfilingService()
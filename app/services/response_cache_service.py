@@ -0,0 +1,265 @@
+"""
+ChatGPT 응답 캐시 서비스.
+정규화된 질문의 정확 일치와 문자 n-gram 유사도로 비슷한 질문의 응답을 재사용합니다.
+정확히 일치하는 응답은 워커 간 공유 캐시에도 저장하여 다른 워커가 저장한 응답도 재사용합니다.
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.shared_cache_service import shared_cache_service
+
+# 숫자 (3월과 4월처럼 숫자만 다른 질문은 n-gram 유사도가 높아도 다른 질문)
+_NUMBER = re.compile(r"\d+")
+
+# 부정 표현 (안, 못, 않다, 없다, 아니다 등이 더해지면 뜻이 반대가 됨)
+_NEGATION = re.compile(r"(?:^|\s)(?:안|못)(?=\s)|않|없|아니|\b(?:not|no|never)\b|n't")
+
+
+def normalize_korean_text(text: str) -> str:
+    """
+    띄어쓰기, 문장 부호, 전각/반각, 대소문자 차이를 없애 비교용 문자열로 만듭니다.
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        정규화된 텍스트
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return re.sub(r"[\W_]+", "", text)
+
+
+def _meaning_guard(text: str) -> Tuple[Tuple[str, ...], int]:
+    """
+    유사한 질문으로 인정하려면 정확히 같아야 하는 부분(숫자, 부정 표현 수)을 추출합니다.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return tuple(_NUMBER.findall(text)), len(_NEGATION.findall(text))
+
+
+class _CacheEntry:
+    """
+    캐시 항목.
+    """
+
+    def __init__(self, key: str, response: str, grams: Set[str], guard: Tuple[Tuple[str, ...], int], expires_at: float):
+        self.key = key
+        self.response = response
+        self.grams = grams
+        self.guard = guard
+        self.expires_at = expires_at
+
+
+class ResponseCacheService:
+    """
+    ChatGPT 응답 캐시.
+
+    정규화된 질문으로 먼저 정확히 일치하는 항목을 찾고(이 워커, 다음으로 공유 캐시), 없으면 문자 n-gram
+    역색인으로 후보를 모아 Dice 유사도가 임계값 이상인 가장 비슷한 질문의 응답을 반환합니다.
+    숫자나 부정 표현이 다른 질문은 유사도가 높아도 다른 질문으로 봅니다.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = settings.CHAT_CACHE_MAX_ENTRIES,
+            ttl_seconds: int = settings.CHAT_CACHE_TTL_SECONDS,
+            similarity_threshold: float = settings.CHAT_CACHE_SIMILARITY_THRESHOLD,
+            ngram_size: int = settings.CHAT_CACHE_NGRAM_SIZE
+    ):
+        """
+        캐시 크기, 유효 시간, 유사도 임계값, n-gram 크기로 서비스를 초기화합니다.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+
+        self._lock = threading.Lock()
+        # 정규화된 질문 -> 항목 (오래 사용되지 않은 순서)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # n-gram -> 해당 n-gram을 포함하는 정규화된 질문들
+        self._index: Dict[str, Set[str]] = {}
+
+        self._exact_hits = 0
+        self._shared_hits = 0
+        self._fuzzy_hits = 0
+        self._misses = 0
+
+    def get(self, text: str) -> Optional[str]:
+        """
+        질문에 대한 캐시된 응답을 찾습니다.
+
+        Args:
+            text: 질문 텍스트
+
+        Returns:
+            캐시된 응답, 없으면 None
+        """
+        key = normalize_korean_text(text)
+        if not key:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._exact_hits += 1
+                return entry.response
+
+        guard = _meaning_guard(text)
+        # 다른 워커가 저장한 응답 (파일 I/O이므로 잠금 밖에서 조회)
+        shared_entry = shared_cache_service.get_with_expiry("chat", key)
+        if shared_entry is not None:
+            response = shared_entry[0].decode("utf-8")
+            with self._lock:
+                self._insert(key, response, guard, shared_entry[1])
+                self._shared_hits += 1
+            return response
+
+        with self._lock:
+            entry = self._find_similar(key, guard, time.time())
+            if entry is not None:
+                self._entries.move_to_end(entry.key)
+                self._fuzzy_hits += 1
+                return entry.response
+
+            self._misses += 1
+            return None
+
+    def contains(self, text: str) -> bool:
+        """
+        이 워커 또는 공유 캐시에 질문과 정확히 일치하는 응답이 있는지 확인합니다. (적중률 통계에는 반영하지 않음)
+        공유 캐시에만 있으면 이 워커의 캐시에도 저장합니다.
+
+        Args:
+            text: 질문 텍스트
+
+        Returns:
+            응답이 있으면 True
+        """
+        key = normalize_korean_text(text)
+        if not key:
+            return False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                return True
+
+        shared_entry = shared_cache_service.get_with_expiry("chat", key)
+        if shared_entry is None:
+            return False
+        with self._lock:
+            self._insert(key, shared_entry[0].decode("utf-8"), _meaning_guard(text), shared_entry[1])
+        return True
+
+    def put(self, text: str, response: str) -> None:
+        """
+        질문과 응답을 캐시에 저장합니다.
+
+        Args:
+            text: 질문 텍스트
+            response: 응답 텍스트
+        """
+        key = normalize_korean_text(text)
+        if not key:
+            return
+
+        with self._lock:
+            self._insert(key, response, _meaning_guard(text))
+        shared_cache_service.put("chat", key, response.encode("utf-8"), self.ttl_seconds)
+
+    def clear(self) -> None:
+        """
+        캐시(공유 캐시의 응답 포함)와 통계를 모두 비웁니다.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self._exact_hits = self._shared_hits = self._fuzzy_hits = self._misses = 0
+        shared_cache_service.delete("chat")
+
+    def stats(self) -> dict:
+        """
+        캐시 크기와 적중률 통계를 반환합니다.
+        """
+        with self._lock:
+            hits = self._exact_hits + self._shared_hits + self._fuzzy_hits
+            lookups = hits + self._misses
+            return {
+                "enabled": settings.CHAT_CACHE_ENABLED,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "exact_hits": self._exact_hits,
+                "shared_hits": self._shared_hits,
+                "fuzzy_hits": self._fuzzy_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _find_similar(self, key: str, guard: Tuple[Tuple[str, ...], int], now: float) -> Optional[_CacheEntry]:
+        """
+        n-gram 역색인으로 유사도가 임계값 이상이고 숫자와 부정 표현이 같은 가장 비슷한 항목을 찾습니다.
+        """
+        grams = self._ngrams(key)
+        shared_counts: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._index.get(gram, ()):
+                shared_counts[candidate] = shared_counts.get(candidate, 0) + 1
+
+        best_entry = None
+        best_score = self.similarity_threshold
+        for candidate, shared in shared_counts.items():
+            entry = self._entries[candidate]
+            if entry.expires_at <= now or entry.guard != guard:
+                continue
+            score = 2 * shared / (len(grams) + len(entry.grams))
+            if score >= best_score:
+                best_entry, best_score = entry, score
+        return best_entry
+
+    def _insert(
+            self,
+            key: str,
+            response: str,
+            guard: Tuple[Tuple[str, ...], int],
+            expires_at: Optional[float] = None
+    ) -> None:
+        """
+        항목을 저장하고 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목을 제거합니다. (잠금을 얻은 상태에서 호출)
+        공유 캐시에서 가져온 항목은 원래 만료 시각을 유지하여 유효 시간이 늘어나지 않게 합니다.
+        """
+        if key in self._entries:
+            self._remove(key)
+        grams = self._ngrams(key)
+        now = time.time()
+        expires_at = min(expires_at, now + self.ttl_seconds) if expires_at is not None else now + self.ttl_seconds
+        self._entries[key] = _CacheEntry(key, response, grams, guard, expires_at)
+        for gram in grams:
+            self._index.setdefault(gram, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _ngrams(self, key: str) -> Set[str]:
+        if len(key) <= self.ngram_size:
+            return {key}
+        return {key[i:i + self.ngram_size] for i in range(len(key) - self.ngram_size + 1)}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for gram in entry.grams:
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+
+# 서비스의 기본 인스턴스 생성
+response_cache_service = ResponseCacheService()
@@ -0,0 +1,243 @@
+"""
+같은 호스트의 모든 워커 프로세스가 함께 사용하는 캐시 서비스.
+
+프로세스 메모리 캐시는 워커마다 따로 채워야 하므로 워커를 늘릴수록 적중률이 떨어집니다.
+이 캐시는 WAL 모드의 SQLite 파일 하나에 저장하므로 한 워커가 저장한 항목을 다른 워커가 바로 읽을 수 있고,
+읽기는 쓰기와 동시에 진행됩니다. 전체 크기가 SHARED_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 읽을 때마다 최근 사용 시각을 쓰면 읽기도 쓰기 잠금을 기다려야 하므로, 이 시간이 지난 항목만 갱신
+_ACCESS_UPDATE_INTERVAL_SECONDS = 60
+# 용량을 넘으면 최대 용량의 이 비율까지 줄임 (저장할 때마다 제거하지 않도록)
+_EVICTION_TARGET_RATIO = 0.9
+
+# 여러 워커가 동시에 처음 연결해도 스키마가 한 번에 만들어지도록 하나의 트랜잭션으로 실행
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    UNIQUE (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), total_bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage (id, total_bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE usage SET total_bytes = total_bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE usage SET total_bytes = total_bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE usage SET total_bytes = total_bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+COMMIT;
+"""
+
+
+class SharedCacheService:
+    """
+    워커 간 공유 캐시.
+
+    항목은 (namespace, key)로 구분하며 값은 바이트입니다. (예: "chat" 정규화된 질문 -> 응답 텍스트)
+    캐시 오류는 요청을 실패시키지 않도록 경고 로그를 남기고 캐시에 없는 것으로 처리합니다.
+    """
+
+    def __init__(self, file_path: str = settings.SHARED_CACHE_FILE, max_bytes: int = settings.SHARED_CACHE_MAX_BYTES):
+        """
+        캐시 파일 경로와 최대 용량으로 서비스를 초기화합니다.
+        """
+        self.file_path = Path(file_path)
+        self.max_bytes = max_bytes
+        # 연결은 스레드마다 따로 사용 (sqlite3 연결은 스레드 간에 공유하지 않음)
+        self._local = threading.local()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """
+        항목을 가져옵니다.
+
+        Args:
+            namespace: 항목 종류 (예: "chat", "stt")
+            key: 항목 키
+
+        Returns:
+            저장된 값, 없거나 만료되었으면 None
+        """
+        entry = self.get_with_expiry(namespace, key)
+        return entry[0] if entry is not None else None
+
+    def get_with_expiry(self, namespace: str, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        """
+        항목을 만료 시각과 함께 가져옵니다. (다른 캐시로 옮길 때 유효 시간을 늘리지 않도록 사용)
+
+        Args:
+            namespace: 항목 종류 (예: "chat", "stt")
+            key: 항목 키
+
+        Returns:
+            (값, 만료 시각) 튜플 (만료 시각이 없으면 None), 없거나 만료되었으면 None
+        """
+        if not settings.SHARED_CACHE_ENABLED:
+            return None
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] <= now):
+                metrics.increment("shared_cache_total", namespace=namespace, result="miss")
+                return None
+            if now - row[2] >= _ACCESS_UPDATE_INTERVAL_SECONDS:
+                connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key))
+        except sqlite3.Error as e:
+            logger.warning(f"공유 캐시 조회 중 오류 발생: {str(e)}")
+            metrics.increment("shared_cache_total", namespace=namespace, result="error")
+            return None
+        metrics.increment("shared_cache_total", namespace=namespace, result="hit")
+        return row[0], row[1]
+
+    def put(self, namespace: str, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        """
+        항목을 저장하고, 전체 크기가 최대 용량을 넘으면 오래 사용되지 않은 항목을 제거합니다.
+
+        Args:
+            namespace: 항목 종류
+            key: 항목 키
+            value: 저장할 값
+            ttl_seconds: 유효 시간(초), 없으면 용량 초과로 제거될 때까지 유지
+        """
+        if not settings.SHARED_CACHE_ENABLED or len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        try:
+            connection = self._connection()
+            with _write_transaction(connection):
+                connection.execute(
+                    "INSERT INTO entries (namespace, key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                    (namespace, key, value, len(value), expires_at, now)
+                )
+                self._evict_if_needed(connection, now)
+        except sqlite3.Error as e:
+            logger.warning(f"공유 캐시 저장 중 오류 발생: {str(e)}")
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """
+        항목을 삭제합니다. key가 없으면 namespace의 모든 항목을 삭제합니다.
+        """
+        try:
+            connection = self._connection()
+            with _write_transaction(connection):
+                if key is None:
+                    connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+                else:
+                    connection.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error as e:
+            logger.warning(f"공유 캐시 삭제 중 오류 발생: {str(e)}")
+
+    def stats(self) -> dict:
+        """
+        항목 수와 사용 중인 크기를 반환합니다.
+        """
+        connection = self._connection()
+        namespaces = {
+            namespace: {"entries": count, "bytes": size}
+            for namespace, count, size in connection.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace")
+        }
+        total_bytes = connection.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+        return {
+            "enabled": settings.SHARED_CACHE_ENABLED,
+            "file": str(self.file_path),
+            "entries": sum(namespace["entries"] for namespace in namespaces.values()),
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": namespaces
+        }
+
+    def _evict_if_needed(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        전체 크기가 최대 용량을 넘으면 만료된 항목, 그다음 가장 오래 사용되지 않은 항목 순으로 제거합니다.
+        """
+        total_bytes = connection.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+
+        evicted = connection.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+        total_bytes = connection.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+        excess = total_bytes - int(self.max_bytes * _EVICTION_TARGET_RATIO)
+        victims = []
+        for entry_id, size in connection.execute("SELECT id, size FROM entries ORDER BY accessed_at"):
+            if excess <= 0:
+                break
+            victims.append((entry_id,))
+            excess -= size
+        connection.executemany("DELETE FROM entries WHERE id = ?", victims)
+        evicted += len(victims)
+        total_bytes = connection.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+        metrics.increment("shared_cache_evicted_total", evicted)
+        logger.info(f"공유 캐시 용량 초과로 {evicted}개 항목을 제거했습니다. 현재 크기: {total_bytes} bytes")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 연결을 가져옵니다. 처음 사용하면 파일과 스키마를 만듭니다.
+        """
+        connection = getattr(self._local, "connection", None)
+        # 포크된 프로세스에서는 부모의 연결을 사용하지 않음
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        # 트랜잭션은 직접 관리 (isolation_level=None)
+        connection = sqlite3.connect(self.file_path, timeout=settings.SHARED_CACHE_BUSY_TIMEOUT_SECONDS,
+                                     isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL 모드에서는 NORMAL로도 손상되지 않으며, 전원 장애 시 마지막 쓰기만 잃을 수 있음 (캐시이므로 허용)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """
+    쓰기 잠금을 바로 얻는 트랜잭션 (BEGIN IMMEDIATE). 읽은 뒤 쓰기로 바꾸다 교착되는 것을 피합니다.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+# 서비스의 기본 인스턴스 생성
+shared_cache_service = SharedCacheService()
@@ -1,19 +1,49 @@
 """
 OpenAI API를 사용한 음성-텍스트 변환 서비스.
 """
+import asyncio
+import contextvars
+import hashlib
+import logging
+import math
 import os
+import re
 import tempfile
 import mimetypes
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import requests
 from fastapi import UploadFile
-from openai import OpenAI
+from openai import APITimeoutError, OpenAI
 
+from app.core.cancellation import CancellationToken, OperationCancelled, raise_if_cancelled
+from app.core.circuit_breaker import circuit_breakers
 from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+from app.core.scheduler import upstream_scheduler
+from app.models.speech_to_text import TranscriptionResult
+from app.services.audio_processing import audio_segment_to_samples, detect_speech_regions, compact_silence, \
+    normalize_for_speech, split_at_silence
+from app.services.shared_cache_service import shared_cache_service
+from app.services.usage_ledger_service import usage_ledger_service
 
 from pydub import AudioSegment
 
+logger = logging.getLogger(__name__)
+
+# OpenAI 음성 변환 API가 받을 수 있는 오디오 파일 확장자
+SUPPORTED_AUDIO_EXTENSIONS = (".flac", ".m4a", ".mp3", ".mp4", ".mpeg", ".mpga", ".oga", ".ogg", ".wav", ".webm")
+
+# 구간 경계의 중복으로 인정할 최소 단어 수 (한 단어는 우연히 같은 경우가 많음)
+_MIN_OVERLAP_WORDS = 2
+
+# 겹치는 구간에 들어갈 수 있는 최대 단어 수를 정할 때 사용하는 초당 단어 수 상한
+_MAX_WORDS_PER_SECOND = 4
+
+
 class SpeechToTextService:
     """
     음성-텍스트 변환 서비스.
@@ -41,34 +71,330 @@ class SpeechToTextService:
         audio.export(output_path, format="mp3")
         return output_path
 
-    def _transcribe_with_openai(self, file_path: str) -> str:
+    def _transcribe_with_openai(
+            self,
+            file_path: str,
+            cancel_token: Optional[CancellationToken] = None,
+            timeout: Optional[float] = None,
+            deadline: Optional[Deadline] = None
+    ) -> str:
         """
-        OpenAI를 사용하여 파일에서 텍스트를 추출합니다.
+        OpenAI를 사용하여 파일에서 텍스트를 추출합니다. 요청이 이미 취소되었으면 호출하지 않습니다.
+        timeout이 주어지면 재시도하지 않으며, 호출 자리를 기다리는 동안 deadline이 지나면 중단합니다.
         """
-        with open(file_path, "rb") as audio_file:
-            transcript = self.client.audio.transcriptions.create(
+        if cancel_token is not None and cancel_token.cancelled:
+            metrics.increment("upstream_cancelled_total", operation="stt_upload")
+            cancel_token.raise_if_cancelled()
+
+        client = self.client.with_options(timeout=timeout, max_retries=0) if timeout else self.client
+        with open(file_path, "rb") as audio_file, upstream_scheduler.slot("openai", "stt", cancel_token, deadline), \
+                circuit_breakers.get("openai_stt").guard(), \
+                usage_ledger_service.track("openai", "stt", self.model,
+                                           audio_bytes=os.path.getsize(file_path)) as usage:
+            transcript = client.audio.transcriptions.create(
                 model=self.model,
                 file=audio_file
             )
+            # whisper는 오디오 길이, gpt-4o 계열은 토큰 수로 사용량을 반환
+            if getattr(transcript, "usage", None) is not None:
+                if transcript.usage.type == "duration":
+                    usage["audio_seconds"] = transcript.usage.seconds
+                else:
+                    usage.update(input_tokens=transcript.usage.input_tokens,
+                                 output_tokens=transcript.usage.output_tokens)
         return transcript.text
 
-    def speech_to_text(self, audio_url: str) -> str:
+    def _transcribe_file(
+            self,
+            file_path: str,
+            ext: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> TranscriptionResult:
+        """
+        오디오 파일을 필요에 따라 전처리한 뒤 텍스트로 변환합니다.
+
+        전처리 결과 음성이 전혀 없으면 OpenAI를 호출하지 않고 빈 텍스트를 반환하며,
+        긴 오디오는 여러 구간으로 나누어 동시에 변환한 뒤 순서대로 이어 붙입니다.
+
+        Args:
+            file_path: 변환할 오디오 파일 경로
+            ext: 파일 확장자(.mp3, .m4a 등)
+            cancel_token: 요청 취소 토큰 (취소되면 남은 구간을 업로드하지 않음)
+            deadline: 요청 처리 제한 시간 (전처리 후 남은 stt 단계 시간을 업로드 timeout으로 사용)
+
+        Returns:
+            변환 결과
+
+        Raises:
+            DeadlineExceeded: 제한 시간 안에 변환을 끝낼 수 없는 경우
+        """
+        upload_paths, removed_seconds = self._prepare_upload_files(file_path, ext)
+        if not upload_paths:
+            logger.info(f"음성이 검출되지 않아 변환을 건너뜁니다. 제거된 무음: {removed_seconds}초")
+            return TranscriptionResult(text="", silence_removed_seconds=removed_seconds, uploaded_bytes=0)
+
+        try:
+            timeout = deadline.stage_timeout("stt") if deadline is not None else None
+            uploaded_bytes = sum(os.path.getsize(path) for path in upload_paths)
+            if len(upload_paths) == 1:
+                text = self._transcribe_with_openai(upload_paths[0], cancel_token, timeout, deadline)
+            else:
+                # 한 요청이 제공자의 호출 자리를 모두 차지하지 않도록 스케줄러가 허용하는 수 안에서 동시에 업로드
+                max_workers = max(1, min(len(upload_paths), settings.STT_CHUNK_MAX_CONCURRENCY,
+                                         upstream_scheduler.request_limit("openai")))
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt-chunk")
+                try:
+                    # 요청 우선순위가 구간 업로드 스레드에도 적용되도록 컨텍스트를 복사하여 실행
+                    futures = [
+                        executor.submit(contextvars.copy_context().run,
+                                        self._transcribe_with_openai, path, cancel_token, timeout, deadline)
+                        for path in upload_paths
+                    ]
+                    # 한 구간이라도 실패하면 나머지 구간을 기다리지 않고 바로 실패
+                    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        if future.exception() is not None:
+                            raise future.exception()
+                    texts = [future.result() for future in futures]
+                finally:
+                    # 실패하면 아직 시작하지 않은 구간은 업로드하지 않음
+                    executor.shutdown(wait=False, cancel_futures=True)
+                text = self._merge_chunk_transcripts(texts)
+                logger.info(f"{len(upload_paths)}개 구간으로 나누어 변환 완료")
+        except APITimeoutError:
+            if deadline is not None:
+                raise DeadlineExceeded("stt", deadline.remaining())
+            raise
+        finally:
+            self._remove_upload_files(upload_paths, file_path)
+
+        if removed_seconds is not None:
+            logger.info(f"무음 {removed_seconds}초 제거 후 변환 완료 (업로드 {uploaded_bytes} bytes)")
+        return TranscriptionResult(text=text, silence_removed_seconds=removed_seconds, uploaded_bytes=uploaded_bytes)
+
+    def _prepare_upload_files(self, file_path: str, ext: str) -> Tuple[List[str], Optional[float]]:
+        """
+        OpenAI에 업로드할 파일들을 준비합니다.
+
+        전처리가 필요 없으면 원본 파일(m4a는 mp3로 변환)을 그대로 사용하고,
+        필요하면 디코딩 후 무음 제거, 긴 오디오 분할, 정규화를 적용한 새 임시 파일들을 만듭니다.
+
+        Args:
+            file_path: 원본 오디오 파일 경로
+            ext: 파일 확장자(.mp3, .m4a 등)
+
+        Returns:
+            (upload_paths, silence_removed_seconds) 튜플
+            - upload_paths: 순서대로 업로드할 파일 경로 목록 (원본과 다른 파일은 호출자가 삭제해야 함, 음성이 없으면 빈 목록)
+            - silence_removed_seconds: 제거된 무음 길이(초) (무음 제거를 사용하지 않으면 None)
+        """
+        file_size = os.path.getsize(file_path)
+        may_need_chunking = file_size > settings.STT_UPLOAD_LIMIT_BYTES or (
+                settings.STT_CHUNKING_ENABLED and file_size >= settings.STT_CHUNK_MIN_FILE_BYTES)
+
+        if not (settings.STT_VAD_ENABLED or settings.STT_NORMALIZE_ENABLED or may_need_chunking):
+            return [self._original_upload_file(file_path, ext)], None
+
+        audio = AudioSegment.from_file(file_path, format=ext.lstrip(".") or None)
+        samples = audio_segment_to_samples(audio)
+        removed_seconds = None
+
+        if settings.STT_VAD_ENABLED:
+            regions = detect_speech_regions(
+                samples,
+                audio.frame_rate,
+                threshold_dbfs=settings.STT_VAD_THRESHOLD_DBFS,
+                min_silence_ms=settings.STT_VAD_MIN_SILENCE_MS,
+                min_speech_ms=settings.STT_VAD_MIN_SPEECH_MS,
+                padding_ms=settings.STT_VAD_PADDING_MS
+            )
+            if not regions:
+                return [], round(len(audio) / 1000, 2)
+
+            trimmed = compact_silence(audio, regions)
+            removed_seconds = round((len(audio) - len(trimmed)) / 1000, 2)
+            audio = trimmed
+            samples = audio_segment_to_samples(audio)
+
+        if may_need_chunking:
+            chunks = [
+                audio[start:end]
+                for start, end in split_at_silence(
+                    samples,
+                    audio.frame_rate,
+                    chunk_ms=settings.STT_CHUNK_SECONDS * 1000,
+                    overlap_ms=settings.STT_CHUNK_OVERLAP_SECONDS * 1000
+                )
+            ]
+        else:
+            chunks = [audio]
+
+        if len(chunks) == 1:
+            # 나눌 필요가 없고 다른 전처리도 없으면 다시 인코딩하지 않고 원본을 그대로 업로드
+            if not (settings.STT_VAD_ENABLED or settings.STT_NORMALIZE_ENABLED) \
+                    and file_size <= settings.STT_UPLOAD_LIMIT_BYTES:
+                return [self._original_upload_file(file_path, ext)], removed_seconds
+            return [self._export_for_upload(chunks[0])], removed_seconds
+
+        # 구간별 인코딩(ffmpeg 프로세스)도 동시에 수행
+        max_workers = max(1, min(len(chunks), settings.STT_CHUNK_MAX_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._export_for_upload, chunk) for chunk in chunks]
+        upload_paths = [future.result() for future in futures if future.exception() is None]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            self._remove_upload_files(upload_paths, file_path)
+            raise errors[0]
+        return upload_paths, removed_seconds
+
+    def _original_upload_file(self, file_path: str, ext: str) -> str:
+        """
+        전처리 없이 업로드할 파일 경로를 반환합니다. (m4a라면 mp3로 변환)
+        """
+        if ext == ".m4a":
+            return self._convert_m4a_to_mp3(file_path)
+        return file_path
+
+    def _remove_upload_files(self, upload_paths: List[str], original_path: str) -> None:
+        """
+        업로드를 위해 만든 임시 파일들을 삭제합니다.
+
+        Args:
+            upload_paths: 업로드 파일 경로 목록
+            original_path: 원본 파일 경로 (삭제하지 않음)
+        """
+        for path in upload_paths:
+            if path != original_path and os.path.exists(path):
+                os.remove(path)
+
+    def _merge_chunk_transcripts(self, texts: List[str], max_overlap_words: Optional[int] = None) -> str:
+        """
+        겹치는 구간으로 나누어 변환한 텍스트들을 순서대로 이어 붙입니다.
+        이전 구간의 끝과 다음 구간의 시작에서 _MIN_OVERLAP_WORDS개 이상 연속으로 중복된 단어들은 한 번만 남깁니다.
+
+        Args:
+            texts: 구간 순서대로 정렬된 변환 텍스트 목록
+            max_overlap_words: 중복으로 비교할 최대 단어 수 (없으면 STT_CHUNK_OVERLAP_SECONDS로 계산)
+
+        Returns:
+            이어 붙인 텍스트
+        """
+        def normalize(word: str) -> str:
+            return re.sub(r"[^\w]", "", word).lower()
+
+        if max_overlap_words is None:
+            max_overlap_words = max(_MIN_OVERLAP_WORDS,
+                                    math.ceil(settings.STT_CHUNK_OVERLAP_SECONDS * _MAX_WORDS_PER_SECOND))
+
+        merged: List[str] = []
+        for text in texts:
+            words = text.split()
+            if not words:
+                continue
+
+            merged_keys = [normalize(word) for word in merged[-max_overlap_words:]]
+            keys = [normalize(word) for word in words[:max_overlap_words + 1]]
+            drop = 0
+            # 가장 긴 중복부터 찾되, 경계에서 잘린 첫 단어 하나는 건너뛸 수 있음
+            for length in range(min(len(merged_keys), max_overlap_words), _MIN_OVERLAP_WORDS - 1, -1):
+                tail = merged_keys[-length:]
+                if keys[:length] == tail:
+                    drop = length
+                    break
+                if keys[1:length + 1] == tail:
+                    drop = length + 1
+                    break
+            merged.extend(words[drop:])
+
+        return " ".join(merged)
+
+    def _export_for_upload(self, audio: AudioSegment) -> str:
+        """
+        디코딩된 오디오를 업로드용 임시 파일로 저장합니다.
+        정규화 설정이 켜져 있으면 모노, 저샘플링, 음성용 코덱으로 인코딩합니다.
+
+        Args:
+            audio: 저장할 오디오
+
+        Returns:
+            저장된 임시 파일 경로
+        """
+        if not settings.STT_NORMALIZE_ENABLED:
+            output_path = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False).name
+            audio.export(output_path, format="mp3")
+            return output_path
+
+        output_path = tempfile.NamedTemporaryFile(suffix=f".{settings.STT_NORMALIZE_FORMAT}", delete=False).name
+        normalize_for_speech(audio, settings.STT_NORMALIZE_SAMPLE_RATE).export(
+            output_path,
+            format=settings.STT_NORMALIZE_FORMAT,
+            codec=settings.STT_NORMALIZE_CODEC or None,
+            bitrate=settings.STT_NORMALIZE_BITRATE or None
+        )
+        return output_path
+
+    def speech_to_text(
+            self,
+            audio_url: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> str:
         """
         오디오 URL에서 음성을 텍스트로 변환합니다.
 
         Args:
             audio_url: 텍스트로 변환할 오디오 파일의 URL
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
 
         Returns:
             변환된 텍스트
 
         Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 변환할 수 없는 경우
+            Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
+        """
+        return self.speech_to_text_detailed(audio_url, cancel_token, deadline).text
+
+    def speech_to_text_detailed(
+            self,
+            audio_url: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> TranscriptionResult:
+        """
+        오디오 URL에서 음성을 텍스트로 변환하고 전처리 정보와 함께 반환합니다.
+
+        Args:
+            audio_url: 텍스트로 변환할 오디오 파일의 URL
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간 (주어지면 다운로드도 STT 단계 배분 시간 안에서 끝나야 함)
+
+        Returns:
+            변환 결과
+
+        Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 변환할 수 없는 경우
             Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
         """
         try:
-            # URL에서 오디오 파일 다운로드
-            response = requests.get(audio_url)
+            raise_if_cancelled(cancel_token)
+
+            # URL에서 오디오 파일 다운로드 (응답이 느린 URL이 작업 스레드를 계속 붙잡지 않도록 제한 시간 적용)
+            download_timeout = settings.STT_DOWNLOAD_TIMEOUT_SECONDS
+            if deadline is not None:
+                download_timeout = min(download_timeout, deadline.stage_timeout("stt"))
+            try:
+                response = requests.get(audio_url, timeout=download_timeout)
+            except requests.Timeout:
+                if deadline is not None:
+                    raise DeadlineExceeded("stt", deadline.remaining())
+                raise
             response.raise_for_status()  # 오류 발생 시 예외 발생
+            raise_if_cancelled(cancel_token)
             
             # 파일 확장자 결정
             content_type = response.headers.get('Content-Type', '')
@@ -86,19 +412,15 @@ class SpeechToTextService:
                 temp_file.write(response.content)
 
             try:
-                # m4a라면 mp3로 변환
-                if ext == ".m4a":
-                    converted_path = self._convert_m4a_to_mp3(temp_file_path)
-                    os.remove(temp_file_path)
-                    temp_file_path = converted_path
-
                 # OpenAI API를 사용하여 음성을 텍스트로 변환
-                return self._transcribe_with_openai(temp_file_path)
+                return self._transcribe_file(temp_file_path, ext, cancel_token, deadline)
             finally:
                 # 임시 파일 삭제
                 if os.path.exists(temp_file_path):
                     os.remove(temp_file_path)
 
+        except OperationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"음성을 텍스트로 변환하는 중 오류 발생: {str(e)}")
 
@@ -112,35 +434,150 @@ class SpeechToTextService:
         Returns:
             변환된 텍스트
 
+        Raises:
+            Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
+        """
+        return (await self.speech_to_text_from_file_detailed(file)).text
+
+    async def speech_to_text_from_file_detailed(self, file: UploadFile) -> TranscriptionResult:
+        """
+        업로드된 오디오 파일에서 음성을 텍스트로 변환하고 전처리 정보와 함께 반환합니다.
+
+        Args:
+            file: 텍스트로 변환할 업로드된 오디오 파일
+
+        Returns:
+            변환 결과
+
         Raises:
             Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
         """
         try:
             # 파일 확장자 결정
-            ext = self._get_extension_from_filename(file.filename) or self._get_extension_from_content_type(file.content_type)
-            
-            # 임시 파일로 업로드된 오디오 저장
-            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as temp_file:
-                temp_file_path = temp_file.name
-                content = await file.read()
-                temp_file.write(content)
+            ext = self.get_upload_extension(file.filename, file.content_type)
+            content = await file.read()
+            # 디코딩과 OpenAI 호출은 이벤트 루프를 막지 않도록 스레드에서 실행
+            return await asyncio.to_thread(self._transcribe_bytes, content, ext)
+        except Exception as e:
+            raise Exception(f"업로드된 오디오를 텍스트로 변환하는 중 오류 발생: {str(e)}")
 
-            try:
-                # m4a라면 mp3로 변환
-                if ext == ".m4a":
-                    converted_path = self._convert_m4a_to_mp3(temp_file_path)
-                    os.remove(temp_file_path)
-                    temp_file_path = converted_path
+    def speech_to_text_from_path(self, file_path: str) -> TranscriptionResult:
+        """
+        로컬에 저장된 오디오 파일에서 음성을 텍스트로 변환합니다. (원본 파일은 삭제하지 않음)
 
-                # OpenAI API를 사용하여 음성을 텍스트로 변환
-                return self._transcribe_with_openai(temp_file_path)
-            finally:
-                # 임시 파일 삭제
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
+        Args:
+            file_path: 오디오 파일 경로 (확장자로 형식을 판단)
 
+        Returns:
+            변환 결과
+
+        Raises:
+            Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
+        """
+        try:
+            return self._transcribe_file(file_path, Path(file_path).suffix or ".mp3")
         except Exception as e:
-            raise Exception(f"업로드된 오디오를 텍스트로 변환하는 중 오류 발생: {str(e)}")
+            raise Exception(f"오디오 파일을 텍스트로 변환하는 중 오류 발생: {str(e)}")
+
+    def get_upload_extension(self, filename: Optional[str], content_type: Optional[str]) -> str:
+        """
+        업로드된 파일의 이름 또는 MIME 타입으로 파일 확장자를 결정합니다.
+
+        Args:
+            filename: 파일 이름
+            content_type: 파일의 MIME 타입
+
+        Returns:
+            파일 확장자(.mp3, .m4a 등)
+        """
+        return self._get_extension_from_filename(filename) or self._get_extension_from_content_type(content_type)
+
+    def get_stream_extension(self, audio_format: str) -> Optional[str]:
+        """
+        클라이언트가 알려 준 오디오 형식(webm, .ogg 등)을 파일 확장자로 바꿉니다.
+
+        Args:
+            audio_format: 오디오 형식 이름
+
+        Returns:
+            파일 확장자(.webm, .ogg 등), 지원하지 않는 형식이면 None
+        """
+        ext = "." + audio_format.strip().lower().lstrip(".")
+        return ext if ext in SUPPORTED_AUDIO_EXTENSIONS else None
+
+    def speech_to_text_from_bytes(
+            self,
+            content: bytes,
+            ext: str = ".mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> TranscriptionResult:
+        """
+        메모리에 있는 오디오 데이터에서 음성을 텍스트로 변환합니다.
+        같은 오디오를 변환한 결과가 워커 간 공유 캐시에 있으면 API를 호출하지 않고 재사용합니다.
+
+        Args:
+            content: 오디오 데이터
+            ext: 오디오 형식에 맞는 파일 확장자(.mp3, .webm 등)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
+
+        Returns:
+            변환 결과
+
+        Raises:
+            OperationCancelled: 요청이 취소된 경우
+            Exception: 오디오를 텍스트로 변환하는 중 오류가 발생한 경우
+        """
+        cache_key = self._cache_key(content, ext) if settings.STT_CACHE_TTL_SECONDS > 0 else None
+        if cache_key is not None:
+            cached = shared_cache_service.get("stt", cache_key)
+            if cached is not None:
+                return TranscriptionResult.model_validate_json(cached)
+
+        try:
+            result = self._transcribe_bytes(content, ext, cancel_token, deadline)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"오디오 데이터를 텍스트로 변환하는 중 오류 발생: {str(e)}")
+
+        if cache_key is not None:
+            shared_cache_service.put("stt", cache_key, result.model_dump_json().encode("utf-8"),
+                                     settings.STT_CACHE_TTL_SECONDS)
+        return result
+
+    def _cache_key(self, content: bytes, ext: str) -> str:
+        """
+        오디오 내용과 변환 결과에 영향을 주는 설정으로 캐시 키를 만듭니다.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{self.model}:{ext}:vad={settings.STT_VAD_ENABLED}:norm={settings.STT_NORMALIZE_ENABLED}:{digest}"
+
+    def _transcribe_bytes(
+            self,
+            content: bytes,
+            ext: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> TranscriptionResult:
+        """
+        오디오 데이터를 임시 파일로 저장한 뒤 텍스트로 변환합니다.
+        """
+        raise_if_cancelled(cancel_token)
+
+        # 임시 파일로 오디오 저장
+        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as temp_file:
+            temp_file_path = temp_file.name
+            temp_file.write(content)
+
+        try:
+            # OpenAI API를 사용하여 음성을 텍스트로 변환
+            return self._transcribe_file(temp_file_path, ext, cancel_token, deadline)
+        finally:
+            # 임시 파일 삭제
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
     
     def _get_extension_from_content_type(self, content_type: str) -> str:
         """
@@ -2,14 +2,80 @@
 텍스트-음성 변환 서비스.
 ElevenLabs 또는 OpenAI API를 사용하여 텍스트를 음성으로 변환합니다.
 """
+import asyncio
+import contextvars
+import logging
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import IO, Literal
+from typing import AsyncIterator, Callable, Dict, Generator, IO, Iterator, List, Literal, Optional, Tuple, TypeVar
 
+import httpx
 import openai
 from elevenlabs import VoiceSettings
 from elevenlabs.client import ElevenLabs
 
+from app.core.cancellation import CancellationToken, raise_if_cancelled
+from app.core.circuit_breaker import OPEN, CircuitOpenError, circuit_breakers
 from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+from app.core.scheduler import upstream_scheduler
+from app.services.audio_cache_service import audio_cache_service
+from app.services.audio_processing import mp3_audio_frames, mp3_duration_seconds
+from app.services.popularity_service import popularity_service
+from app.services.usage_ledger_service import usage_ledger_service, usage_scope
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 출력 형식별 미디어 타입, 확장자, 제공자별 형식 이름 (None이면 해당 제공자가 지원하지 않음)
+AUDIO_FORMATS: Dict[str, Dict[str, Optional[str]]] = {
+    "mp3": {
+        "media_type": "audio/mpeg",
+        "extension": "mp3",
+        "openai": "mp3",
+        "elevenlabs": "mp3_22050_32",
+    },
+    "opus": {
+        "media_type": "audio/ogg; codecs=opus",
+        "extension": "ogg",
+        "openai": "opus",
+        "elevenlabs": "opus_48000_32",
+    },
+    "aac": {
+        "media_type": "audio/aac",
+        "extension": "aac",
+        "openai": "aac",
+        "elevenlabs": None,
+    },
+    # 24kHz 16-bit signed little-endian 모노 PCM
+    "pcm": {
+        "media_type": "audio/pcm; rate=24000; channels=1",
+        "extension": "pcm",
+        "openai": "pcm",
+        "elevenlabs": "pcm_24000",
+    },
+}
+
+# 나누어 합성한 결과를 디코딩 없이 이어 붙일 수 있는 형식 (mp3는 프레임 단위, pcm은 그대로)
+_SPLICEABLE_FORMATS = ("mp3", "pcm")
+
+# 문장 끝 (문장 부호 뒤의 공백 또는 줄바꿈)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？…])\s+|\n+")
+
+# Accept 헤더의 미디어 타입과 출력 형식 매핑
+_ACCEPT_MEDIA_TYPES: Dict[str, str] = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/aac": "aac",
+    "audio/pcm": "pcm",
+    "audio/l16": "pcm",
+}
 
 
 class TextToSpeechService:
@@ -28,33 +94,498 @@ class TextToSpeechService:
         """
         self.elevenlabs_client = ElevenLabs(api_key=elevenlabs_api_key)
         self.openai_client = openai.OpenAI(api_key=openai_api_key)
+        # 제공자별 동시 호출 제한 (이벤트 루프에서 처음 사용할 때 생성)
+        self._provider_limits: Dict[str, asyncio.Semaphore] = {}
+        # (제공자, 출력 형식)별 안내 음성 (서버 시작 시 미리 합성)
+        self._acknowledgements: Dict[Tuple[str, str], bytes] = {}
 
     def text_to_speech_stream(
             self,
             text: str,
-            provider: Literal["elevenlabs", "openai"] = "openai"
+            provider: Literal["elevenlabs", "openai"] = "openai",
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
     ) -> IO[bytes]:
         """
         텍스트를 음성으로 변환하고 오디오 스트림을 반환합니다.
+        긴 텍스트는 문장 단위로 나누어 동시에 합성한 뒤 이어 붙입니다. (iter_speech_chunks 참고)
 
         Args:
             text: 음성으로 변환할 텍스트
             provider: 사용할 음성 제공자 ("elevenlabs" 또는 "openai")
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰 (취소되면 제공자 스트림을 닫고 중단)
+            deadline: 요청 처리 제한 시간 (tts 단계 시간을 API 호출 timeout으로 사용)
 
         Returns:
             오디오 데이터가 포함된 BytesIO 스트림
+
+        Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 합성을 끝낼 수 없는 경우
+            CircuitOpenError: 제공자의 회로가 열려 있는 경우
         """
-        if provider == "elevenlabs":
-            return self._elevenlabs_tts_stream(text)
-        else:
-            return self._openai_tts_stream(text)
+        return BytesIO(b"".join(self.iter_speech_chunks(text, provider, output_format, cancel_token, deadline)))
+
+    def iter_speech_chunks(
+            self,
+            text: str,
+            provider: Literal["elevenlabs", "openai"] = "openai",
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Iterator[bytes]:
+        """
+        텍스트를 음성으로 변환하여 재생 순서대로 오디오 조각을 냅니다.
+
+        TTS_CHUNK_MAX_CHARS보다 긴 텍스트(mp3, pcm 형식)는 문장 단위로 나누어 동시에 합성하고,
+        앞 조각의 합성이 끝나는 대로 냅니다. mp3 조각은 프레임 경계에 맞춰 태그와 정보 프레임을 제거하므로
+        모든 조각을 이어 붙이면 재인코딩 없이 하나의 오디오가 됩니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            provider: 사용할 음성 제공자 ("elevenlabs" 또는 "openai")
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
+
+        Returns:
+            오디오 조각을 내는 이터레이터
+
+        Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간 안에 합성을 끝낼 수 없는 경우
+            CircuitOpenError: 제공자의 회로가 열려 있는 경우
+        """
+        chunks = [text]
+        if settings.TTS_CHUNKING_ENABLED and output_format in _SPLICEABLE_FORMATS:
+            chunks = split_text_for_speech(text, settings.TTS_CHUNK_MAX_CHARS)
+        if len(chunks) == 1:
+            yield self._synthesize(text, provider, output_format, cancel_token, deadline)
+            return
+
+        metrics.increment("tts_chunked_total", provider=provider)
+        # 한 요청이 제공자의 호출 자리를 모두 차지하지 않도록 스케줄러가 허용하는 수 안에서 동시에 합성
+        max_workers = max(1, min(len(chunks), settings.TTS_CHUNK_MAX_CONCURRENCY,
+                                 upstream_scheduler.request_limit(provider)))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-chunk")
+        try:
+            # 요청 우선순위와 사용량 태그가 조각 합성 스레드에도 적용되도록 컨텍스트를 복사하여 실행
+            futures = [
+                executor.submit(contextvars.copy_context().run,
+                                self._synthesize, chunk, provider, output_format, cancel_token, deadline)
+                for chunk in chunks
+            ]
+            for future in futures:
+                audio = future.result()
+                yield mp3_audio_frames(audio) if output_format == "mp3" else audio
+        finally:
+            # 중간에 실패하거나 소비가 중단되면 아직 시작하지 않은 조각은 합성하지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _synthesize(
+            self,
+            text: str,
+            provider: Literal["elevenlabs", "openai"],
+            output_format: str,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline]
+    ) -> bytes:
+        """
+        텍스트 하나를 제공자 API 한 번으로 합성합니다.
+        """
+        raise_if_cancelled(cancel_token)
+        timeout = deadline.stage_timeout("tts") if deadline is not None else None
+        try:
+            model = settings.ELEVENLABS_MODEL_ID if provider == "elevenlabs" else settings.OPENAI_TTS_MODEL
+            with upstream_scheduler.slot(provider, "tts", cancel_token, deadline), \
+                    circuit_breakers.get(f"{provider}_tts").guard(), \
+                    usage_ledger_service.track(provider, "tts", model, characters=len(text)) as usage:
+                if provider == "elevenlabs":
+                    audio_stream = self._elevenlabs_tts_stream(text, output_format, cancel_token, deadline, timeout)
+                else:
+                    audio_stream = self._openai_tts_stream(text, output_format, cancel_token, deadline, timeout)
+                audio = audio_stream.getvalue()
+                usage.update(audio_bytes=len(audio), audio_seconds=_audio_duration_seconds(audio, output_format))
+                return audio
+        except (openai.APITimeoutError, httpx.TimeoutException):
+            if deadline is not None:
+                raise DeadlineExceeded("tts", deadline.remaining())
+            raise
+
+    def text_to_speech_cached(
+            self,
+            text: str,
+            provider: Literal["elevenlabs", "openai"] = "openai",
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Tuple[str, dict, bytes]:
+        """
+        텍스트를 음성으로 변환하되, 같은 요청으로 이미 합성된 오디오가 있으면 캐시에서 가져옵니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            provider: 사용할 음성 제공자 ("elevenlabs" 또는 "openai")
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간 (캐시에 없어 합성할 때만 사용)
+
+        Returns:
+            (audio_id, metadata, audio) 튜플
+            - audio_id: 오디오를 다시 가져올 때 사용할 ID
+              (제공자의 회로가 열려 다른 제공자로 합성한 경우 해당 제공자의 오디오 ID)
+            - metadata: etag, size 등을 담은 메타데이터
+            - audio: 오디오 데이터
+
+        Raises:
+            CircuitOpenError: 제공자의 회로가 열려 있고 대체할 제공자도 없는 경우
+        """
+        return self._with_provider_fallback(
+            text, provider, output_format,
+            lambda audio_id, _: (audio_id, *self.get_cached_audio(audio_id, cancel_token, deadline)))
+
+    def text_to_speech_cached_chunks(
+            self,
+            text: str,
+            provider: Literal["elevenlabs", "openai"] = "openai",
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Tuple[str, Optional[dict], Iterator[bytes]]:
+        """
+        text_to_speech_cached와 같지만, 캐시에 없으면 모두 합성될 때까지 기다리지 않고 합성되는 조각을 바로 냅니다.
+        마지막 조각까지 내면 이어 붙인 오디오를 캐시에 저장합니다.
+
+        첫 조각은 반환하기 전에 합성하므로 합성을 시작할 수 없는 오류(회로 열림 등)는 응답을 시작하기 전에 발생합니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            provider: 사용할 음성 제공자 ("elevenlabs" 또는 "openai")
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간 (캐시에 없어 합성할 때만 사용)
+
+        Returns:
+            (audio_id, metadata, chunks) 튜플
+            - audio_id: 오디오를 다시 가져올 때 사용할 ID
+            - metadata: 캐시에 있던 오디오의 메타데이터, 새로 합성하면 None (etag는 모두 합성한 뒤에 정해짐)
+            - chunks: 재생 순서대로 오디오 조각을 내는 이터레이터
+
+        Raises:
+            CircuitOpenError: 제공자의 회로가 열려 있고 대체할 제공자도 없는 경우
+        """
+        return self._with_provider_fallback(
+            text, provider, output_format,
+            lambda audio_id, used_provider: self._get_cached_chunks(
+                audio_id, text, used_provider, output_format, cancel_token, deadline))
+
+    def _with_provider_fallback(
+            self,
+            text: str,
+            provider: str,
+            output_format: str,
+            fetch: Callable[[str, str], T]
+    ) -> T:
+        """
+        요청을 등록하고 (오디오 ID, 제공자)로 fetch를 호출합니다. 제공자의 회로가 열려 있으면 대체 제공자로 다시 호출합니다.
+        """
+        popularity_service.record_tts(text, provider, output_format)
+        audio_id = audio_cache_service.register(text, provider, output_format)
+        try:
+            return fetch(audio_id, provider)
+        except CircuitOpenError:
+            fallback = self._get_fallback_provider(provider, output_format)
+            if fallback is None:
+                raise
+            logger.warning(f"{provider} 회로가 열려 있어 {fallback}(으)로 합성합니다.")
+            metrics.increment("tts_fallback_total", provider=provider, fallback=fallback)
+            # 다른 음성으로 합성한 오디오는 원래 제공자의 캐시 항목에 저장하지 않음
+            audio_id = audio_cache_service.register(text, fallback, output_format)
+            return fetch(audio_id, fallback)
+
+    def _get_cached_chunks(
+            self,
+            audio_id: str,
+            text: str,
+            provider: Literal["elevenlabs", "openai"],
+            output_format: str,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline]
+    ) -> Tuple[str, Optional[dict], Iterator[bytes]]:
+        """
+        캐시된 오디오가 있으면 한 조각으로 내고, 없으면 첫 조각을 합성한 뒤 나머지 조각을 내는 이터레이터를 반환합니다.
+        """
+        metadata = audio_cache_service.get_metadata(audio_id)
+        if metadata is not None and "etag" in metadata:
+            audio = audio_cache_service.read_audio(audio_id)
+            if audio is not None:
+                return audio_id, metadata, iter([audio])
+
+        chunks = self._synthesize_and_cache(audio_id, text, provider, output_format, cancel_token, deadline)
+        first = next(chunks)
+        return audio_id, None, _prepend_chunk(first, chunks)
+
+    def _synthesize_and_cache(
+            self,
+            audio_id: str,
+            text: str,
+            provider: Literal["elevenlabs", "openai"],
+            output_format: str,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline]
+    ) -> Iterator[bytes]:
+        """
+        합성되는 조각을 내고, 모든 조각을 합성하면 이어 붙인 오디오를 캐시에 저장합니다.
+        중간에 중단되면 일부만 합성한 오디오는 저장하지 않습니다.
+        """
+        parts = []
+        for chunk in self.iter_speech_chunks(text, provider, output_format, cancel_token, deadline):
+            parts.append(chunk)
+            yield chunk
+        audio_cache_service.put_audio(audio_id, b"".join(parts))
+
+    def _get_fallback_provider(self, provider: str, output_format: str) -> Optional[str]:
+        """
+        제공자의 회로가 열려 있을 때 대신 사용할 제공자를 결정합니다.
+
+        Returns:
+            대체 제공자, 대체할 수 없으면 None
+        """
+        if not settings.TTS_PROVIDER_FALLBACK_ENABLED:
+            return None
+        fallback = "openai" if provider == "elevenlabs" else "elevenlabs"
+        if fallback == "elevenlabs" and not settings.ELEVENLABS_API_KEY:
+            return None
+        if not AUDIO_FORMATS[output_format][fallback]:
+            return None
+        if circuit_breakers.get(f"{fallback}_tts").state == OPEN:
+            return None
+        return fallback
+
+    def get_cached_audio(
+            self,
+            audio_id: str,
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None
+    ) -> Tuple[Optional[dict], Optional[bytes]]:
+        """
+        등록된 오디오 ID의 오디오를 가져오고, 아직 합성되지 않았거나 캐시에서 제거되었으면 합성합니다.
+        취소되어 합성이 중단되면 일부만 받은 오디오는 캐시에 저장하지 않습니다.
+
+        Args:
+            audio_id: 오디오 ID
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
+
+        Returns:
+            (metadata, audio) 튜플, 등록되지 않은 ID이면 (None, None)
+        """
+        metadata = audio_cache_service.get_metadata(audio_id)
+        if metadata is None:
+            return None, None
+
+        if "etag" in metadata:
+            audio = audio_cache_service.read_audio(audio_id)
+            if audio is not None:
+                return metadata, audio
+
+        audio = self.text_to_speech_stream(
+            metadata["text"],
+            provider=metadata["provider"],
+            output_format=metadata["output_format"],
+            cancel_token=cancel_token,
+            deadline=deadline
+        ).getvalue()
+        return audio_cache_service.put_audio(audio_id, audio), audio
 
-    def _elevenlabs_tts_stream(self, text: str) -> IO[bytes]:
+    def preload_acknowledgement_audio(self) -> None:
+        """
+        응답을 기다리는 동안 먼저 보낼 안내 음성(ACK_AUDIO_TEXT)을 제공자와 형식(ACK_AUDIO_FORMATS)별로 미리 합성합니다.
+        합성된 오디오는 디스크 오디오 캐시에도 저장되므로 다른 워커는 캐시에서 읽습니다.
+        """
+        providers = ["openai"] + (["elevenlabs"] if settings.ELEVENLABS_API_KEY else [])
+        formats = [
+            output_format.strip() for output_format in settings.ACK_AUDIO_FORMATS.split(",")
+            if output_format.strip() in _SPLICEABLE_FORMATS
+        ]
+        for provider in providers:
+            for output_format in formats:
+                if not AUDIO_FORMATS[output_format][provider]:
+                    continue
+                try:
+                    audio_id = audio_cache_service.register(settings.ACK_AUDIO_TEXT, provider, output_format)
+                    with usage_scope("acknowledgement"):
+                        _, audio = self.get_cached_audio(audio_id)
+                except Exception as e:
+                    logger.warning(f"안내 음성 합성 실패 ({provider}, {output_format}): {str(e)}")
+                    continue
+                # 뒤에 이어 붙일 응답 음성까지 하나의 스트림으로 재생되도록 길이 정보(Xing 헤더 등)를 제거
+                self._acknowledgements[(provider, output_format)] = \
+                    mp3_audio_frames(audio) if output_format == "mp3" else audio
+        logger.info(f"안내 음성 {len(self._acknowledgements)}개를 준비했습니다.")
+
+    def get_acknowledgement_audio(self, provider: str, output_format: str) -> Optional[bytes]:
+        """
+        미리 합성된 안내 음성을 반환합니다. (요청 중에는 합성하지 않음)
+
+        Returns:
+            안내 음성, 준비되지 않았거나 응답 음성과 이어 붙일 수 없는 형식이면 None
+        """
+        if not settings.ACK_AUDIO_ENABLED:
+            return None
+        audio = self._acknowledgements.get((provider, output_format))
+        metrics.increment("ack_audio_total", provider=provider, result="sent" if audio is not None else "unavailable")
+        return audio
+
+    def negotiate_output_format(
+            self,
+            requested: Optional[str],
+            accept: Optional[str],
+            provider: Literal["elevenlabs", "openai"] = "openai"
+    ) -> Optional[str]:
+        """
+        요청된 형식(쿼리 파라미터)이나 Accept 헤더로부터 제공자가 지원하는 출력 형식을 결정합니다.
+
+        Args:
+            requested: 명시적으로 요청된 형식 (Accept 헤더보다 우선함)
+            accept: HTTP Accept 헤더 값
+            provider: 사용할 음성 제공자
+
+        Returns:
+            출력 형식 (AUDIO_FORMATS의 키), 요청한 오디오 형식을 지원할 수 없으면 None
+        """
+        if requested:
+            requested = requested.lower()
+            if requested in AUDIO_FORMATS and AUDIO_FORMATS[requested][provider]:
+                return requested
+            return None
+
+        if not accept:
+            return "mp3"
+
+        # q 값이 높은 순서대로 후보를 확인 (q=0은 제외)
+        candidates = []
+        for position, media_range in enumerate(accept.split(",")):
+            media_type, *params = [part.strip().lower() for part in media_range.split(";")]
+            quality = 1.0
+            for param in params:
+                if param.startswith("q="):
+                    try:
+                        quality = float(param[2:])
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                candidates.append((-quality, position, media_type))
+
+        for _, _, media_type in sorted(candidates):
+            if media_type in ("*/*", "audio/*"):
+                return "mp3"
+            output_format = _ACCEPT_MEDIA_TYPES.get(media_type)
+            if output_format and AUDIO_FORMATS[output_format][provider]:
+                return output_format
+
+        # 오디오 형식을 전혀 지정하지 않은 클라이언트(예: application/json)는 기존처럼 mp3로 응답
+        if not any(media_type.startswith("audio/") for _, _, media_type in candidates):
+            return "mp3"
+        return None
+
+    def get_media_type(self, output_format: str) -> str:
+        """
+        출력 형식에 맞는 미디어 타입을 반환합니다.
+        """
+        return AUDIO_FORMATS[output_format]["media_type"]
+
+    def get_file_extension(self, output_format: str) -> str:
+        """
+        출력 형식에 맞는 파일 확장자를 반환합니다.
+        """
+        return AUDIO_FORMATS[output_format]["extension"]
+
+    async def text_to_speech_batch(
+            self,
+            texts: List[str],
+            provider: Literal["elevenlabs", "openai"] = "openai",
+            output_format: str = "mp3"
+    ) -> AsyncIterator[Tuple[str, List[int], Optional[bytes], Optional[str]]]:
+        """
+        여러 텍스트를 병렬로 음성으로 변환하고, 완료되는 순서대로 결과를 반환합니다.
+
+        동일한 텍스트는 한 번만 변환되며, 제공자별 동시 호출 수 제한을 넘지 않습니다.
+
+        Args:
+            texts: 음성으로 변환할 텍스트 목록
+            provider: 사용할 음성 제공자 ("elevenlabs" 또는 "openai")
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+
+        Yields:
+            (text, indices, audio, error) 튜플
+            - text: 변환한 텍스트
+            - indices: 해당 텍스트가 나타난 원본 목록의 인덱스들
+            - audio: 오디오 데이터 (실패 시 None)
+            - error: 오류 메시지 (성공 시 None)
+        """
+        indices_by_text: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            indices_by_text.setdefault(text, []).append(index)
+
+        limit = self._get_provider_limit(provider)
+
+        async def synthesize(text: str) -> Tuple[str, Optional[bytes], Optional[str]]:
+            async with limit:
+                try:
+                    _, _, audio = await asyncio.to_thread(
+                        self.text_to_speech_cached, text, provider, output_format)
+                    return text, audio, None
+                except Exception as e:
+                    return text, None, str(e)
+
+        tasks = [asyncio.create_task(synthesize(text)) for text in indices_by_text]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                text, audio, error = await next_done
+                yield text, indices_by_text[text], audio, error
+        finally:
+            # 클라이언트가 연결을 끊은 경우 남은 작업 취소
+            for task in tasks:
+                task.cancel()
+
+    def _get_provider_limit(self, provider: str) -> asyncio.Semaphore:
+        """
+        제공자별 동시 호출 제한 세마포어를 가져옵니다.
+
+        Args:
+            provider: 음성 제공자
+
+        Returns:
+            해당 제공자의 세마포어
+        """
+        if provider not in self._provider_limits:
+            if provider == "elevenlabs":
+                max_concurrency = settings.TTS_ELEVENLABS_MAX_CONCURRENCY
+            else:
+                max_concurrency = settings.TTS_OPENAI_MAX_CONCURRENCY
+            self._provider_limits[provider] = asyncio.Semaphore(max(1, max_concurrency))
+        return self._provider_limits[provider]
+
+    def _elevenlabs_tts_stream(
+            self,
+            text: str,
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None,
+            timeout: Optional[float] = None
+    ) -> IO[bytes]:
         """
         ElevenLabs를 사용하여 텍스트를 음성으로 변환합니다.
 
         Args:
             text: 음성으로 변환할 텍스트
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
+            timeout: API 호출 제한 시간(초), 주어지면 재시도하지 않음
 
         Returns:
             오디오 데이터가 포함된 BytesIO 스트림
@@ -62,7 +593,7 @@ class TextToSpeechService:
         # 텍스트를 음성으로 변환 수행
         response = self.elevenlabs_client.text_to_speech.convert(
             voice_id=settings.ELEVENLABS_VOICE_ID,
-            output_format="mp3_22050_32",
+            output_format=AUDIO_FORMATS[output_format]["elevenlabs"],
             text=text,
             model_id=settings.ELEVENLABS_MODEL_ID,
             # 출력을 사용자 정의할 수 있는 선택적 음성 설정
@@ -73,15 +604,22 @@ class TextToSpeechService:
                 use_speaker_boost=True,
                 speed=1.0,
             ),
+            request_options={"timeout_in_seconds": math.ceil(timeout), "max_retries": 0} if timeout else None,
         )
 
         # 메모리에 오디오 데이터를 저장할 BytesIO 객체 생성
         audio_stream = BytesIO()
 
         # 각 오디오 데이터 청크를 스트림에 쓰기
-        for chunk in response:
-            if chunk:
-                audio_stream.write(chunk)
+        try:
+            for chunk in response:
+                self._check_stream(cancel_token, deadline, "elevenlabs")
+                if chunk:
+                    audio_stream.write(chunk)
+        finally:
+            # 중단된 경우 제공자 연결을 닫음
+            if hasattr(response, "close"):
+                response.close()
 
         # 스트림 위치를 처음으로 재설정
         audio_stream.seek(0)
@@ -89,38 +627,142 @@ class TextToSpeechService:
         # 추가 사용을 위해 스트림 반환
         return audio_stream
 
-    def _openai_tts_stream(self, text: str) -> IO[bytes]:
+    def _openai_tts_stream(
+            self,
+            text: str,
+            output_format: str = "mp3",
+            cancel_token: Optional[CancellationToken] = None,
+            deadline: Optional[Deadline] = None,
+            timeout: Optional[float] = None
+    ) -> IO[bytes]:
         """
         OpenAI API를 사용하여 텍스트를 음성으로 변환합니다.
 
         Args:
             text: 음성으로 변환할 텍스트
+            output_format: 출력 형식 (AUDIO_FORMATS의 키)
+            cancel_token: 요청 취소 토큰
+            deadline: 요청 처리 제한 시간
+            timeout: API 호출 제한 시간(초), 주어지면 재시도하지 않음
 
         Returns:
             오디오 데이터가 포함된 BytesIO 스트림
         """
-        # OpenAI의 TTS API를 호출하여 오디오 생성
-        response = self.openai_client.audio.speech.create(
-            model=settings.OPENAI_TTS_MODEL,
-            voice=settings.OPENAI_TTS_VOICE,
-            input=text,
-            response_format="mp3"
-        )
-
         # 메모리에 오디오 데이터를 저장할 BytesIO 객체 생성
         audio_stream = BytesIO()
 
-        # 응답에서 오디오 데이터를 스트림에 쓰기
-        for chunk in response.iter_bytes(chunk_size=4096):
-            if chunk:
-                audio_stream.write(chunk)
-                
+        client = self.openai_client.with_options(timeout=timeout, max_retries=0) if timeout else self.openai_client
+
+        # OpenAI의 TTS API를 호출하여 오디오를 스트림으로 받음 (중단되면 연결을 닫음)
+        with client.audio.speech.with_streaming_response.create(
+                model=settings.OPENAI_TTS_MODEL,
+                voice=settings.OPENAI_TTS_VOICE,
+                input=text,
+                response_format=AUDIO_FORMATS[output_format]["openai"]
+        ) as response:
+            # 응답에서 오디오 데이터를 스트림에 쓰기
+            for chunk in response.iter_bytes(chunk_size=4096):
+                self._check_stream(cancel_token, deadline, "openai")
+                if chunk:
+                    audio_stream.write(chunk)
+
         # 스트림 위치를 처음으로 재설정
         audio_stream.seek(0)
 
         # 추가 사용을 위해 스트림 반환
         return audio_stream
 
+    def _check_stream(
+            self,
+            cancel_token: Optional[CancellationToken],
+            deadline: Optional[Deadline],
+            provider: str
+    ) -> None:
+        """
+        합성 스트림을 받는 중에 요청이 취소되었거나 제한 시간이 지났으면 스트림을 중단합니다.
+
+        Raises:
+            OperationCancelled: 요청이 취소된 경우
+            DeadlineExceeded: 제한 시간이 지난 경우
+        """
+        if cancel_token is not None and cancel_token.cancelled:
+            metrics.increment("upstream_cancelled_total", operation="tts_stream", provider=provider)
+            cancel_token.raise_if_cancelled()
+        # httpx timeout은 청크 사이 대기 시간에만 적용되므로 전체 시간은 직접 확인
+        if deadline is not None and deadline.remaining() <= 0:
+            raise DeadlineExceeded("tts", deadline.remaining())
+
+
+def _prepend_chunk(first: bytes, rest: Generator[bytes, None, None]) -> Iterator[bytes]:
+    """
+    먼저 받은 조각을 내고 나머지 조각을 이어서 냅니다. 소비가 중단되면 나머지 이터레이터도 닫습니다.
+    """
+    try:
+        yield first
+        yield from rest
+    finally:
+        rest.close()
+
+
+def split_text_for_speech(text: str, max_chars: int) -> List[str]:
+    """
+    긴 텍스트를 음성 합성 단위로 나눕니다.
+
+    문장 경계에서 나누고, 최대 길이 안에서 이어지는 문장들을 한 조각으로 묶습니다.
+    최대 길이보다 긴 문장은 쉼표나 공백에서 나눕니다.
+
+    Args:
+        text: 나눌 텍스트
+        max_chars: 조각의 최대 문자 수
+
+    Returns:
+        순서대로 나눈 텍스트 조각 목록 (최대 길이 이하이면 원래 텍스트 하나)
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    sentences = []
+    for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = _find_break(sentence, max_chars)
+            sentences.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    chunks: List[str] = []
+    for sentence in sentences:
+        if chunks and len(chunks[-1]) + 1 + len(sentence) <= max_chars:
+            chunks[-1] += " " + sentence
+        else:
+            chunks.append(sentence)
+    return chunks or [text]
+
+
+def _find_break(sentence: str, max_chars: int) -> int:
+    """
+    최대 길이 안에서 문장을 자를 위치를 찾습니다. (쉼표 뒤, 없으면 공백, 둘 다 없으면 최대 길이)
+    """
+    window = sentence[:max_chars]
+    for separator in (", ", "，", " "):
+        position = window.rfind(separator)
+        if position > max_chars // 2:
+            return position + len(separator)
+    return max_chars
+
+
+def _audio_duration_seconds(audio: bytes, output_format: str) -> Optional[float]:
+    """
+    합성된 오디오의 재생 시간을 디코딩 없이 계산합니다. 계산할 수 없는 형식이면 None을 반환합니다.
+    """
+    if output_format == "pcm":
+        # 24kHz 16비트 모노
+        return len(audio) / (24000 * 2)
+    if output_format == "mp3":
+        return mp3_duration_seconds(audio)
+    return None
+
 
 # 서비스의 기본 인스턴스 생성
 text_to_speech_service = TextToSpeechService()
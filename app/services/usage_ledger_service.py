@@ -0,0 +1,246 @@
+"""
+외부 API 호출 사용량 기록 서비스.
+호출마다 토큰, 문자 수, 오디오 길이, 바이트 수, 소요 시간을 경로와 대화 스레드 ID와 함께
+로컬 CSV 원장에 덧붙여 기록하고, 경로별/스레드별로 합산합니다.
+"""
+import asyncio
+import csv
+import fcntl
+import io
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from app.core.cancellation import OperationCancelled
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FIELDS = (
+    "timestamp", "worker_pid", "route", "thread_id", "provider", "operation", "model", "status",
+    "input_tokens", "output_tokens", "characters", "audio_seconds", "audio_bytes", "latency_ms"
+)
+
+# 요청(또는 작업) 단위 태그. 같은 요청 안에서 스레드로 복사된 컨텍스트도 같은 dict를 공유하므로
+# Assistant 서비스가 새로 만든 스레드 ID를 이후의 TTS 호출 기록에서도 사용할 수 있습니다.
+usage_tags: ContextVar[Optional[Dict[str, Optional[str]]]] = ContextVar("usage_tags", default=None)
+
+
+@contextmanager
+def usage_scope(route: str, thread_id: Optional[str] = None) -> Iterator[None]:
+    """
+    블록 안의 외부 API 호출 기록에 사용할 경로와 스레드 ID를 지정합니다. (요청이 아닌 작업, 백그라운드 작업용)
+    """
+    token = usage_tags.set({"route": route, "thread_id": thread_id})
+    try:
+        yield
+    finally:
+        usage_tags.reset(token)
+
+
+def set_usage_thread_id(thread_id: Optional[str]) -> None:
+    """
+    현재 요청의 대화 스레드 ID를 지정합니다.
+    """
+    tags = usage_tags.get()
+    if tags is not None and thread_id:
+        tags["thread_id"] = thread_id
+
+
+class UsageLedgerService:
+    """
+    외부 API 사용량 원장.
+
+    기록은 메모리에 모았다가 주기적으로 CSV 파일에 덧붙이며, 파일이 USAGE_LEDGER_MAX_BYTES를 넘으면
+    ledger.csv.1, ledger.csv.2, ... 로 순환합니다. 여러 워커가 같은 파일을 쓰므로 잠금 파일로 쓰기를 직렬화합니다.
+    """
+
+    def __init__(self, file_path: str = settings.USAGE_LEDGER_FILE):
+        """
+        원장 파일 경로로 서비스를 초기화합니다.
+        """
+        self.file_path = Path(file_path)
+        self._lock = threading.Lock()
+        self._pending: List[dict] = []
+
+    @contextmanager
+    def track(self, provider: str, operation: str, model: str = "", **usage) -> Iterator[dict]:
+        """
+        외부 API 호출 하나의 소요 시간과 결과를 기록합니다.
+
+        블록 안에서 반환된 dict에 input_tokens, output_tokens, characters, audio_seconds, audio_bytes를
+        채우면 함께 기록됩니다.
+
+        Args:
+            provider: 제공자 (openai, elevenlabs)
+            operation: 호출 종류 (chat, assistant_run, stt, tts 등)
+            model: 사용한 모델
+            **usage: 호출 전에 알 수 있는 사용량 (예: characters)
+        """
+        if not settings.USAGE_LEDGER_ENABLED:
+            yield dict(usage)
+            return
+
+        started_at = time.monotonic()
+        status = "ok"
+        try:
+            yield usage
+        except OperationCancelled:
+            status = "cancelled"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self.record(provider, operation, model, status, time.monotonic() - started_at, **usage)
+
+    def record(
+            self,
+            provider: str,
+            operation: str,
+            model: str,
+            status: str,
+            latency_seconds: float,
+            input_tokens: int = 0,
+            output_tokens: int = 0,
+            characters: int = 0,
+            audio_seconds: Optional[float] = None,
+            audio_bytes: int = 0
+    ) -> None:
+        """
+        외부 API 호출 하나를 기록합니다. 경로와 스레드 ID는 현재 요청의 태그를 사용합니다.
+        """
+        tags = usage_tags.get() or {}
+        entry = {
+            "timestamp": round(time.time(), 3),
+            "worker_pid": os.getpid(),
+            "route": tags.get("route") or "",
+            "thread_id": tags.get("thread_id") or "",
+            "provider": provider,
+            "operation": operation,
+            "model": model,
+            "status": status,
+            "input_tokens": input_tokens or 0,
+            "output_tokens": output_tokens or 0,
+            "characters": characters or 0,
+            "audio_seconds": round(audio_seconds, 3) if audio_seconds is not None else "",
+            "audio_bytes": audio_bytes or 0,
+            "latency_ms": int(latency_seconds * 1000)
+        }
+        with self._lock:
+            self._pending.append(entry)
+
+    async def run_periodic_flush(self) -> None:
+        """
+        USAGE_LEDGER_FLUSH_INTERVAL_SECONDS마다 쌓인 기록을 파일에 저장합니다.
+        """
+        while True:
+            await asyncio.sleep(settings.USAGE_LEDGER_FLUSH_INTERVAL_SECONDS)
+            await asyncio.to_thread(self.flush)
+
+    def flush(self) -> None:
+        """
+        쌓인 기록을 원장 파일에 덧붙입니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=LEDGER_FIELDS)
+        writer.writerows(pending)
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._lock_path(), "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._rotate_if_needed()
+                    is_new = not self.file_path.exists() or self.file_path.stat().st_size == 0
+                    with open(self.file_path, "a", newline="", encoding="utf-8") as ledger_file:
+                        if is_new:
+                            ledger_file.write(",".join(LEDGER_FIELDS) + "\r\n")
+                        ledger_file.write(buffer.getvalue())
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except OSError as e:
+            logger.warning(f"사용량 원장 저장 중 오류 발생: {str(e)}")
+            # 다음 저장 때 다시 시도
+            with self._lock:
+                self._pending[:0] = pending
+
+    def summarize(self, group_by: str, since: Optional[float] = None, limit: int = 100) -> List[dict]:
+        """
+        원장 파일(순환된 파일 포함)과 아직 저장되지 않은 기록을 합산합니다.
+
+        Args:
+            group_by: 합산 기준 ("route" 또는 "thread_id")
+            since: 이 시각(Unix time) 이후의 기록만 합산
+            limit: 최대 그룹 수 (호출 수가 많은 순)
+
+        Returns:
+            그룹별 합계 목록
+        """
+        self.flush()
+        groups: Dict[str, dict] = {}
+        for row in self._read_rows():
+            try:
+                if since is not None and float(row["timestamp"]) < since:
+                    continue
+                key = row[group_by] or "(unknown)"
+                group = groups.setdefault(key, {
+                    "key": key, "calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0, "characters": 0,
+                    "audio_seconds": 0.0, "audio_bytes": 0, "latency_ms_total": 0, "latency_ms_max": 0
+                })
+                latency_ms = int(row["latency_ms"])
+                group["calls"] += 1
+                group["errors"] += row["status"] == "error"
+                group["input_tokens"] += int(row["input_tokens"])
+                group["output_tokens"] += int(row["output_tokens"])
+                group["characters"] += int(row["characters"])
+                group["audio_seconds"] += float(row["audio_seconds"] or 0)
+                group["audio_bytes"] += int(row["audio_bytes"])
+                group["latency_ms_total"] += latency_ms
+                group["latency_ms_max"] = max(group["latency_ms_max"], latency_ms)
+            except (KeyError, ValueError):
+                # 쓰다가 중단된 줄 등은 건너뜀
+                continue
+
+        ranked = sorted(groups.values(), key=lambda group: group["calls"], reverse=True)[:limit]
+        for group in ranked:
+            group["audio_seconds"] = round(group["audio_seconds"], 3)
+            group["latency_ms_avg"] = group.pop("latency_ms_total") // group["calls"]
+        return ranked
+
+    def _read_rows(self) -> Iterator[dict]:
+        paths = [self.file_path.with_name(f"{self.file_path.name}.{index}")
+                 for index in range(settings.USAGE_LEDGER_BACKUP_COUNT, 0, -1)] + [self.file_path]
+        for path in paths:
+            if not path.exists():
+                continue
+            with open(path, newline="", encoding="utf-8") as ledger_file:
+                yield from csv.DictReader(ledger_file)
+
+    def _rotate_if_needed(self) -> None:
+        if not self.file_path.exists() or self.file_path.stat().st_size < settings.USAGE_LEDGER_MAX_BYTES:
+            return
+        for index in range(settings.USAGE_LEDGER_BACKUP_COUNT - 1, 0, -1):
+            source = self.file_path.with_name(f"{self.file_path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.file_path.with_name(f"{self.file_path.name}.{index + 1}"))
+        if settings.USAGE_LEDGER_BACKUP_COUNT > 0:
+            os.replace(self.file_path, self.file_path.with_name(f"{self.file_path.name}.1"))
+        else:
+            self.file_path.unlink()
+
+    def _lock_path(self) -> Path:
+        return self.file_path.with_name(self.file_path.name + ".lock")
+
+
+# 서비스의 기본 인스턴스 생성
+usage_ledger_service = UsageLedgerService()
@@ -0,0 +1,141 @@
+"""
+서버 시작 시 캐시 예열 서비스.
+인기도 통계 상위 문구를 백그라운드에서 천천히 미리 합성/조회하여 배포 직후의 캐시 미스를 줄입니다.
+"""
+import asyncio
+import fcntl
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.scheduler import BULK, priority_scope
+from app.services.audio_cache_service import AudioCacheService, audio_cache_service
+from app.services.chatgpt_service import ChatGPTService, chatgpt_service
+from app.services.popularity_service import PopularityService, popularity_service
+from app.services.text_to_speech_service import TextToSpeechService, text_to_speech_service
+from app.services.usage_ledger_service import usage_scope
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """
+    캐시 예열 서비스.
+    """
+
+    def __init__(
+            self,
+            popularity: PopularityService = popularity_service,
+            audio_cache: AudioCacheService = audio_cache_service,
+            tts_service: TextToSpeechService = text_to_speech_service,
+            chat_service: ChatGPTService = chatgpt_service
+    ):
+        """
+        인기도 통계와 예열할 서비스들로 초기화합니다.
+        """
+        self.popularity = popularity
+        self.audio_cache = audio_cache
+        self.tts_service = tts_service
+        self.chat_service = chat_service
+        self._status = {
+            "state": "idle" if settings.WARMUP_ENABLED else "disabled",
+            "total": 0,
+            "completed": 0,
+            "skipped": 0,
+            "failed": 0,
+            "started_at": None,
+            "finished_at": None
+        }
+
+    def status(self) -> dict:
+        """
+        예열 진행 상황을 반환합니다.
+        """
+        return dict(self._status)
+
+    async def run(self) -> None:
+        """
+        인기 TTS 문구와 ChatGPT 질문을 WARMUP_RATE_PER_SECOND 속도로 예열합니다.
+
+        TTS 오디오 캐시(디스크)와 ChatGPT 응답 캐시(워커 간 공유 캐시)는 워커 간에 공유되므로
+        잠금을 얻은 한 워커만 예열하고, 이미 캐시에 있는 항목은 제공자를 호출하지 않고 건너뜁니다.
+        (워커가 재시작될 때마다 같은 항목을 다시 호출하지 않도록 함)
+        """
+        self._status.update(state="running", started_at=time.time())
+        try:
+            lock_file = self._try_acquire_lock()
+            try:
+                tts_items = await asyncio.to_thread(self.popularity.top_tts, settings.WARMUP_TTS_TOP_N) \
+                    if lock_file else []
+                chat_items = await asyncio.to_thread(self.popularity.top_chat, settings.WARMUP_CHAT_TOP_N) \
+                    if lock_file and settings.CHAT_CACHE_ENABLED else []
+                self._status["total"] = len(tts_items) + len(chat_items)
+
+                for text, provider, output_format in tts_items:
+                    await self._warm(self._warm_tts, text, provider, output_format)
+                for text in chat_items:
+                    await self._warm(self._warm_chat, text)
+            finally:
+                if lock_file:
+                    lock_file.close()
+
+            self._status["state"] = "completed"
+            logger.info(f"캐시 예열 완료: {self._status}")
+        except asyncio.CancelledError:
+            self._status["state"] = "cancelled"
+            raise
+        except Exception as e:
+            self._status["state"] = "failed"
+            logger.error(f"캐시 예열 중 오류 발생: {str(e)}")
+        finally:
+            self._status["finished_at"] = time.time()
+
+    async def _warm(self, warm_function, *args) -> None:
+        """
+        항목 하나를 예열하고, 제공자를 실제로 호출한 경우에만 속도 제한만큼 대기합니다.
+        """
+        try:
+            # 예열은 실시간 요청이 쓰고 남은 외부 API 호출 자리만 사용
+            with priority_scope(BULK), usage_scope("warmup"):
+                called_provider = await asyncio.to_thread(warm_function, *args)
+        except Exception as e:
+            self._status["failed"] += 1
+            logger.warning(f"캐시 예열 항목 처리 실패: {str(e)}")
+            called_provider = True
+        else:
+            self._status["completed" if called_provider else "skipped"] += 1
+
+        if called_provider and settings.WARMUP_RATE_PER_SECOND > 0:
+            await asyncio.sleep(1 / settings.WARMUP_RATE_PER_SECOND)
+
+    def _warm_tts(self, text: str, provider: str, output_format: str) -> bool:
+        audio_id = self.audio_cache.register(text, provider, output_format)
+        if "etag" in (self.audio_cache.get_metadata(audio_id) or {}):
+            return False
+        self.tts_service.get_cached_audio(audio_id)
+        return True
+
+    def _warm_chat(self, text: str) -> bool:
+        return self.chat_service.prefetch(text)
+
+    def _try_acquire_lock(self) -> Optional[object]:
+        """
+        예열을 맡을 워커를 정하기 위해 잠금 파일을 비차단으로 잠급니다.
+
+        Returns:
+            잠금에 성공하면 열린 잠금 파일 (닫으면 해제됨), 다른 워커가 이미 잠갔으면 None
+        """
+        lock_path = self.popularity.file_path.parent / "warmup.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+
+# 서비스의 기본 인스턴스 생성
+warmup_service = WarmupService()
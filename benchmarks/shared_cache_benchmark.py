@@ -0,0 +1,109 @@
+"""
+워커 간 공유 캐시(SQLite WAL) 조회 지연 시간 벤치마크.
+
+여러 프로세스가 같은 캐시 파일에 동시에 조회/저장할 때의 조회 지연 시간(p50/p99)과 처리량을 측정합니다.
+프로세스마다 따로 채우는 메모리 캐시(dict)와 비교하여 공유에 드는 비용을 확인할 수 있습니다.
+
+사용법:
+    python -m benchmarks.shared_cache_benchmark
+    python -m benchmarks.shared_cache_benchmark --processes 1 2 4 8 --write-ratio 0.1 --value-bytes 2048
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+
+def _worker(file_path: str, keys: int, operations: int, write_ratio: float, value_bytes: int, seed: int, queue):
+    # 부모 프로세스의 설정 대신 벤치마크 파일을 사용하도록 자식 프로세스에서 생성
+    from app.services.shared_cache_service import SharedCacheService
+
+    cache = SharedCacheService(file_path=file_path, max_bytes=1 << 40)
+    rng = random.Random(seed)
+    value = os.urandom(value_bytes)
+    latencies, hits = [], 0
+    started_at = time.perf_counter()
+    for _ in range(operations):
+        key = f"question-{rng.randrange(keys)}"
+        if rng.random() < write_ratio:
+            cache.put("benchmark", key, value)
+            continue
+        start = time.perf_counter()
+        hits += cache.get("benchmark", key) is not None
+        latencies.append(time.perf_counter() - start)
+    queue.put((latencies, hits, time.perf_counter() - started_at))
+
+
+def _percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def _measure_shared(processes: int, args) -> tuple:
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "cache.sqlite3")
+        queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_worker, args=(
+                file_path, args.keys, args.operations, args.write_ratio, args.value_bytes, index, queue))
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    latencies = [latency for result in results for latency in result[0]]
+    hits = sum(result[1] for result in results)
+    elapsed = max(result[2] for result in results)
+    return latencies, hits, processes * args.operations / elapsed
+
+
+def _measure_local(args) -> tuple:
+    # 프로세스마다 따로 채우는 기존 방식의 기준값 (한 프로세스 측정)
+    rng = random.Random(0)
+    value = os.urandom(args.value_bytes)
+    cache, latencies, hits = {}, [], 0
+    for _ in range(args.operations):
+        key = f"question-{rng.randrange(args.keys)}"
+        if rng.random() < args.write_ratio:
+            cache[key] = value
+            continue
+        start = time.perf_counter()
+        hits += cache.get(key) is not None
+        latencies.append(time.perf_counter() - start)
+    return latencies, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 간 공유 캐시 조회 지연 시간 벤치마크")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8], help="동시에 접근하는 프로세스 수")
+    parser.add_argument("--operations", type=int, default=5000, help="프로세스당 조회/저장 횟수")
+    parser.add_argument("--keys", type=int, default=2000, help="서로 다른 키의 수")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="저장 비율 (나머지는 조회)")
+    parser.add_argument("--value-bytes", type=int, default=2048, help="값 크기(바이트)")
+    args = parser.parse_args()
+
+    # 서비스 모듈을 불러올 때 API 키 없이도 설정을 만들 수 있도록 함
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark-offline")
+
+    header = f"{'mode':<14} {'procs':>5} {'lookups':>8} {'hit rate':>8} {'p50(us)':>9} {'p99(us)':>9} {'ops/s':>9}"
+    print(header)
+    print("-" * len(header))
+
+    latencies, hits = _measure_local(args)
+    print(f"{'local dict':<14} {1:>5} {len(latencies):>8} {hits / max(1, len(latencies)):>8.2%} "
+          f"{_percentile(latencies, 0.5) * 1e6:>9.1f} {_percentile(latencies, 0.99) * 1e6:>9.1f} {'-':>9}")
+
+    for processes in args.processes:
+        latencies, hits, throughput = _measure_shared(processes, args)
+        print(f"{'shared sqlite':<14} {processes:>5} {len(latencies):>8} {hits / max(1, len(latencies)):>8.2%} "
+              f"{_percentile(latencies, 0.5) * 1e6:>9.1f} {_percentile(latencies, 0.99) * 1e6:>9.1f} "
+              f"{throughput:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
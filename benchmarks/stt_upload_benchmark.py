@@ -0,0 +1,78 @@
+"""
+Whisper 업로드 정규화 벤치마크.
+
+기존 동작(원본 업로드, m4a는 기본 설정 mp3로 변환)과 정규화(모노, 16kHz, 음성용 코덱), 긴 오디오 분할 동작의
+업로드 크기와 전처리 시간을 비교합니다. --live 옵션을 주면 실제 OpenAI API를 호출하여
+전체 STT 지연 시간도 측정합니다.
+
+사용법:
+    python -m benchmarks.stt_upload_benchmark recording1.m4a recording2.mp3
+    python -m benchmarks.stt_upload_benchmark --live --repeat 3 recording.m4a
+"""
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+
+
+def _measure_prepare(service, file_path: str, ext: str):
+    start = time.perf_counter()
+    upload_paths, _ = service._prepare_upload_files(file_path, ext)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(path) for path in upload_paths)
+    service._remove_upload_files(upload_paths, file_path)
+    return size, elapsed
+
+
+def _measure_live(service, file_path: str, ext: str, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        service._transcribe_file(file_path, ext)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper 업로드 정규화 벤치마크")
+    parser.add_argument("files", nargs="+", help="측정할 오디오 파일")
+    parser.add_argument("--live", action="store_true", help="실제 OpenAI API를 호출하여 STT 지연 시간 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="--live 측정 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    if not args.live:
+        # 오프라인 측정에서는 API 키 없이도 서비스를 생성할 수 있도록 함
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark-offline")
+
+    from app.core.config import settings
+    from app.services.speech_to_text_service import SpeechToTextService
+
+    service = SpeechToTextService(api_key=os.environ["OPENAI_API_KEY"])
+    settings.STT_VAD_ENABLED = False
+
+    header = f"{'file':<30} {'mode':<11} {'bytes':>10} {'ratio':>7} {'prep(s)':>8}"
+    if args.live:
+        header += f" {'stt(s)':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for file_path in args.files:
+        ext = Path(file_path).suffix.lower()
+        baseline_size = None
+        # 기준값(current)은 분할 없이 원본을 업로드하는 경우
+        for mode, normalize, chunking in (("current", False, False), ("normalized", True, False),
+                                          ("chunked", False, True)):
+            settings.STT_NORMALIZE_ENABLED = normalize
+            settings.STT_CHUNKING_ENABLED = chunking
+            size, prep_seconds = _measure_prepare(service, file_path, ext)
+            baseline_size = baseline_size or size
+            row = (f"{Path(file_path).name[:30]:<30} {mode:<11} {size:>10} "
+                   f"{size / baseline_size:>7.2f} {prep_seconds:>8.3f}")
+            if args.live:
+                row += f" {_measure_live(service, file_path, ext, args.repeat):>8.3f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+긴 텍스트 TTS 분할 합성 벤치마크.
+
+여러 문단으로 된 텍스트를 한 번에 합성하는 기존 동작과, 문장 단위로 나누어 동시에 합성한 뒤
+MP3 프레임 경계에서 이어 붙이는 동작의 첫 오디오까지의 시간과 전체 합성 시간을 비교합니다.
+기본값은 글자 수에 비례하는 지연 시간을 흉내 내는 가짜 제공자를 사용하며, --live 옵션을 주면
+실제 OpenAI TTS API를 호출합니다.
+
+사용법:
+    python -m benchmarks.tts_chunking_benchmark
+    python -m benchmarks.tts_chunking_benchmark --paragraphs 2 4 8 --chunk-chars 200 300
+    python -m benchmarks.tts_chunking_benchmark --live --paragraphs 4
+"""
+import argparse
+import os
+import statistics
+import time
+from io import BytesIO
+
+_PARAGRAPH = (
+    "새길 서비스는 북한이탈주민의 정착을 돕기 위한 대화형 도우미입니다. "
+    "은행 계좌를 만들거나 병원 예약을 할 때 필요한 표현을 미리 연습할 수 있습니다. "
+    "처음에는 짧은 문장부터 시작하고, 익숙해지면 실제 상황과 비슷한 긴 대화를 이어 갑니다. "
+    "모르는 단어가 나오면 언제든지 다시 물어보세요, 천천히 설명해 드리겠습니다. "
+)
+
+# 24kHz 32kbps MPEG-2 Layer III 프레임 (24ms, 96바이트)
+_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC4]) + b"\x00" * 92
+
+
+def _fake_provider(base_seconds: float, seconds_per_char: float):
+    """
+    글자 수에 비례하는 시간이 걸리고, 읽는 데 글자당 약 0.1초인 길이의 MP3를 돌려주는 가짜 제공자.
+    """
+
+    def synthesize(text, output_format="mp3", cancel_token=None, deadline=None, timeout=None):
+        time.sleep(base_seconds + seconds_per_char * len(text))
+        return BytesIO(_FRAME * max(1, int(len(text) * 0.1 / 0.024)))
+
+    return synthesize
+
+
+def _measure(service, text: str, repeat: int):
+    first_audio, total = [], []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parts = []
+        for part in service.iter_speech_chunks(text):
+            if not parts:
+                first_audio.append(time.perf_counter() - start)
+            parts.append(part)
+        total.append(time.perf_counter() - start)
+        size = sum(len(part) for part in parts)
+    return statistics.median(first_audio), statistics.median(total), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="긴 텍스트 TTS 분할 합성 벤치마크")
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[1, 2, 4, 8], help="측정할 문단 수")
+    parser.add_argument("--chunk-chars", type=int, nargs="+", default=[300], help="조각 최대 문자 수 (TTS_CHUNK_MAX_CHARS)")
+    parser.add_argument("--concurrency", type=int, default=4, help="조각 동시 합성 수 (TTS_CHUNK_MAX_CONCURRENCY)")
+    parser.add_argument("--live", action="store_true", help="실제 OpenAI TTS API를 호출하여 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--base-ms", type=float, default=400, help="가짜 제공자의 호출당 기본 지연 시간(ms)")
+    parser.add_argument("--ms-per-char", type=float, default=6, help="가짜 제공자의 글자당 지연 시간(ms)")
+    args = parser.parse_args()
+
+    if not args.live:
+        # 오프라인 측정에서는 API 키 없이도 서비스를 생성할 수 있도록 함
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark-offline")
+
+    from app.core.config import settings
+    from app.services.audio_processing import mp3_duration_seconds
+    from app.services.text_to_speech_service import TextToSpeechService, split_text_for_speech
+
+    service = TextToSpeechService(openai_api_key=os.environ["OPENAI_API_KEY"])
+    if not args.live:
+        service._openai_tts_stream = _fake_provider(args.base_ms / 1000, args.ms_per_char / 1000)
+    settings.USAGE_LEDGER_ENABLED = False
+    settings.TTS_CHUNK_MAX_CONCURRENCY = args.concurrency
+
+    header = (f"{'paragraphs':>10} {'chars':>6} {'mode':<12} {'chunks':>6} "
+              f"{'first(s)':>9} {'total(s)':>9} {'speedup':>8} {'audio(s)':>9}")
+    print(header)
+    print("-" * len(header))
+
+    for paragraphs in args.paragraphs:
+        text = "\n\n".join([_PARAGRAPH.strip()] * paragraphs)
+        settings.TTS_CHUNKING_ENABLED = False
+        _, baseline_total, _ = _measure(service, text, args.repeat)
+
+        modes = [("single", None)] + [(f"split<={chars}", chars) for chars in args.chunk_chars]
+        for mode, chunk_chars in modes:
+            settings.TTS_CHUNKING_ENABLED = chunk_chars is not None
+            if chunk_chars is not None:
+                settings.TTS_CHUNK_MAX_CHARS = chunk_chars
+            chunk_count = len(split_text_for_speech(text, chunk_chars)) if chunk_chars else 1
+            first_audio, total, _ = _measure(service, text, args.repeat)
+            audio = b"".join(service.iter_speech_chunks(text))
+            print(f"{paragraphs:>10} {len(text):>6} {mode:<12} {chunk_count:>6} "
+                  f"{first_audio:>9.3f} {total:>9.3f} {baseline_total / total:>8.2f} "
+                  f"{mp3_duration_seconds(audio) or 0:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+테스트 공통 설정.
+
+app 모듈은 가져올 때 설정과 외부 API 클라이언트를 만들므로, 실제 키 없이도 가져올 수 있도록
+필요한 환경 변수의 기본값을 먼저 지정합니다. (실제 외부 API는 호출하지 않음)
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("ACK_AUDIO_ENABLED", "false")
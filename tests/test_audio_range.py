@@ -0,0 +1,56 @@
+"""
+합성된 오디오 재요청의 Range 해석과 조건부 요청(ETag) 비교 테스트.
+"""
+import pytest
+
+from app.api.v1.text_to_speech_controller import _if_none_match, _if_range_matches, _parse_range
+
+ETAG = '"abc123"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-200", (800, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    (" bytes=0-0 ", (0, 0)),
+])
+def test_parses_single_range(header, expected):
+    assert _parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=-", "items=0-10", "bytes=0-10,20-30", "bytes=a-b", ""])
+def test_unsupported_range_returns_whole_body(header):
+    assert _parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=1000-1200", "bytes=50-10"])
+def test_unsatisfiable_range_raises(header):
+    with pytest.raises(ValueError):
+        _parse_range(header, 1000)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    (ETAG, True),
+    (f"W/{ETAG}", True),
+    (f'"other", W/{ETAG}', True),
+    ('"other"', False),
+])
+def test_if_none_match_uses_weak_comparison(header, expected):
+    assert _if_none_match(header, ETAG) is expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, True),
+    (ETAG, True),
+    (f" {ETAG} ", True),
+    (f"W/{ETAG}", False),
+    ('"other"', False),
+    ("Wed, 21 Oct 2026 07:28:00 GMT", False),
+])
+def test_if_range_uses_strong_comparison(header, expected):
+    assert _if_range_matches(header, ETAG) is expected
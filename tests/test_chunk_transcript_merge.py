@@ -0,0 +1,61 @@
+"""
+겹치는 구간으로 나누어 변환한 텍스트를 이어 붙이는 _merge_chunk_transcripts 테스트.
+"""
+import pytest
+
+from app.core.config import settings
+from app.services.speech_to_text_service import speech_to_text_service
+
+
+def merge(texts, max_overlap_words=None):
+    return speech_to_text_service._merge_chunk_transcripts(texts, max_overlap_words)
+
+
+def test_removes_overlapping_words():
+    assert merge(["오늘 회의에서 예산 문제를 논의했습니다", "예산 문제를 논의했습니다 그리고 일정도"]) == \
+        "오늘 회의에서 예산 문제를 논의했습니다 그리고 일정도"
+
+
+def test_ignores_punctuation_and_case_when_matching():
+    assert merge(["We met at Noon, then", "noon then left. After that"], max_overlap_words=4) == \
+        "We met at Noon, then left. After that"
+
+
+def test_keeps_single_common_word():
+    # 한 단어만 같으면 우연히 같은 단어일 수 있으므로 중복으로 보지 않음
+    assert merge(["결과는 좋았다 그리고", "그리고 실험에서는 달랐다"]) == \
+        "결과는 좋았다 그리고 그리고 실험에서는 달랐다"
+
+
+def test_does_not_drop_word_before_single_common_word():
+    assert merge(["그래서 결과는 좋았다 그리고", "다음 그리고 실험에서는 달랐다"]) == \
+        "그래서 결과는 좋았다 그리고 다음 그리고 실험에서는 달랐다"
+
+
+def test_skips_word_cut_at_chunk_boundary():
+    # 다음 구간의 첫 단어가 경계에서 잘려 다르게 인식된 경우
+    assert merge(["회의는 세 시에 끝났습니다", "났습니다 세 시에 끝났습니다 이후에는"]) == \
+        "회의는 세 시에 끝났습니다 이후에는"
+
+
+def test_overlap_longer_than_limit_is_not_removed():
+    assert merge(["하나 둘 셋 넷 다섯", "하나 둘 셋 넷 다섯 여섯"], max_overlap_words=3) == \
+        "하나 둘 셋 넷 다섯 하나 둘 셋 넷 다섯 여섯"
+
+
+def test_default_limit_follows_overlap_seconds(monkeypatch):
+    monkeypatch.setattr(settings, "STT_CHUNK_OVERLAP_SECONDS", 1)
+    words = "가 나 다 라 마 바"
+    # 겹치는 1초 동안 말할 수 있는 단어 수(4)보다 긴 중복은 제거하지 않음
+    assert merge([words, words]) == f"{words} {words}"
+    assert merge(["앞 가 나 다 라", "가 나 다 라 뒤"]) == "앞 가 나 다 라 뒤"
+
+
+@pytest.mark.parametrize("texts, expected", [
+    ([], ""),
+    (["", "  "], ""),
+    (["안녕하세요"], "안녕하세요"),
+    (["", "첫 구간이 비어 있음"], "첫 구간이 비어 있음"),
+])
+def test_empty_and_single_chunks(texts, expected):
+    assert merge(texts) == expected
@@ -0,0 +1,134 @@
+"""
+회로 차단기 상태 전이(closed → open → half-open → closed/open) 테스트.
+"""
+import pytest
+
+from app.core.cancellation import OperationCancelled
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_WINDOW_SIZE", 10)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_MIN_CALLS", 4)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_SLOW_CALL_RATE", 0.8)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_OPEN_SECONDS", 30)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", 1)
+    return CircuitBreaker("test", slow_call_seconds=10.0)
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        super().__init__(f"status {status_code}")
+
+
+def succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+def fail(breaker, exc=None):
+    with pytest.raises(Exception):
+        with breaker.guard():
+            raise exc or ConnectionError("connection reset")
+
+
+def expire_open_period(breaker):
+    breaker._opened_at -= settings.CIRCUIT_BREAKER_OPEN_SECONDS
+
+
+def open_breaker(breaker):
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS):
+        fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS - 1):
+        fail(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_opens_when_failure_rate_reached(breaker):
+    succeed(breaker)
+    succeed(breaker)
+    fail(breaker)
+    assert breaker.state == CLOSED
+    fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_rejects_without_calling(breaker):
+    open_breaker(breaker)
+    called = False
+    with pytest.raises(CircuitOpenError) as info:
+        with breaker.guard():
+            called = True
+    assert not called
+    assert 0 < info.value.retry_after <= settings.CIRCUIT_BREAKER_OPEN_SECONDS
+
+
+@pytest.mark.parametrize("exc", [UpstreamError(400), UpstreamError(404), ValueError("bad input")])
+def test_client_errors_are_not_failures(breaker, exc):
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS):
+        fail(breaker, exc)
+    assert breaker.state == CLOSED
+    assert breaker.status()["failure_rate"] == 0.0
+
+
+@pytest.mark.parametrize("exc", [UpstreamError(500), UpstreamError(429)])
+def test_server_errors_and_rate_limits_are_failures(breaker, exc):
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS):
+        fail(breaker, exc)
+    assert breaker.state == OPEN
+
+
+def test_quick_cancellations_are_not_recorded(breaker):
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS):
+        with pytest.raises(OperationCancelled):
+            with breaker.guard():
+                raise OperationCancelled()
+    assert breaker.status()["calls"] == 0
+
+
+def test_half_open_after_open_period(breaker):
+    open_breaker(breaker)
+    expire_open_period(breaker)
+    assert breaker.state == HALF_OPEN
+
+
+def test_successful_probe_closes_and_clears_window(breaker):
+    open_breaker(breaker)
+    expire_open_period(breaker)
+    succeed(breaker)
+    assert breaker.state == CLOSED
+    assert breaker.status()["calls"] == 0
+
+
+def test_failed_probe_reopens(breaker):
+    open_breaker(breaker)
+    expire_open_period(breaker)
+    fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_half_open_limits_concurrent_probes(breaker):
+    open_breaker(breaker)
+    expire_open_period(breaker)
+    with breaker.guard():
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+    assert breaker.state == CLOSED
+
+
+def test_disabled_breaker_never_opens(breaker, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_ENABLED", False)
+    for _ in range(settings.CIRCUIT_BREAKER_MIN_CALLS * 2):
+        fail(breaker)
+    succeed(breaker)
+    assert breaker.state == CLOSED
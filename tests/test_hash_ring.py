@@ -0,0 +1,59 @@
+"""
+스레드 ID를 노드에 배정하는 일관된 해싱 링의 분산과 안정성 테스트.
+"""
+from collections import Counter
+
+import pytest
+
+from app.core.hash_ring import HashRing
+
+NODES = [f"http://node-{index}:9090" for index in range(4)]
+KEYS = [f"thread_{index:06d}" for index in range(20000)]
+
+
+def test_keys_are_spread_across_nodes():
+    ring = HashRing(NODES)
+    counts = Counter(ring.get_node(key) for key in KEYS)
+    assert set(counts) == set(NODES)
+    for node in NODES:
+        # 가상 노드 100개 기준, 노드별 몫은 평균(25%)에서 크게 벗어나지 않음
+        assert 0.15 < counts[node] / len(KEYS) < 0.35
+
+
+def test_assignment_is_deterministic_and_order_independent():
+    ring = HashRing(NODES)
+    other = HashRing(list(reversed(NODES)))
+    assert all(ring.get_node(key) == other.get_node(key) for key in KEYS[:1000])
+
+
+def test_adding_node_only_moves_keys_to_new_node():
+    new_node = "http://node-4:9090"
+    before, after = HashRing(NODES), HashRing(NODES + [new_node])
+    moved = [key for key in KEYS if before.get_node(key) != after.get_node(key)]
+    assert all(after.get_node(key) == new_node for key in moved)
+    # 새 노드의 몫(약 1/5)만큼만 이동
+    assert 0.1 < len(moved) / len(KEYS) < 0.3
+
+
+def test_removing_node_only_moves_its_keys():
+    removed = NODES[2]
+    before, after = HashRing(NODES), HashRing([node for node in NODES if node != removed])
+    moved = [key for key in KEYS if before.get_node(key) != after.get_node(key)]
+    assert moved
+    assert all(before.get_node(key) == removed for key in moved)
+
+
+def test_duplicate_nodes_are_ignored():
+    assert HashRing(NODES + NODES[:2]).nodes == NODES
+    ring, duplicated = HashRing(NODES), HashRing(NODES + NODES[:2])
+    assert all(ring.get_node(key) == duplicated.get_node(key) for key in KEYS[:1000])
+
+
+def test_single_node_owns_everything():
+    ring = HashRing(NODES[:1])
+    assert {ring.get_node(key) for key in KEYS[:1000]} == {NODES[0]}
+
+
+def test_empty_ring_raises():
+    with pytest.raises(ValueError):
+        HashRing([]).get_node("thread_1")
@@ -0,0 +1,83 @@
+"""
+MP3 프레임 탐색(iter_mp3_frames)과 이어 붙이기용 프레임 추출(mp3_audio_frames) 테스트.
+"""
+import pytest
+
+from app.services.audio_processing import iter_mp3_frames, mp3_audio_frames, mp3_duration_seconds
+
+# MPEG-1 Layer III, 128kbps, 44100Hz: 1152 // 8 * 128000 // 44100 = 417바이트 (+1 패딩)
+MPEG1_LENGTH = 417
+# MPEG-2 Layer III, 64kbps, 22050Hz: 576 // 8 * 64000 // 22050 = 208바이트
+MPEG2_LENGTH = 208
+
+
+def mpeg1_frame(fill: int = 0x11, padding: bool = False, body: bytes = b"") -> bytes:
+    header = bytes([0xFF, 0xFB, 0x90 | (0x02 if padding else 0x00), 0x44])
+    length = MPEG1_LENGTH + (1 if padding else 0)
+    return (header + body).ljust(length, bytes([fill]))
+
+
+def mpeg2_frame(fill: int = 0x22) -> bytes:
+    return bytes([0xFF, 0xF3, 0x80, 0x44]).ljust(MPEG2_LENGTH, bytes([fill]))
+
+
+def id3_tag(payload_size: int = 20) -> bytes:
+    # 태그 크기는 7비트씩 나눈 synchsafe 정수
+    return b"ID3\x04\x00\x00" + bytes([0, 0, 0, payload_size]) + b"\x00" * payload_size
+
+
+def test_finds_consecutive_frames():
+    data = mpeg1_frame() + mpeg1_frame(padding=True) + mpeg1_frame()
+    assert list(iter_mp3_frames(data)) == [
+        (0, MPEG1_LENGTH, 1152, 44100),
+        (MPEG1_LENGTH, MPEG1_LENGTH + 1, 1152, 44100),
+        (2 * MPEG1_LENGTH + 1, MPEG1_LENGTH, 1152, 44100),
+    ]
+
+
+def test_skips_id3_tag_and_junk_bytes():
+    tag = id3_tag()
+    data = tag + mpeg1_frame() + b"\x00\x00\x00" + mpeg1_frame()
+    offsets = [offset for offset, _, _, _ in iter_mp3_frames(data)]
+    assert offsets == [len(tag), len(tag) + MPEG1_LENGTH + 3]
+
+
+def test_reads_mpeg2_frames():
+    assert list(iter_mp3_frames(mpeg2_frame() * 2)) == [
+        (0, MPEG2_LENGTH, 576, 22050),
+        (MPEG2_LENGTH, MPEG2_LENGTH, 576, 22050),
+    ]
+
+
+def test_stops_at_truncated_last_frame():
+    data = mpeg1_frame() + mpeg1_frame()[:100]
+    assert len(list(iter_mp3_frames(data))) == 1
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00" * 1000, b"ID3", b"\xff\xfb"])
+def test_no_frames_in_non_mp3_data(data):
+    assert list(iter_mp3_frames(data)) == []
+    assert mp3_duration_seconds(data) is None
+
+
+def test_duration_from_frame_headers():
+    assert mp3_duration_seconds(mpeg1_frame() * 10) == pytest.approx(10 * 1152 / 44100)
+
+
+def test_audio_frames_strip_tag_info_frame_and_partial_frame():
+    frames = [mpeg1_frame(fill=0x30 + index) for index in range(3)]
+    data = id3_tag() + mpeg1_frame(fill=0x00, body=b"\x00" * 32 + b"Xing") + b"".join(frames) + frames[0][:50]
+    assert mp3_audio_frames(data) == b"".join(frames)
+
+
+def test_info_tag_only_removed_from_first_frame():
+    info = mpeg1_frame(fill=0x00, body=b"Info")
+    assert mp3_audio_frames(mpeg1_frame() + info) == mpeg1_frame() + info
+
+
+def test_spliced_outputs_form_one_stream():
+    first = id3_tag() + mpeg1_frame(fill=0x00, body=b"Info") + mpeg1_frame() * 3
+    second = id3_tag(40) + mpeg1_frame(fill=0x00, body=b"VBRI") + mpeg1_frame(padding=True) * 2
+    spliced = mp3_audio_frames(first) + mp3_audio_frames(second)
+    assert [length for _, length, _, _ in iter_mp3_frames(spliced)] == [MPEG1_LENGTH] * 3 + [MPEG1_LENGTH + 1] * 2
+    assert mp3_duration_seconds(spliced) == pytest.approx(5 * 1152 / 44100)
@@ -0,0 +1,97 @@
+"""
+우선순위별 호출 자리 배분(_can_start, _limit)과 대기 순서 테스트.
+"""
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.scheduler import BULK, DEFAULT, INTERACTIVE, ProviderScheduler, priority_scope
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(settings, "SCHEDULER_INTERACTIVE_RESERVED", 2)
+    monkeypatch.setattr(settings, "SCHEDULER_BULK_MAX_SHARE", 0.25)
+    monkeypatch.setattr(settings, "SCHEDULER_REQUEST_MAX_SHARE", 0.5)
+    return ProviderScheduler("openai", 8)
+
+
+def test_limits_per_priority(scheduler):
+    assert scheduler._limit(INTERACTIVE) == 8
+    assert scheduler._limit(DEFAULT) == 6
+    assert scheduler._limit(BULK) == 2
+
+
+def test_lower_priorities_keep_at_least_one_slot(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_INTERACTIVE_RESERVED", 4)
+    monkeypatch.setattr(settings, "SCHEDULER_BULK_MAX_SHARE", 0.1)
+    scheduler = ProviderScheduler("elevenlabs", 2)
+    assert scheduler._limit(DEFAULT) == 1
+    assert scheduler._limit(BULK) == 1
+
+
+@pytest.mark.parametrize("in_use, startable", [
+    (0, {INTERACTIVE, DEFAULT, BULK}),
+    (2, {INTERACTIVE, DEFAULT}),
+    (6, {INTERACTIVE}),
+    (8, set()),
+])
+def test_reserved_slots_by_usage(scheduler, in_use, startable):
+    scheduler._in_use = in_use
+    assert {priority for priority in (INTERACTIVE, DEFAULT, BULK) if scheduler._can_start(priority)} == startable
+
+
+def test_waiting_higher_priority_goes_first(scheduler):
+    scheduler._waiting[INTERACTIVE] = 1
+    assert scheduler._can_start(INTERACTIVE)
+    assert not scheduler._can_start(DEFAULT)
+    assert not scheduler._can_start(BULK)
+
+    scheduler._waiting[INTERACTIVE] = 0
+    scheduler._waiting[DEFAULT] = 1
+    assert scheduler._can_start(DEFAULT)
+    assert not scheduler._can_start(BULK)
+
+
+def test_waiting_lower_priority_does_not_block_higher(scheduler):
+    scheduler._waiting[BULK] = 3
+    assert scheduler._can_start(INTERACTIVE)
+    assert scheduler._can_start(DEFAULT)
+
+
+def test_request_limit_is_share_of_priority_limit(scheduler):
+    with priority_scope(INTERACTIVE):
+        assert scheduler.request_limit() == 4
+    with priority_scope(BULK):
+        assert scheduler.request_limit() == 1
+
+
+def test_released_slot_goes_to_higher_priority_waiter(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", True)
+    scheduler = ProviderScheduler("openai", 1)
+    order = []
+
+    def call(priority):
+        with priority_scope(priority), scheduler.slot("test"):
+            order.append(priority)
+
+    def wait_until(condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    with scheduler.slot("test"):
+        bulk = threading.Thread(target=call, args=(BULK,))
+        bulk.start()
+        wait_until(lambda: scheduler._waiting[BULK] == 1)
+        interactive = threading.Thread(target=call, args=(INTERACTIVE,))
+        interactive.start()
+        wait_until(lambda: scheduler._waiting[INTERACTIVE] == 1)
+
+    bulk.join(5)
+    interactive.join(5)
+    assert order == [INTERACTIVE, BULK]